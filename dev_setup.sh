@@ -514,7 +514,8 @@ fi
 # install optional python modules
 if [[ ! $(pip install -r requirements/extra-audiobackend.txt) ||
 	! $(pip install -r requirements/extra-stt.txt) ||
-	! $(pip install -r requirements/extra-mark1.txt) ]] ; then
+	! $(pip install -r requirements/extra-mark1.txt) ||
+	! $(pip install -r requirements/extra-messagebus.txt) ]] ; then
     echo 'Warning: Failed to install some optional dependencies. Continue? y/N'
     read -n1 continue
     if [[ $continue != 'y' ]] ; then
@@ -583,4 +584,4 @@ if [[ ! -w /var/log/mycroft/ ]] ; then
 fi
 
 #Store a fingerprint of setup
-md5sum requirements/requirements.txt requirements/extra-audiobackend.txt requirements/extra-stt.txt requirements/extra-mark1.txt requirements/tests.txt dev_setup.sh > .installed
+md5sum requirements/requirements.txt requirements/extra-audiobackend.txt requirements/extra-stt.txt requirements/extra-mark1.txt requirements/extra-messagebus.txt requirements/tests.txt dev_setup.sh > .installed
@@ -16,7 +16,6 @@ import os
 import time
 from copy import copy, deepcopy
 
-import requests
 from requests import HTTPError, RequestException
 
 from mycroft.configuration import Configuration
@@ -25,6 +24,7 @@ from mycroft.configuration.config import DEFAULT_CONFIG, SYSTEM_CONFIG, \
 from mycroft.identity import IdentityManager, identity_lock
 from mycroft.version import VersionManager
 from mycroft.util import get_arch, connected, LOG
+from mycroft.util import http_session
 
 
 _paired_cache = False
@@ -136,7 +136,7 @@ class Api:
         if etag:
             headers['If-None-Match'] = etag
 
-        response = requests.request(
+        response = http_session.request(
             method, url, headers=headers, params=query,
             data=data, json=json_body, timeout=(3.05, 15)
         )
@@ -19,7 +19,7 @@ from threading import Lock
 from mycroft.configuration import Configuration
 from mycroft.metrics import report_timing, Stopwatch
 from mycroft.tts import TTSFactory
-from mycroft.util import check_for_signal
+from mycroft.util import check_for_signal, http_session
 from mycroft.util.log import LOG
 from mycroft.messagebus.message import Message
 from mycroft.tts.remote_tts import RemoteTTSException
@@ -122,6 +122,7 @@ def mute_and_speak(utterance, ident, listen=False):
         # Create new tts instance
         tts = TTSFactory.create()
         tts.init(bus)
+        tts.fallback = fallback_tts
         tts_hash = hash(str(config.get('tts', '')))
 
     LOG.info("Speak: " + utterance)
@@ -134,20 +135,42 @@ def mute_and_speak(utterance, ident, listen=False):
         LOG.error('TTS execution failed ({})'.format(repr(e)))
 
 
-def mimic_fallback_tts(utterance, ident, listen):
+def get_mimic_fallback():
+    """Get the Mimic TTS used if the connection is lost."""
     global mimic_fallback_obj
-    # fallback if connection is lost
     config = Configuration.get()
     tts_config = config.get('tts', {}).get("mimic", {})
     lang = config.get("lang", "en-us")
     if not mimic_fallback_obj:
         mimic_fallback_obj = Mimic(lang, tts_config)
-    tts = mimic_fallback_obj
+    return mimic_fallback_obj
+
+
+def mimic_fallback_tts(utterance, ident, listen):
+    # fallback if connection is lost
+    tts = get_mimic_fallback()
     LOG.debug("Mimic fallback, utterance : " + str(utterance))
     tts.init(bus)
     tts.execute(utterance, ident, listen)
 
 
+def fallback_tts(sentence, error):
+    """Select the TTS synthesizing a sentence the configured TTS failed on.
+
+    Arguments:
+        sentence (str): sentence that failed
+        error (Exception): synthesis error
+
+    Returns:
+        TTS: the Mimic fallback if the remote TTS failed, otherwise None
+    """
+    if isinstance(error, RemoteTTSException):
+        LOG.error(error)
+        LOG.debug("Mimic fallback, sentence : " + str(sentence))
+        return get_mimic_fallback()
+    return None
+
+
 def handle_stop(event):
     """Handle stop message.
 
@@ -160,6 +183,29 @@ def handle_stop(event):
         bus.emit(Message("mycroft.stop.handled", {"by": "TTS"}))
 
 
+def handle_record_begin(event):
+    """Duck the speech while the user is speaking."""
+    tts.playback.duck()
+
+
+def handle_record_end(event):
+    """Restore the speech volume."""
+    tts.playback.unduck()
+
+
+def handle_http_stats(event):
+    """Report the HTTP connection statistics of the audio service."""
+    bus.emit(event.response({'service': 'audio',
+                             'hosts': http_session.get_stats()}))
+
+
+def handle_tts_cache_stats(event):
+    """Report the statistics of the TTS cache."""
+    stats = tts.cache.get_stats()
+    stats['engine'] = tts.tts_name
+    bus.emit(event.response(stats))
+
+
 def init(messagebus):
     """Start speech related handlers.
 
@@ -178,9 +224,14 @@ def init(messagebus):
     bus.on('mycroft.stop', handle_stop)
     bus.on('mycroft.audio.speech.stop', handle_stop)
     bus.on('speak', handle_speak)
+    bus.on('recognizer_loop:record_begin', handle_record_begin)
+    bus.on('recognizer_loop:record_end', handle_record_end)
+    bus.on('mycroft.http.stats.get', handle_http_stats)
+    bus.on('mycroft.tts.cache.stats.get', handle_tts_cache_stats)
 
     tts = TTSFactory.create()
     tts.init(bus)
+    tts.fallback = fallback_tts
     tts_hash = hash(str(config.get('tts', '')))
 
 
@@ -23,7 +23,7 @@ from mycroft.lock import Lock as PIDLock  # Create/Support PID locking file
 from mycroft.messagebus.client import MessageBusClient
 from mycroft.messagebus.message import Message
 from mycroft.util import create_daemon, wait_for_exit_signal, \
-    reset_sigint_handler, create_echo_function
+    reset_sigint_handler, create_echo_function, http_session
 from mycroft.util.log import LOG
 
 bus = None  # Mycroft messagebus connection
@@ -163,6 +163,13 @@ def handle_audio_end(event):
 def handle_stop(event):
     """Handler for mycroft.stop, i.e. button press."""
     loop.force_unmute()
+    loop.cancel_transcriptions()
+
+
+def handle_http_stats(event):
+    """Report the HTTP connection statistics of the speech client."""
+    bus.emit(event.response({'service': 'voice',
+                             'hosts': http_session.get_stats()}))
 
 
 def handle_open():
@@ -205,6 +212,7 @@ def main():
     bus.on('recognizer_loop:audio_output_start', handle_audio_start)
     bus.on('recognizer_loop:audio_output_end', handle_audio_end)
     bus.on('mycroft.stop', handle_stop)
+    bus.on('mycroft.http.stats.get', handle_http_stats)
     bus.on('message', create_echo_function('VOICE'))
 
     create_daemon(bus.run_forever)
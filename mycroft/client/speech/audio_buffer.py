@@ -0,0 +1,94 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Preallocated circular buffer for raw audio."""
+
+
+class CyclicAudioBuffer:
+    """Fixed size buffer keeping the most recently appended audio.
+
+    The storage is allocated once and holds every byte twice, at position
+    i and i + size. Thanks to this mirroring the most recent audio is always
+    contiguous and can be returned as a memoryview without copying.
+
+    Views returned by get_last() refer to the buffer storage and are only
+    valid until more audio is appended.
+
+    Arguments:
+        size (int): max number of bytes kept
+    """
+    def __init__(self, size):
+        self.size = size
+        self._data = bytearray(2 * size)
+        self._view = memoryview(self._data)
+        self._head = 0  # Position of the next write
+        self.written = 0  # Total number of bytes appended
+
+    def __len__(self):
+        return min(self.written, self.size)
+
+    def append(self, chunk):
+        """Add audio to the end of the buffer, dropping the oldest audio.
+
+        Arguments:
+            chunk (bytes): raw audio, any bytes-like object
+        """
+        chunk = memoryview(chunk).cast('B')
+        num_bytes = len(chunk)
+        self.written += num_bytes
+        if num_bytes > self.size:
+            chunk = chunk[-self.size:]
+            num_bytes = self.size
+
+        first = min(num_bytes, self.size - self._head)
+        self._write(self._head, chunk[:first])
+        if first < num_bytes:
+            # Wrap around to the start of the buffer
+            self._write(0, chunk[first:])
+        self._head = (self._head + num_bytes) % self.size
+
+    def _write(self, position, data):
+        end = position + len(data)
+        self._view[position:end] = data
+        self._view[position + self.size:end + self.size] = data
+
+    def get_last(self, num_bytes):
+        """Get the most recent audio.
+
+        Arguments:
+            num_bytes (int): number of bytes to get, limited to the amount
+                             of audio in the buffer
+
+        Returns:
+            memoryview: the last num_bytes of audio
+        """
+        num_bytes = min(num_bytes, len(self))
+        end = self._head + self.size
+        return self._view[end - num_bytes:end]
+
+    def get_since(self, position):
+        """Get the audio appended after a given point.
+
+        Arguments:
+            position (int): value of the written attribute at that point
+
+        Returns:
+            memoryview: audio appended since then, limited to the buffer size
+        """
+        return self.get_last(self.written - position)
+
+    def clear(self):
+        """Empty the buffer."""
+        self._head = 0
+        self.written = 0
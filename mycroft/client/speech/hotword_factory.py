@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from time import time, sleep
 import os
 import platform
 import posixpath
-import struct
 import sys
 import tempfile
 import requests
@@ -44,7 +46,24 @@ class NoModelAvailable(Exception):
     pass
 
 
+def unpack_samples(chunk):
+    """Get the samples of 16 bit signed PCM audio without copying it.
+
+    Arguments:
+        chunk (bytes): raw audio in native byte order, a trailing odd byte
+                       is ignored
+
+    Returns:
+        memoryview: int16 view of the audio
+    """
+    view = memoryview(chunk).cast('B')
+    return view[:len(view) - len(view) % 2].cast('h')
+
+
 class HotWordEngine:
+    # Set by engines processing samples instead of raw audio bytes
+    uses_samples = False
+
     def __init__(self, key_phrase="hey mycroft", config=None, lang="en-us"):
         self.key_phrase = str(key_phrase).lower()
         # rough estimate 1 phoneme per 2 chars
@@ -62,6 +81,20 @@ class HotWordEngine:
     def update(self, chunk):
         pass
 
+    def update_samples(self, chunk, samples):
+        """Feed audio together with its already unpacked samples.
+
+        Allows MultiHotWord to unpack each chunk once for all engines,
+        engines working on raw audio just receive the chunk.
+
+        Arguments:
+            chunk (bytes): raw audio
+            samples (memoryview): int16 view of the chunk, see
+                                  unpack_samples(), None if no engine
+                                  needs the samples
+        """
+        self.update(chunk)
+
     def stop(self):
         """ Perform any actions needed to shut down the hot word engine.
 
@@ -303,6 +336,8 @@ class SnowboyHotWord(HotWordEngine):
 
 
 class PorcupineHotWord(HotWordEngine):
+    uses_samples = True
+
     def __init__(self, key_phrase="hey mycroft", config=None, lang="en-us"):
         super(PorcupineHotWord, self).__init__(key_phrase, config, lang)
         porcupine_path = expanduser(self.config.get(
@@ -331,7 +366,7 @@ class PorcupineHotWord(HotWordEngine):
         else:
             sensitivities = [float(x) for x in sensitivities.split(',')]
 
-        self.audio_buffer = []
+        self.audio_buffer = array('h')
         self.has_found = False
         self.num_keywords = len(keyword_file_paths)
         LOG.info(
@@ -346,21 +381,25 @@ class PorcupineHotWord(HotWordEngine):
         LOG.info('Loaded Porcupine')
 
     def update(self, chunk):
-        pcm = struct.unpack_from("h" * (len(chunk)//2), chunk)
-        self.audio_buffer += pcm
-        while True:
-            if len(self.audio_buffer) >= self.porcupine.frame_length:
+        self.update_samples(chunk, unpack_samples(chunk))
+
+    def update_samples(self, chunk, samples):
+        # Samples are kept in a typed buffer and handed to Porcupine as
+        # frame sized views, no Python object is created per sample
+        self.audio_buffer.frombytes(memoryview(samples).cast('B'))
+        frame_length = self.porcupine.frame_length
+        consumed = 0
+        with memoryview(self.audio_buffer) as buffer_view:
+            while len(buffer_view) - consumed >= frame_length:
                 result = self.porcupine.process(
-                    self.audio_buffer[0:self.porcupine.frame_length])
+                    buffer_view[consumed:consumed + frame_length])
                 # result could be boolean (if there is one keword)
                 # or int (if more than one keyword)
                 self.has_found |= (
                     (self.num_keywords == 1 and result) |
                     (self.num_keywords > 1 and result >= 0))
-                self.audio_buffer = self.audio_buffer[
-                    self.porcupine.frame_length:]
-            else:
-                return
+                consumed += frame_length
+        del self.audio_buffer[:consumed]
 
     def found_wake_word(self, frame_data):
         if self.has_found:
@@ -373,6 +412,72 @@ class PorcupineHotWord(HotWordEngine):
             self.porcupine.delete()
 
 
+class MultiHotWord(HotWordEngine):
+    """Listen for several wake words at the same time.
+
+    Every chunk is unpacked once and the audio shared by all engines. The
+    updates and wake word checks are run in parallel, one thread per
+    engine, most engines spend their time in native code or in a separate
+    process.
+
+    When a wake word is found the detecting engine is described in
+    detected: its key phrase, module and latency, the time from the last
+    audio update until the engine reported the wake word.
+
+    Arguments:
+        engines (list): HotWordEngine instances, in order of priority
+        lang (str): language code
+    """
+    def __init__(self, engines, lang="en-us"):
+        super().__init__(engines[0].key_phrase, {}, lang)
+        self.engines = engines
+        self.num_phonemes = max(e.num_phonemes for e in engines)
+        self.uses_samples = any(e.uses_samples for e in engines)
+        self.executor = ThreadPoolExecutor(max_workers=len(engines))
+        self.last_update = time()
+        self.detected = None
+        self.detections = Counter()
+
+    def _map(self, func):
+        if len(self.engines) == 1:
+            return [func(self.engines[0])]
+        return list(self.executor.map(func, self.engines))
+
+    def update(self, chunk):
+        self.update_samples(
+            chunk, unpack_samples(chunk) if self.uses_samples else None)
+
+    def update_samples(self, chunk, samples):
+        self.last_update = time()
+        self._map(lambda engine: engine.update_samples(chunk, samples))
+
+    def found_wake_word(self, frame_data):
+        def check(engine):
+            return engine.found_wake_word(frame_data), time()
+
+        # All engines are checked to reset their detection state
+        results = self._map(check)
+        self.detected = None
+        for engine, (found, found_time) in zip(self.engines, results):
+            if found:
+                self.detected = {
+                    'key_phrase': engine.key_phrase,
+                    'module': engine.__class__.__name__,
+                    'latency': found_time - self.last_update
+                }
+                self.detections[engine.key_phrase] += 1
+                LOG.info('Wake word "{}" found by {} ({:.3f} s)'.format(
+                    engine.key_phrase, self.detected['module'],
+                    self.detected['latency']))
+                return True
+        return False
+
+    def stop(self):
+        for engine in self.engines:
+            engine.stop()
+        self.executor.shutdown(wait=False)
+
+
 class HotWordFactory:
     CLASSES = {
         "pocketsphinx": PocketsphinxHotWord,
@@ -424,3 +529,19 @@ class HotWordFactory:
         return cls.load_module(module, hotword, config, lang, loop) or \
             cls.load_module('pocketsphinx', hotword, config, lang, loop) or \
             cls.CLASSES['pocketsphinx']()
+
+    @classmethod
+    def create_multi_hotword(cls, hotwords, config=None, lang="en-us",
+                             loop=None):
+        """Create an engine listening for several wake words.
+
+        Arguments:
+            hotwords (list): key phrases, each with an entry in the config
+            config (dict): hotwords configuration
+
+        Returns:
+            MultiHotWord: engine wrapping one engine per key phrase
+        """
+        engines = [cls.create_hotword(hotword, config, lang, loop)
+                   for hotword in hotwords]
+        return MultiHotWord(engines, lang)
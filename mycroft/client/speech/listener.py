@@ -13,7 +13,9 @@
 # limitations under the License.
 #
 import time
-from threading import Thread
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock, Thread
 import speech_recognition as sr
 import pyaudio
 from pyee import EventEmitter
@@ -120,9 +122,35 @@ class AudioProducer(Thread):
         self.recognizer.stop()
 
 
+class STTRequest:
+    """Utterance waiting for or being transcribed by the STT engine.
+
+    Arguments:
+        audio (AudioData): recorded utterance
+        deadline (float): max seconds until the transcription is delivered,
+                          None for no deadline
+    """
+    def __init__(self, audio, deadline=None):
+        self.audio = audio
+        self.queued = time.monotonic()
+        self.deadline = self.queued + deadline if deadline else None
+        self.queue_wait = None
+        self.stopwatch = Stopwatch()
+        self.future = None
+        self.cancelled = False
+
+
 class AudioConsumer(Thread):
     """AudioConsumer
     Consumes AudioData chunks off the queue
+
+    Utterances are transcribed by STT worker threads so a slow request
+    doesn't delay the following utterances. Transcriptions are delivered
+    in the order the utterances were recorded. A single worker is used
+    unless configured otherwise, as most engines keep state between calls
+    and aren't safe to call from several threads. Streaming STT engines
+    keep the audio stream state in the engine and are run in the consumer
+    thread as before.
     """
 
     # In seconds, the minimum audio size to be sent to remote STT
@@ -140,9 +168,23 @@ class AudioConsumer(Thread):
         self.wakeword_recognizer = wakeword_recognizer
         self.metrics = MetricsAggregator()
 
+        stt_config = Configuration.get().get('stt', {})
+        self.stt_deadline = stt_config.get('deadline')
+        workers = stt_config.get('workers', 1)
+        if stt.can_stream or workers < 1:
+            self.stt_executor = None
+        else:
+            self.stt_executor = ThreadPoolExecutor(max_workers=workers)
+        self.stt_requests = deque()
+        self.stt_lock = Lock()
+
     def run(self):
         while self.state.running:
             self.read()
+            self.deliver_transcriptions()
+        self.cancel_transcriptions()
+        if self.stt_executor:
+            self.stt_executor.shutdown(wait=False)
 
     def read(self):
         try:
@@ -185,32 +227,95 @@ class AudioConsumer(Thread):
 
     # TODO: Localization
     def process(self, audio):
-
         if self._audio_length(audio) >= self.MIN_AUDIO_SIZE:
-            stopwatch = Stopwatch()
-            with stopwatch:
-                transcription = self.transcribe(audio)
-            if transcription:
-                ident = str(stopwatch.timestamp) + str(hash(transcription))
-                # STT succeeded, send the transcribed speech on for processing
-                payload = {
-                    'utterances': [transcription],
-                    'lang': self.stt.lang,
-                    'session': SessionManager.get().session_id,
-                    'ident': ident
-                }
-                self.emitter.emit("recognizer_loop:utterance", payload)
-                self.metrics.attr('utterances', [transcription])
-
-                # Report timing metrics
-                report_timing(ident, 'stt', stopwatch,
-                              {'transcription': transcription,
-                               'stt': self.stt.__class__.__name__})
+            request = STTRequest(audio, self.stt_deadline)
+            with self.stt_lock:
+                self.stt_requests.append(request)
+            if self.stt_executor:
+                request.future = self.stt_executor.submit(
+                    self._transcribe_request, request)
             else:
-                ident = str(stopwatch.timestamp)
+                request.future = Future()
+                request.future.set_result(self._transcribe_request(request))
+            request.future.add_done_callback(
+                lambda _: self.deliver_transcriptions())
         else:
             LOG.warning("Audio too short to be processed")
 
+    def _transcribe_request(self, request):
+        if request.cancelled:
+            return None
+        request.queue_wait = time.monotonic() - request.queued
+        with request.stopwatch:
+            return self.transcribe(request.audio)
+
+    def deliver_transcriptions(self):
+        """Emit finished transcriptions in the order they were recorded.
+
+        Requests past their deadline are dropped, letting the following
+        transcriptions through.
+        """
+        with self.stt_lock:
+            while self.stt_requests:
+                request = self.stt_requests[0]
+                if request.future is None:
+                    break  # Not submitted yet
+                elif request.future.done():
+                    self.stt_requests.popleft()
+                    if not request.future.cancelled():
+                        self._emit_transcription(request,
+                                                 request.future.result())
+                elif (request.deadline and
+                        time.monotonic() > request.deadline):
+                    self.stt_requests.popleft()
+                    request.cancelled = True
+                    request.future.cancel()
+                    LOG.warning('STT deadline exceeded, dropping utterance')
+                    self.metrics.increment('mycroft.stt.deadline_exceeded')
+                    self.emitter.emit(
+                        'recognizer_loop:speech.recognition.unknown')
+                else:
+                    break
+
+    def cancel_transcriptions(self):
+        """Drop all utterances not yet delivered, e.g. when stop is pressed.
+        """
+        with self.stt_lock:
+            for request in self.stt_requests:
+                request.cancelled = True
+                if request.future:
+                    request.future.cancel()
+            if self.stt_requests:
+                LOG.info('Cancelled {} pending transcriptions'.format(
+                    len(self.stt_requests)))
+                self.metrics.increment('mycroft.stt.cancelled',
+                                       len(self.stt_requests))
+            self.stt_requests.clear()
+
+    def _emit_transcription(self, request, transcription):
+        stopwatch = request.stopwatch
+        self.metrics.timer('mycroft.stt.queue_wait_s', request.queue_wait)
+        self.metrics.timer('mycroft.stt.time_s', stopwatch.time)
+        LOG.debug('STT queue wait {:.3f} s, STT time {:.3f} s'.format(
+            request.queue_wait, stopwatch.time))
+        if transcription:
+            ident = str(stopwatch.timestamp) + str(hash(transcription))
+            # STT succeeded, send the transcribed speech on for processing
+            payload = {
+                'utterances': [transcription],
+                'lang': self.stt.lang,
+                'session': SessionManager.get().session_id,
+                'ident': ident
+            }
+            self.emitter.emit("recognizer_loop:utterance", payload)
+            self.metrics.attr('utterances', [transcription])
+
+            # Report timing metrics
+            report_timing(ident, 'stt', stopwatch,
+                          {'transcription': transcription,
+                           'stt': self.stt.__class__.__name__,
+                           'queue_wait': request.queue_wait})
+
     def transcribe(self, audio):
         def send_unknown_intent():
             """ Send message that nothing was transcribed. """
@@ -313,6 +418,25 @@ class RecognizerLoop(EventEmitter):
 
         For example 'Hey Mycroft'.
 
+        If the listener config contains a list of wake_words an engine
+        listening for all of them is created, otherwise the single
+        wake_word is used.
+        """
+        LOG.info('Creating wake word engine')
+        words = (self.config.get('wake_words') or
+                 [self.config.get('wake_word', 'hey mycroft')])
+        if len(words) > 1:
+            LOG.info('Listening for {}'.format(', '.join(words)))
+            return HotWordFactory.create_multi_hotword(
+                words, self._hotword_config(words), self.lang, loop=self)
+
+        word = words[0]
+        return HotWordFactory.create_hotword(
+            word, self._hotword_config([word]), self.lang, loop=self)
+
+    def _hotword_config(self, words):
+        """Get the hotwords config for the wake words.
+
         The method uses the hotword entry for the selected wakeword, if
         one is missing it will fall back to the old phoneme and threshold in
         the listener entry in the config.
@@ -320,9 +444,6 @@ class RecognizerLoop(EventEmitter):
         If the hotword entry doesn't include phoneme and threshold values these
         will be patched in using the defaults from the config listnere entry.
         """
-        LOG.info('Creating wake word engine')
-        word = self.config.get('wake_word', 'hey mycroft')
-
         # TODO remove this, only for server settings compatibility
         phonemes = self.config.get('phonemes')
         thresh = self.config.get('threshold')
@@ -331,30 +452,29 @@ class RecognizerLoop(EventEmitter):
         # use a copy so we don't alter the hash of the config and
         # trigger a reload.
         config = deepcopy(self.config_core.get('hotwords', {}))
-        if word not in config:
-            # Fallback to using config from "listener" block
-            LOG.warning('Wakeword doesn\'t have an entry falling back'
-                        'to old listener config')
-            config[word] = {'module': 'precise'}
-            if phonemes:
-                config[word]['phonemes'] = phonemes
-            if thresh:
-                config[word]['threshold'] = thresh
-            if phonemes is None or thresh is None:
-                config = None
-        else:
-            LOG.info('Using hotword entry for {}'.format(word))
-            if 'phonemes' not in config[word]:
-                LOG.warning('Phonemes are missing falling back to listeners '
-                            'configuration')
-                config[word]['phonemes'] = phonemes
-            if 'threshold' not in config[word]:
-                LOG.warning('Threshold is missing falling back to listeners '
-                            'configuration')
-                config[word]['threshold'] = thresh
-
-        return HotWordFactory.create_hotword(word, config, self.lang,
-                                             loop=self)
+        for word in words:
+            if word not in config:
+                # Fallback to using config from "listener" block
+                LOG.warning('Wakeword doesn\'t have an entry falling back'
+                            'to old listener config')
+                config[word] = {'module': 'precise'}
+                if phonemes:
+                    config[word]['phonemes'] = phonemes
+                if thresh:
+                    config[word]['threshold'] = thresh
+                if phonemes is None or thresh is None:
+                    return None
+            else:
+                LOG.info('Using hotword entry for {}'.format(word))
+                if 'phonemes' not in config[word]:
+                    LOG.warning('Phonemes are missing falling back to '
+                                'listeners configuration')
+                    config[word]['phonemes'] = phonemes
+                if 'threshold' not in config[word]:
+                    LOG.warning('Threshold is missing falling back to '
+                                'listeners configuration')
+                    config[word]['threshold'] = thresh
+        return config
 
     def create_wakeup_recognizer(self):
         LOG.info("creating stand up word engine")
@@ -378,6 +498,12 @@ class RecognizerLoop(EventEmitter):
                                       self.wakeword_recognizer)
         self.consumer.start()
 
+    def cancel_transcriptions(self):
+        """Drop utterances waiting for their transcription."""
+        consumer = getattr(self, 'consumer', None)
+        if consumer:
+            consumer.cancel_transcriptions()
+
     def stop(self):
         self.state.running = False
         self.producer.stop()
@@ -34,15 +34,16 @@ from tempfile import gettempdir
 from threading import Thread, Lock
 
 from mycroft.api import DeviceApi
+from mycroft.client.speech.audio_buffer import CyclicAudioBuffer
 from mycroft.configuration import Configuration
 from mycroft.session import SessionManager
 from mycroft.util import (
     check_for_signal,
-    get_ipc_directory,
     resolve_resource_file,
     play_wav
 )
 from mycroft.util.log import LOG
+from mycroft.util.signal import write_mic_level
 
 
 class MutableStream:
@@ -239,7 +240,6 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
 
         self.upload_lock = Lock()
         self.filenames_to_upload = []
-        self.mic_level_file = os.path.join(get_ipc_directory(), "mic_level")
 
         # Signal statuses
         self._stop_signaled = False
@@ -253,6 +253,8 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
         self.SAVED_WW_SEC = max(3, self.TEST_WW_SEC)
 
         self._account_id = None
+        # Audio shared by the wake word loop and the phrase recording
+        self.audio_buffer = None
 
         # The maximum seconds a phrase can be recorded,
         # provided there is noise the entire time
@@ -290,6 +292,19 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
     def calc_energy(sound_chunk, sample_width):
         return audioop.rms(sound_chunk, sample_width)
 
+    def _get_audio_buffer(self, source, sec_per_buffer):
+        """Get the audio buffer, (re)allocating it if needed.
+
+        The buffer is large enough for the saved wake word audio as well as
+        the longest phrase that can be recorded.
+        """
+        max_chunks = int(self.recording_timeout / sec_per_buffer) + 1
+        size = max(self.sec_to_bytes(self.SAVED_WW_SEC, source),
+                   max_chunks * source.CHUNK * source.SAMPLE_WIDTH)
+        if self.audio_buffer is None or self.audio_buffer.size != size:
+            self.audio_buffer = CyclicAudioBuffer(size)
+        return self.audio_buffer
+
     def _record_phrase(
         self,
         source,
@@ -313,8 +328,8 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                                 word detection.
 
         Returns:
-            bytearray: complete audio buffer recorded, including any
-                       silence at the end of the user's utterance
+            bytes: complete audio buffer recorded, including any
+                   silence at the end of the user's utterance
         """
 
         num_loud_chunks = 0
@@ -346,8 +361,9 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
         max_chunks_of_silence = int(self.recording_timeout_with_silence /
                                     sec_per_buffer)
 
-        # bytearray to store audio in
-        byte_data = get_silence(source.SAMPLE_WIDTH)
+        # Recorded audio is appended to the shared buffer
+        audio_buffer = self._get_audio_buffer(source, sec_per_buffer)
+        start_position = audio_buffer.written
 
         if stream:
             stream.stream_start()
@@ -358,7 +374,7 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                 chunk = ww_frames.popleft()
             else:
                 chunk = self.record_sound_chunk(source)
-            byte_data += chunk
+            audio_buffer.append(chunk)
             num_chunks += 1
 
             if stream:
@@ -394,16 +410,11 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
             if check_for_signal('buttonPress'):
                 phrase_complete = True
 
-        return byte_data
+        return b''.join((get_silence(source.SAMPLE_WIDTH),
+                         audio_buffer.get_since(start_position)))
 
     def write_mic_level(self, energy, source):
-        with open(self.mic_level_file, 'w') as f:
-            f.write('Energy:  cur={} thresh={:.3f} muted={}'.format(
-                energy,
-                self.energy_threshold,
-                int(source.muted)
-                )
-            )
+        write_mic_level(energy, self.energy_threshold, source.muted)
 
     @staticmethod
     def sec_to_bytes(sec, source):
@@ -481,13 +492,14 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
 
         silence = get_silence(num_silent_bytes)
 
-        # bytearray to store audio in
-        byte_data = silence
+        # Buffer holding the last SAVED_WW_SEC of audio (or more)
+        audio_buffer = self._get_audio_buffer(source, sec_per_buffer)
+        audio_buffer.clear()
 
         buffers_per_check = self.SEC_BETWEEN_WW_CHECKS / sec_per_buffer
         buffers_since_check = 0.0
 
-        # Max bytes for byte_data before audio is removed from the front
+        # Bytes of audio saved or uploaded with a detected wake word
         max_size = self.sec_to_bytes(self.SAVED_WW_SEC, source)
         test_size = self.sec_to_bytes(self.TEST_WW_SEC, source)
 
@@ -539,21 +551,14 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                 self.write_mic_level(energy, source)
             counter += 1
 
-            # At first, the buffer is empty and must fill up.  After that
-            # just drop the first chunk bytes to keep it the same size.
-            needs_to_grow = len(byte_data) < max_size
-            if needs_to_grow:
-                byte_data += chunk
-            else:  # Remove beginning of audio and add new chunk to end
-                byte_data = byte_data[len(chunk):] + chunk
+            audio_buffer.append(chunk)
 
             buffers_since_check += 1.0
             self.wake_word_recognizer.update(chunk)
             if buffers_since_check > buffers_per_check:
                 buffers_since_check -= buffers_per_check
-                chopped = byte_data[-test_size:] \
-                    if test_size < len(byte_data) else byte_data
-                audio_data = chopped + silence
+                audio_data = b''.join((audio_buffer.get_last(test_size),
+                                       silence))
                 said_wake_word = \
                     self.wake_word_recognizer.found_wake_word(audio_data)
 
@@ -564,10 +569,17 @@ class ResponsiveRecognizer(speech_recognition.Recognizer):
                         'utterance': self.wake_word_name,
                         'session': SessionManager.get().session_id,
                     }
+                    detected = getattr(self.wake_word_recognizer,
+                                       'detected', None)
+                    if detected:
+                        payload['utterance'] = detected['key_phrase']
+                        payload['engine'] = detected['module']
+                        payload['latency'] = detected['latency']
                     emitter.emit("recognizer_loop:wakeword", payload)
 
                     audio = None
                     mtd = None
+                    byte_data = bytes(audio_buffer.get_last(max_size))
                     if self.save_wake_words:
                         # Save wake word locally
                         audio = self._create_audio_data(byte_data, source)
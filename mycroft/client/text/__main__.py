@@ -17,7 +17,6 @@ import signal
 import io
 import os.path
 import curses
-from mycroft.util import get_ipc_directory
 from .text_client import (
         load_settings, save_settings, simple_cli, gui_main,
         start_log_monitor, start_mic_monitor, connect_to_mycroft,
@@ -50,8 +49,8 @@ def main():
         start_log_monitor("/var/log/mycroft/skills.log")
         start_log_monitor("/var/log/mycroft/voice.log")
 
-    # Monitor IPC file containing microphone level info
-    start_mic_monitor(os.path.join(get_ipc_directory(), "mic_level"))
+    # Monitor microphone level info published by the speech client
+    start_mic_monitor()
 
     connect_to_mycroft()
     if '--simple' in sys.argv:
@@ -31,6 +31,7 @@ from threading import Thread, Lock
 from mycroft.messagebus.client import MessageBusClient
 from mycroft.messagebus.message import Message
 from mycroft.util.log import LOG
+from mycroft.util.signal import read_mic_level
 from mycroft.configuration import Configuration
 
 import locale
@@ -287,38 +288,29 @@ def start_log_monitor(filename):
 
 
 class MicMonitorThread(Thread):
-    def __init__(self, filename):
+    def __init__(self):
         Thread.__init__(self)
-        self.filename = filename
-        self.st_results = None
+        self.mic_level = None
 
     def run(self):
         while True:
             try:
-                st_results = os.stat(self.filename)
-
-                if (not self.st_results or
-                        not st_results.st_ctime == self.st_results.st_ctime or
-                        not st_results.st_mtime == self.st_results.st_mtime):
-                    self.read_mic_level()
-                    self.st_results = st_results
+                mic_level = read_mic_level()
+                if mic_level and mic_level != self.mic_level:
+                    self.update_meter(mic_level)
+                    self.mic_level = mic_level
                     set_screen_dirty()
             except Exception:
                 # Ignore whatever failure happened and just try again later
                 pass
             time.sleep(0.2)
 
-    def read_mic_level(self):
+    @staticmethod
+    def update_meter(mic_level):
         global meter_cur
         global meter_thresh
 
-        with io.open(self.filename, 'r') as fh:
-            line = fh.readline()
-            # Just adjust meter settings
-            # Ex:Energy:  cur=4 thresh=1.5 muted=0
-            cur_text, thresh_text, _ = line.split(' ')[-3:]
-            meter_thresh = float(thresh_text.split('=')[-1])
-            meter_cur = float(cur_text.split('=')[-1])
+        meter_cur, meter_thresh, _ = mic_level
 
 
 class ScreenDrawThread(Thread):
@@ -349,11 +341,10 @@ class ScreenDrawThread(Thread):
                 time.sleep(0.01)
 
 
-def start_mic_monitor(filename):
-    if os.path.isfile(filename):
-        thread = MicMonitorThread(filename)
-        thread.setDaemon(True)  # this thread won't prevent prog from exiting
-        thread.start()
+def start_mic_monitor():
+    thread = MicMonitorThread()
+    thread.setDaemon(True)  # this thread won't prevent prog from exiting
+    thread.start()
 
 
 def add_log_message(message):
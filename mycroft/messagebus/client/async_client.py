@@ -0,0 +1,365 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Asyncio based messagebus client.
+
+Provides the same on/once/emit/remove/wait_for_response surface as
+MessageBusClient but runs entirely on an asyncio event loop. Handlers may be
+plain functions, called directly on the loop, or coroutine functions,
+scheduled as tasks.
+
+Messages emitted while the connection is down are kept in a bounded buffer
+and sent once the connection is restored.
+
+Example:
+    async def main():
+        bus = AsyncMessageBusClient()
+        bus.on('speak', handle_speak)
+        asyncio.ensure_future(bus.run_forever())
+        response = await bus.wait_for_response(
+            Message('mycroft.skills.all_loaded'))
+"""
+import asyncio
+from collections import defaultdict, deque
+
+from tornado.websocket import websocket_connect, WebSocketClosedError
+
+from mycroft.messagebus.load_config import load_message_bus_config
+from mycroft.messagebus.message import (
+    Message,
+    JSON_FORMAT,
+    supported_wire_formats
+)
+from mycroft.util.log import LOG
+from .client import MessageBusClient
+from .pending_requests import PendingRequest, PendingRequests
+
+
+class AsyncPendingRequest(PendingRequest):
+    """Pending request that can be awaited on the event loop."""
+    def __init__(self, reply_type, table=None):
+        super().__init__(reply_type, table)
+        self.future = asyncio.get_event_loop().create_future()
+
+    def resolve(self, message):
+        if not self.done:
+            super().resolve(message)
+            if not self.future.done():
+                self.future.set_result(message)
+
+    async def wait_async(self, timeout=None):
+        """Wait for the reply without blocking the event loop.
+
+        Arguments:
+            timeout (float): max time in seconds to wait
+
+        Returns:
+            Message or None if the request timed out
+        """
+        try:
+            await asyncio.wait_for(asyncio.shield(self.future), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.response
+
+
+class AsyncMessageBusClient:
+    """Messagebus client running on an asyncio event loop.
+
+    The client must be created and used from the thread running the event
+    loop.
+
+    Arguments:
+        host, port, route, ssl, wire_format: overrides of the websocket
+            configuration.
+        max_buffered (int): max number of messages kept while the
+            connection is down. When full the oldest message is dropped
+            with a warning.
+    """
+    def __init__(self, host=None, port=None, route=None, ssl=None,
+                 wire_format=None, max_buffered=1000):
+        config_overrides = dict(host=host, port=port, route=route, ssl=ssl,
+                                wire_format=wire_format)
+        self.config = load_message_bus_config(**config_overrides)
+        self.url = MessageBusClient.build_url(
+            ssl=self.config.ssl,
+            host=self.config.host,
+            port=self.config.port,
+            route=self.config.route
+        )
+        self.handlers = defaultdict(list)
+        self.pending_requests = PendingRequests(AsyncPendingRequest)
+        self.subscriptions = set()
+        self.wire_format = JSON_FORMAT
+        self.retry = 5
+        self.connection = None
+        self.connected_event = asyncio.Event()
+        self.send_buffer = deque()
+        self.max_buffered = max_buffered
+        self.dropped_messages = 0
+        self._buffer_event = asyncio.Event()
+        self._keep_running = False
+
+    async def run_forever(self):
+        """Connect to the bus and process messages until closed.
+
+        Reconnects with an increasing delay if the connection is lost.
+        """
+        self._keep_running = True
+        while self._keep_running:
+            try:
+                self.connection = await websocket_connect(self.url)
+            except Exception as e:
+                self._on_error(e)
+            else:
+                await self._run_connection()
+                self._dispatch('close')
+            if not self._keep_running:
+                break
+            LOG.warning('Message Bus Client will reconnect in '
+                        '{} seconds.'.format(self.retry))
+            await asyncio.sleep(self.retry)
+            self.retry = min(self.retry * 2, 60)
+            self._dispatch('reconnecting')
+
+    async def _run_connection(self):
+        """Process messages from an open connection until it closes."""
+        LOG.info('Connected')
+        self.retry = 5
+        self.wire_format = JSON_FORMAT
+        # Subscriptions and wire format are tied to the connection,
+        # make sure they're sent before any buffered messages.
+        if self.subscriptions:
+            self.send_buffer.appendleft(
+                Message('mycroft.messagebus.subscribe',
+                        {'msg_types': sorted(self.subscriptions)}))
+        if (self.config.wire_format != JSON_FORMAT and
+                self.config.wire_format in supported_wire_formats()):
+            self.send_buffer.appendleft(
+                Message('mycroft.messagebus.format',
+                        {'format': self.config.wire_format}))
+        self.connected_event.set()
+        self._dispatch('open')
+        sender = asyncio.ensure_future(self._send_buffered())
+        try:
+            while True:
+                frame = await self.connection.read_message()
+                if frame is None:
+                    break
+                self._on_message(frame)
+        finally:
+            self.connected_event.clear()
+            sender.cancel()
+            self.connection = None
+
+    async def _send_buffered(self):
+        """Send messages from the buffer while the connection is open."""
+        while True:
+            if not self.send_buffer:
+                self._buffer_event.clear()
+                await self._buffer_event.wait()
+            message = self.send_buffer[0]
+            try:
+                await self._write(message)
+            except WebSocketClosedError:
+                # Keep the message for the next connection
+                break
+            except Exception as e:
+                LOG.error('Could not send {}: {}'.format(message.msg_type,
+                                                         repr(e)))
+            # A full buffer may have dropped the message while it was
+            # being written, only remove it if it's still first.
+            if self.send_buffer and self.send_buffer[0] is message:
+                self.send_buffer.popleft()
+
+    async def _write(self, message):
+        if self.wire_format == JSON_FORMAT:
+            await self.connection.write_message(message.serialize())
+        else:
+            await self.connection.write_message(
+                message.serialize(self.wire_format), binary=True)
+
+    def _on_error(self, error):
+        LOG.error('Message Bus error: {}'.format(repr(error)))
+        self._dispatch('error', error)
+
+    def _on_message(self, frame):
+        try:
+            message = Message.deserialize(frame)
+        except Exception as e:
+            LOG.error('Could not parse message: {}'.format(repr(e)))
+            return
+        if message.msg_type == 'mycroft.messagebus.format.response':
+            wire_format = message.data.get('format')
+            if wire_format in supported_wire_formats():
+                self.wire_format = wire_format
+        self.pending_requests.resolve(message)
+        self._dispatch('message', frame)
+        self._dispatch(message.msg_type, message)
+
+    def _dispatch(self, event_name, *args):
+        handlers = self.handlers.get(event_name)
+        if not handlers:
+            return
+        for handler, once in list(handlers):
+            if once:
+                self._remove_handler(event_name, handler)
+            try:
+                result = handler(*args)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(self._run_handler(result))
+            except Exception:
+                LOG.exception('Error in {} handler'.format(event_name))
+
+    @staticmethod
+    async def _run_handler(coro):
+        try:
+            await coro
+        except Exception:
+            LOG.exception('Error in async handler')
+
+    def emit(self, message):
+        """Queue a message for sending.
+
+        The message is sent as soon as possible, if the connection is down
+        it's buffered until the connection is restored.
+
+        Arguments:
+            message (Message): message to send
+        """
+        if len(self.send_buffer) >= self.max_buffered:
+            dropped = self.send_buffer.popleft()
+            self.dropped_messages += 1
+            LOG.warning('Send buffer full, dropping {} message'.format(
+                dropped.msg_type))
+        self.send_buffer.append(message)
+        self._buffer_event.set()
+
+    async def wait_for_response(self, message, reply_type=None,
+                                timeout=None):
+        """Send a message and wait for a response.
+
+        Args:
+            message (Message): message to send
+            reply_type (str): the message type of the expected reply.
+                              Defaults to "<message.msg_type>.response".
+            timeout: seconds to wait before timeout, defaults to 3
+        Returns:
+            The received message or None if the response timed out
+        """
+        responses = await self.wait_for_responses([message], reply_type,
+                                                  timeout)
+        return responses[0]
+
+    async def wait_for_responses(self, messages, reply_type=None,
+                                 timeout=None):
+        """Send several messages and collect the responses.
+
+        Args:
+            messages (list): messages to send
+            reply_type (str): the message type of the expected replies.
+                              Defaults to "<message.msg_type>.response".
+            timeout: seconds to wait for all responses, defaults to 3
+        Returns:
+            list of received messages in the same order as the requests,
+            None for requests that timed out
+        """
+        requests = self.send_requests(messages, reply_type)
+        if not requests:
+            return []
+        try:
+            await asyncio.wait([r.future for r in requests],
+                               timeout=timeout or 3.0)
+        finally:
+            for request in requests:
+                request.close()
+        return [request.response for request in requests]
+
+    def send_requests(self, messages, reply_type=None):
+        """Send messages without waiting for the responses.
+
+        Args:
+            messages (list): messages to send
+            reply_type (str): the message type of the expected replies.
+                              Defaults to "<message.msg_type>.response".
+        Returns:
+            list of AsyncPendingRequest objects in the same order as
+            messages. Each must be released with close() when done.
+        """
+        requests = [self.pending_requests.add(message, reply_type)
+                    for message in messages]
+        for message in messages:
+            self.emit(message)
+        return requests
+
+    def subscribe(self, msg_types):
+        """Only receive the listed message types from the bus.
+
+        See MessageBusClient.subscribe()
+        """
+        msg_types = set(msg_types)
+        self.subscriptions.update(msg_types)
+        if self.connected_event.is_set():
+            self.emit(Message('mycroft.messagebus.subscribe',
+                              {'msg_types': sorted(msg_types)}))
+
+    def unsubscribe(self, msg_types=None):
+        """Remove subscriptions registered through subscribe().
+
+        See MessageBusClient.unsubscribe()
+        """
+        if msg_types is None:
+            msg_types = set(self.subscriptions)
+        msg_types = set(msg_types)
+        self.subscriptions -= msg_types
+        if self.connected_event.is_set():
+            self.emit(Message('mycroft.messagebus.unsubscribe',
+                              {'msg_types': sorted(msg_types)}))
+
+    def on(self, event_name, func):
+        self.handlers[event_name].append((func, False))
+
+    def once(self, event_name, func):
+        self.handlers[event_name].append((func, True))
+
+    def remove(self, event_name, func):
+        if not self._remove_handler(event_name, func):
+            LOG.warning('Failed to remove event {}: {}'.format(event_name,
+                                                               str(func)))
+
+    def _remove_handler(self, event_name, func):
+        handlers = self.handlers.get(event_name, [])
+        for entry in handlers:
+            if entry[0] == func:
+                handlers.remove(entry)
+                if not handlers:
+                    self.handlers.pop(event_name)
+                return True
+        return False
+
+    def remove_all_listeners(self, event_name):
+        """Remove all listeners connected to event_name.
+
+        Arguments:
+            event_name: event from which to remove listeners
+        """
+        if event_name is None:
+            raise ValueError
+        self.handlers.pop(event_name, None)
+
+    async def close(self):
+        """Close the connection and stop reconnecting."""
+        self._keep_running = False
+        if self.connection:
+            self.connection.close()
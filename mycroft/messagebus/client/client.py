@@ -13,32 +13,48 @@
 # limitations under the License.
 #
 import json
+import os
+import sys
 import time
 import traceback
 from threading import Event
 
 from websocket import (
+    ABNF,
     WebSocketApp,
     WebSocketConnectionClosedException,
     WebSocketException
 )
 
 from mycroft.messagebus.load_config import load_message_bus_config
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import (
+    Message,
+    JSON_FORMAT,
+    supported_wire_formats
+)
 from mycroft.util import create_echo_function
 from mycroft.util.log import LOG
+from .dispatcher import Dispatcher
+from .pending_requests import PendingRequests
 from .threaded_event_emitter import ThreadedEventEmitter
 
 
 class MessageBusClient:
-    def __init__(self, host=None, port=None, route=None, ssl=None):
-        config_overrides = dict(host=host, port=port, route=route, ssl=ssl)
+    def __init__(self, host=None, port=None, route=None, ssl=None,
+                 wire_format=None):
+        config_overrides = dict(host=host, port=port, route=route, ssl=ssl,
+                                wire_format=wire_format)
         self.config = load_message_bus_config(**config_overrides)
-        self.emitter = ThreadedEventEmitter()
+        self.emitter = ThreadedEventEmitter(
+            dispatcher=Dispatcher.from_config(self.config.dispatcher))
         self.client = self.create_client()
         self.retry = 5
         self.connected_event = Event()
         self.started_running = False
+        self.subscriptions = set()
+        self.pending_requests = PendingRequests()
+        # Format used when sending, switched after negotiation with the bus
+        self.wire_format = JSON_FORMAT
 
     @staticmethod
     def build_url(host, port, route, ssl):
@@ -69,6 +85,33 @@ class MessageBusClient:
         self.emitter.emit("open")
         # Restore reconnect timer to 5 seconds on sucessful connect
         self.retry = 5
+        # Subscriptions and wire format are tied to the connection,
+        # restore them
+        self.wire_format = JSON_FORMAT
+        if self.subscriptions:
+            self._send_subscription('mycroft.messagebus.subscribe',
+                                    self.subscriptions)
+        self._request_wire_format()
+
+    def _request_wire_format(self):
+        """Ask the bus to use the configured wire format.
+
+        Busses not supporting the format (or this request) keep using json
+        and the client keeps sending json.
+        """
+        wire_format = self.config.wire_format
+        if wire_format == JSON_FORMAT:
+            return
+        if wire_format not in supported_wire_formats():
+            LOG.warning('Wire format {} is not available, '
+                        'using json'.format(wire_format))
+            return
+        try:
+            self._send(Message('mycroft.messagebus.format',
+                               {'format': wire_format}))
+        except WebSocketConnectionClosedException:
+            LOG.warning('Could not request wire format because '
+                        'connection has been closed')
 
     def on_close(self):
         self.emitter.emit("close")
@@ -101,6 +144,15 @@ class MessageBusClient:
 
     def on_message(self, message):
         parsed_message = Message.deserialize(message)
+        if parsed_message.msg_type == 'mycroft.messagebus.format.response':
+            wire_format = parsed_message.data.get('format')
+            if wire_format in supported_wire_formats():
+                self.wire_format = wire_format
+        # Wake up waiting requests directly instead of through the pool
+        self.pending_requests.resolve(parsed_message)
+        if parsed_message.msg_type == 'mycroft.messagebus.dispatcher.stats':
+            # Answer directly, a busy pool is what the query investigates
+            self._send_dispatcher_stats(parsed_message)
         self.emitter.emit('message', message)
         self.emitter.emit(parsed_message.msg_type, parsed_message)
 
@@ -113,13 +165,31 @@ class MessageBusClient:
 
         try:
             if hasattr(message, 'serialize'):
-                self.client.send(message.serialize())
+                self._send(message)
             else:
                 self.client.send(json.dumps(message.__dict__))
         except WebSocketConnectionClosedException:
             LOG.warning('Could not send {} message because connection '
                         'has been closed'.format(message.msg_type))
 
+    def _send_dispatcher_stats(self, message):
+        stats = self.emitter.dispatcher.get_stats()
+        stats['pid'] = os.getpid()
+        stats['process'] = ' '.join(sys.argv)
+        try:
+            self._send(message.response(stats))
+        except WebSocketConnectionClosedException:
+            pass
+
+    def _send(self, message):
+        """Send a message using the negotiated wire format."""
+        wire_format = self.wire_format
+        if wire_format == JSON_FORMAT:
+            self.client.send(message.serialize())
+        else:
+            self.client.send(message.serialize(wire_format),
+                             ABNF.OPCODE_BINARY)
+
     def wait_for_response(self, message, reply_type=None, timeout=None):
         """Send a message and wait for a response.
 
@@ -131,31 +201,102 @@ class MessageBusClient:
         Returns:
             The received message or None if the response timed out
         """
-        response = []
-
-        def handler(message):
-            """Receive response data."""
-            response.append(message)
-
-        # Setup response handler
-        self.once(reply_type or message.msg_type + '.response', handler)
-        # Send request
-        self.emit(message)
-        # Wait for response
-        start_time = time.monotonic()
-        while len(response) == 0:
-            time.sleep(0.2)
-            if time.monotonic() - start_time > (timeout or 3.0):
-                try:
-                    self.remove(reply_type, handler)
-                except (ValueError, KeyError):
-                    # ValueError occurs on pyee 1.0.1 removing handlers
-                    # registered with once.
-                    # KeyError may theoretically occur if the event occurs as
-                    # the handler is removed
-                    pass
-                return None
-        return response[0]
+        return self.wait_for_responses([message], reply_type, timeout)[0]
+
+    def wait_for_responses(self, messages, reply_type=None, timeout=None):
+        """Send several messages and collect the responses.
+
+        All messages are sent before waiting, the responses are collected
+        under a common deadline. Each message gets a unique request id in
+        its context, replies carrying the id (created with Message.reply()
+        or Message.response()) are matched to their request.
+
+        Args:
+            messages (list): messages to send
+            reply_type (str): the message type of the expected replies.
+                              Defaults to "<message.msg_type>.response".
+            timeout: seconds to wait for all responses, defaults to 3
+        Returns:
+            list of received messages in the same order as the requests,
+            None for requests that timed out
+        """
+        requests = self.send_requests(messages, reply_type)
+        try:
+            deadline = time.monotonic() + (timeout or 3.0)
+            for request in requests:
+                request.wait(max(deadline - time.monotonic(), 0))
+        finally:
+            for request in requests:
+                request.close()
+        return [request.response for request in requests]
+
+    def send_requests(self, messages, reply_type=None):
+        """Send messages without waiting for the responses.
+
+        The returned handles can be waited on individually, allowing the
+        caller to act on responses as they arrive. Each handle must be
+        released with close() when no longer needed.
+
+        Args:
+            messages (list): messages to send
+            reply_type (str): the message type of the expected replies.
+                              Defaults to "<message.msg_type>.response".
+        Returns:
+            list of PendingRequest objects in the same order as messages
+        """
+        requests = [self.pending_requests.add(message, reply_type)
+                    for message in messages]
+        try:
+            for message in messages:
+                self.emit(message)
+        except Exception:
+            for request in requests:
+                request.close()
+            raise
+        return requests
+
+    def subscribe(self, msg_types):
+        """Only receive the listed message types from the bus.
+
+        By default the bus forwards every message to every client. After
+        subscribing only matching messages are forwarded to this client.
+        A message type ending with '*' matches all types with that prefix,
+        for example 'mycroft.skills.*'.
+
+        Note that replies expected by wait_for_response() need to be
+        covered by the subscriptions as well.
+
+        Arguments:
+            msg_types (list): message types or prefixes to receive
+        """
+        msg_types = set(msg_types)
+        self.subscriptions.update(msg_types)
+        if self.connected_event.is_set():
+            self._send_subscription('mycroft.messagebus.subscribe',
+                                    msg_types)
+
+    def unsubscribe(self, msg_types=None):
+        """Remove subscriptions registered through subscribe().
+
+        When no subscriptions remain the client receives all messages again.
+
+        Arguments:
+            msg_types (list): message types to remove, defaults to all
+        """
+        if msg_types is None:
+            msg_types = set(self.subscriptions)
+        msg_types = set(msg_types)
+        self.subscriptions -= msg_types
+        if self.connected_event.is_set():
+            self._send_subscription('mycroft.messagebus.unsubscribe',
+                                    msg_types)
+
+    def _send_subscription(self, msg_type, msg_types):
+        try:
+            self._send(Message(msg_type, {'msg_types': sorted(msg_types)}))
+        except WebSocketConnectionClosedException:
+            LOG.warning('Could not update subscriptions because '
+                        'connection has been closed')
 
     def on(self, event_name, func):
         self.emitter.on(event_name, func)
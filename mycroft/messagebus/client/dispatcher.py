@@ -0,0 +1,249 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Thread pool running messagebus handlers.
+
+Handlers are queued in a single FIFO queue served by a fixed number of
+worker threads. The queue can be bounded, with a policy deciding what
+happens when it's full:
+    block: the caller waits until there is room (default)
+    drop_oldest: the oldest queued handler call is discarded
+    drop_newest: the new handler call is discarded
+
+The messagebus client submits handler calls from the websocket receive
+thread, which must never block: it also receives the replies handlers may
+be waiting for. A dispatcher created from the configuration therefore
+drops the oldest handler call instead of blocking.
+
+The number of concurrently running handlers can be limited per message type
+and per skill. Handler calls exceeding a limit stay queued without blocking
+other handlers.
+
+Wait time in the queue and run time of the handlers are tracked per message
+type and per skill.
+"""
+import time
+from collections import defaultdict, deque, namedtuple
+from threading import Condition, Thread
+
+from mycroft.util.log import LOG
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST)
+
+_Job = namedtuple('_Job',
+                  ['event', 'skill_id', 'func', 'args', 'kwargs', 'limits',
+                   'queued_time'])
+
+
+class HandlerStats:
+    """Wait and run time statistics for a group of handler calls."""
+    def __init__(self):
+        self.count = 0
+        self.dropped = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def add(self, wait_time, run_time):
+        self.count += 1
+        self.wait_total += wait_time
+        self.wait_max = max(self.wait_max, wait_time)
+        self.run_total += run_time
+        self.run_max = max(self.run_max, run_time)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'dropped': self.dropped,
+            'wait_avg': self.wait_total / self.count if self.count else 0.0,
+            'wait_max': self.wait_max,
+            'run_avg': self.run_total / self.count if self.count else 0.0,
+            'run_max': self.run_max
+        }
+
+
+class Dispatcher:
+    """Bounded thread pool with per message type and per skill limits.
+
+    Arguments:
+        threads (int): number of worker threads
+        max_queue (int): max number of queued handler calls, 0 for no limit
+        overflow (str): 'block', 'drop_oldest' or 'drop_newest'
+        max_per_event (int): max concurrent handlers for a message type,
+                             0 for no limit
+        max_per_skill (int): max concurrent handlers for a skill, 0 for no
+                             limit
+        limits (dict): limits for specific message types or skill ids,
+                       overriding max_per_event and max_per_skill
+    """
+    def __init__(self, threads=10, max_queue=0, overflow=BLOCK,
+                 max_per_event=0, max_per_skill=0, limits=None):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Unknown overflow policy {}'.format(overflow))
+        self.threads = threads
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.max_per_event = max_per_event
+        self.max_per_skill = max_per_skill
+        self.limits = limits or {}
+
+        self.queue = deque()
+        self.condition = Condition()
+        self.running = defaultdict(int)
+        self.active = 0
+        self.peak_queue_length = 0
+        self.event_stats = defaultdict(HandlerStats)
+        self.skill_stats = defaultdict(HandlerStats)
+
+        self.workers = [Thread(target=self._work, daemon=True)
+                        for _ in range(threads)]
+        for worker in self.workers:
+            worker.start()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a dispatcher from the websocket.dispatcher config.
+
+        The block overflow policy is replaced by drop_oldest for a bounded
+        queue, the messagebus receive thread must not block.
+        """
+        max_queue = config.get('max_queue', 0)
+        overflow = config.get('overflow', BLOCK)
+        if overflow == BLOCK and max_queue:
+            LOG.warning('The messagebus dispatcher can\'t block the receive '
+                        'thread, dropping the oldest handler calls when the '
+                        'queue is full')
+            overflow = DROP_OLDEST
+        return cls(threads=config.get('threads', 10),
+                   max_queue=max_queue,
+                   overflow=overflow,
+                   max_per_event=config.get('max_per_event', 0),
+                   max_per_skill=config.get('max_per_skill', 0),
+                   limits=config.get('limits'))
+
+    def _job_limits(self, event, skill_id):
+        limits = []
+        event_limit = self.limits.get(event, self.max_per_event)
+        if event_limit:
+            limits.append((('event', event), event_limit))
+        if skill_id:
+            skill_limit = self.limits.get(skill_id, self.max_per_skill)
+            if skill_limit:
+                limits.append((('skill', skill_id), skill_limit))
+        return limits
+
+    def submit(self, event, func, args=(), kwargs=None):
+        """Queue a handler call.
+
+        Arguments:
+            event (str): message type triggering the call
+            func (callable): handler, the skill_id attribute of the handler
+                             (if any) is used for per skill limits and stats
+            args (tuple): positional arguments for the handler
+            kwargs (dict): keyword arguments for the handler
+
+        Returns:
+            bool: False if the call was dropped due to a full queue
+        """
+        skill_id = getattr(func, 'skill_id', None)
+        job = _Job(event, skill_id, func, args, kwargs or {},
+                   self._job_limits(event, skill_id), time.monotonic())
+        with self.condition:
+            if self.max_queue and len(self.queue) >= self.max_queue:
+                if self.overflow == DROP_NEWEST:
+                    self._drop(job)
+                    return False
+                elif self.overflow == DROP_OLDEST:
+                    self._drop(self.queue.popleft())
+                else:
+                    while len(self.queue) >= self.max_queue:
+                        self.condition.wait()
+            self.queue.append(job)
+            self.peak_queue_length = max(self.peak_queue_length,
+                                         len(self.queue))
+            self.condition.notify_all()
+        return True
+
+    def _drop(self, job):
+        LOG.warning('Dispatch queue full, dropping {} handler'.format(
+            job.event))
+        self.event_stats[job.event].dropped += 1
+        if job.skill_id:
+            self.skill_stats[job.skill_id].dropped += 1
+
+    def _next_job(self):
+        """Take the first queued job not exceeding any limits.
+
+        Must be called with the condition held.
+        """
+        for index, job in enumerate(self.queue):
+            if all(self.running[key] < limit for key, limit in job.limits):
+                del self.queue[index]
+                for key, _ in job.limits:
+                    self.running[key] += 1
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self.condition:
+                job = self._next_job()
+                while job is None:
+                    self.condition.wait()
+                    job = self._next_job()
+                self.active += 1
+                # Wake up callers blocked by a full queue
+                self.condition.notify_all()
+
+            start = time.monotonic()
+            try:
+                job.func(*job.args, **job.kwargs)
+            except Exception:
+                LOG.exception('Error in {} handler'.format(job.event))
+            finally:
+                run_time = time.monotonic() - start
+                with self.condition:
+                    self.active -= 1
+                    for key, _ in job.limits:
+                        self.running[key] -= 1
+                    wait_time = start - job.queued_time
+                    self.event_stats[job.event].add(wait_time, run_time)
+                    if job.skill_id:
+                        self.skill_stats[job.skill_id].add(wait_time,
+                                                           run_time)
+                    # Jobs held back by limits may be able to run now
+                    self.condition.notify_all()
+
+    def get_stats(self):
+        """Get a snapshot of the dispatcher statistics.
+
+        Returns:
+            dict: queue status and wait/run time per event and skill
+        """
+        with self.condition:
+            return {
+                'threads': self.threads,
+                'active': self.active,
+                'queue_length': len(self.queue),
+                'peak_queue_length': self.peak_queue_length,
+                'max_queue': self.max_queue,
+                'events': {event: stats.as_dict()
+                           for event, stats in self.event_stats.items()},
+                'skills': {skill_id: stats.as_dict()
+                           for skill_id, stats in self.skill_stats.items()}
+            }
@@ -0,0 +1,144 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Request / response tracking for the messagebus client.
+
+Each request gets a unique id stored in the message context under the
+'request_id' key. Replies created with Message.reply() or
+Message.response() carry the context, and thereby the id, back so the reply
+can be routed to the waiting request as soon as it arrives.
+
+Replies created without the original context have no id, these resolve
+all requests waiting for that message type, matching the behaviour of the
+earlier handler based implementation. The same goes for replies carrying
+the id of an earlier request, copied along with the context of a message
+derived from it.
+"""
+import time
+from collections import defaultdict
+from threading import Event, Lock
+from uuid import uuid4
+
+REQUEST_ID = 'request_id'
+
+
+class PendingRequest:
+    """A request waiting for its reply.
+
+    Arguments:
+        reply_type (str): message type of the expected reply
+        table (PendingRequests): table the request is registered in
+    """
+    def __init__(self, reply_type, table=None):
+        self.request_id = str(uuid4())
+        self.reply_type = reply_type
+        self.response = None
+        # time.monotonic() timestamp of when the reply arrived
+        self.response_time = None
+        self.table = table
+        self._done = Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def resolve(self, message):
+        """Store the reply and wake up the waiting thread."""
+        if not self.done:
+            self.response = message
+            self.response_time = time.monotonic()
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """Wait for the reply.
+
+        Arguments:
+            timeout (float): max time in seconds to wait
+
+        Returns:
+            Message or None if the request timed out
+        """
+        self._done.wait(timeout)
+        return self.response
+
+    def close(self):
+        """Stop tracking the request, later replies are ignored."""
+        if self.table is not None:
+            self.table.remove(self)
+
+
+class PendingRequests:
+    """Table of requests waiting for replies, indexed by reply type.
+
+    Arguments:
+        request_class: class used to create requests, PendingRequest or a
+                       subclass of it.
+    """
+    def __init__(self, request_class=PendingRequest):
+        self.lock = Lock()
+        self.requests = defaultdict(list)
+        self.request_class = request_class
+
+    def add(self, message, reply_type=None):
+        """Register a request before it is sent.
+
+        The message context is updated with the id of the new request.
+
+        Arguments:
+            message (Message): the request message
+            reply_type (str): expected reply type, defaults to
+                              "<message.msg_type>.response"
+
+        Returns:
+            PendingRequest: handle to wait for the reply
+        """
+        request = self.request_class(
+            reply_type or message.msg_type + '.response', self)
+        # Copy the context, it may be shared with other messages
+        message.context = dict(message.context)
+        message.context[REQUEST_ID] = request.request_id
+        with self.lock:
+            self.requests[request.reply_type].append(request)
+        return request
+
+    def remove(self, request):
+        """Remove a request from the table, resolved or not."""
+        with self.lock:
+            waiting = self.requests.get(request.reply_type, [])
+            if request in waiting:
+                waiting.remove(request)
+            if not waiting:
+                self.requests.pop(request.reply_type, None)
+
+    def resolve(self, message):
+        """Route an incoming message to matching pending requests.
+
+        Arguments:
+            message (Message): message received from the bus
+
+        Returns:
+            bool: True if any pending request was resolved
+        """
+        with self.lock:
+            waiting = self.requests.get(message.msg_type)
+            if not waiting:
+                return False
+
+            request_id = message.context.get(REQUEST_ID)
+            matches = [r for r in waiting if r.request_id == request_id]
+            if not matches:
+                matches = list(waiting)
+            for request in matches:
+                request.resolve(message)
+            return len(matches) > 0
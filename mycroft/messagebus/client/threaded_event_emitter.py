@@ -13,23 +13,28 @@
 # limitations under the License.
 #
 from pyee import EventEmitter
-from multiprocessing.pool import ThreadPool
 from collections import defaultdict
 
+from .dispatcher import Dispatcher
+
 
 class ThreadedEventEmitter(EventEmitter):
     """ Event Emitter using the threadpool to run event functions in
         separate threads.
+
+        Arguments:
+            threads (int): number of threads, used if no dispatcher is given
+            dispatcher (Dispatcher): thread pool running the handlers
     """
-    def __init__(self, threads=10):
+    def __init__(self, threads=10, dispatcher=None):
         super().__init__()
-        self.pool = ThreadPool(threads)
+        self.dispatcher = dispatcher or Dispatcher(threads)
         self.wrappers = defaultdict(list)
 
     def on(self, event, f=None):
         """ Wrap on with a threaded launcher. """
         def wrapped(*args, **kwargs):
-            return self.pool.apply_async(f, args, kwargs)
+            return self.dispatcher.submit(event, f, args, kwargs)
 
         w = super().on(event, wrapped)
         # Store mapping from function to wrapped function
@@ -39,7 +44,7 @@ class ThreadedEventEmitter(EventEmitter):
     def once(self, event, f=None):
         """ Wrap once with a threaded launcher. """
         def wrapped(*args, **kwargs):
-            return self.pool.apply_async(f, args, kwargs)
+            return self.dispatcher.submit(event, f, args, kwargs)
 
         wrapped = super().once(event, wrapped)
         self.wrappers[event].append((f, wrapped))
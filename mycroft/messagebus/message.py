@@ -18,6 +18,43 @@ import inspect
 from mycroft.util.parse import normalize
 from copy import deepcopy
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Wire formats understood by the messagebus. JSON text frames are always
+# supported, msgpack binary frames require the optional msgpack module.
+JSON_FORMAT = 'json'
+MSGPACK_FORMAT = 'msgpack'
+
+
+def supported_wire_formats():
+    """Get the wire formats available in this installation."""
+    if msgpack is not None:
+        return [JSON_FORMAT, MSGPACK_FORMAT]
+    else:
+        return [JSON_FORMAT]
+
+
+def load_frame(value):
+    """Decode a raw websocket frame into a dict.
+
+    Text frames are decoded as json, binary frames as msgpack.
+
+    Args:
+        value (str/bytes): frame payload received from the websocket
+
+    Returns:
+        dict: decoded message with type, data and context keys
+    """
+    if isinstance(value, (bytes, bytearray)):
+        if msgpack is None:
+            raise ValueError('msgpack is required to decode binary messages')
+        return msgpack.unpackb(value, raw=False)
+    else:
+        return json.loads(value)
+
 
 class Message:
     """Holds and manipulates data sent over the websocket
@@ -41,18 +78,28 @@ class Message:
         self.data = data or {}
         self.context = context or {}
 
-    def serialize(self):
+    def serialize(self, wire_format=JSON_FORMAT):
         """This returns a string of the message info.
 
         This makes it easy to send over a websocket. This uses
         json dumps to generate the string with type, data and context
 
+        Args:
+            wire_format (str): 'json' (default) returns a json string,
+                               'msgpack' returns msgpack encoded bytes.
+
         Returns:
             str: a json string representation of the message.
         """
-        return json.dumps({'type': self.msg_type,
-                           'data': self.data,
-                           'context': self.context})
+        obj = {'type': self.msg_type,
+               'data': self.data,
+               'context': self.context}
+        if wire_format == MSGPACK_FORMAT:
+            if msgpack is None:
+                raise ValueError('msgpack is required to encode binary '
+                                 'messages')
+            return msgpack.packb(obj, use_bin_type=True)
+        return json.dumps(obj)
 
     @staticmethod
     def deserialize(value):
@@ -60,7 +107,7 @@ class Message:
 
         This makes it easy to take strings from the websocket and create
         a message object.  This uses json loads to get the info and generate
-        the message object.
+        the message object. Binary frames (bytes) are decoded as msgpack.
 
         Args:
             value(str): This is the json string received from the websocket
@@ -70,7 +117,7 @@ class Message:
             int the function.
             value(str): This is the string received from the websocket
         """
-        obj = json.loads(value)
+        obj = load_frame(value)
         return Message(obj.get('type') or '',
                        obj.get('data') or {},
                        obj.get('context') or {})
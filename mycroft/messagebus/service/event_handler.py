@@ -20,16 +20,24 @@ import traceback
 from tornado.websocket import WebSocketHandler
 from pyee import EventEmitter
 
-from mycroft.messagebus.message import Message
+from mycroft.messagebus.message import (
+    Message,
+    JSON_FORMAT,
+    MSGPACK_FORMAT,
+    supported_wire_formats
+)
 from mycroft.util.log import LOG
+from .subscriptions import SubscriptionIndex
 
 client_connections = []
+subscriptions = SubscriptionIndex()
 
 
 class MessageBusEventHandler(WebSocketHandler):
     def __init__(self, application, request, **kwargs):
         super().__init__(application, request, **kwargs)
         self.emitter = EventEmitter()
+        self.wire_format = JSON_FORMAT
 
     def on(self, event_name, handler):
         self.emitter.on(event_name, handler)
@@ -49,20 +57,75 @@ class MessageBusEventHandler(WebSocketHandler):
             traceback.print_exc(file=sys.stdout)
             pass
 
-        for client in client_connections:
-            client.write_message(message)
+        msg_type = deserialized_message.msg_type
+        if msg_type == 'mycroft.messagebus.subscribe':
+            subscriptions.subscribe(
+                self, deserialized_message.data.get('msg_types', []))
+        elif msg_type == 'mycroft.messagebus.unsubscribe':
+            subscriptions.unsubscribe(
+                self, deserialized_message.data.get('msg_types'))
+        elif msg_type == 'mycroft.messagebus.format':
+            self.set_wire_format(deserialized_message.data.get('format'))
+        else:
+            self.forward(message, deserialized_message)
+
+    def forward(self, message, deserialized_message):
+        """Send a message to all connections routed to receive it.
+
+        The message is encoded at most once per wire format, connections
+        using the same format as the sender get the original frame.
+
+        Arguments:
+            message (str/bytes): frame as received from the sender
+            deserialized_message (Message): the decoded message
+        """
+        if isinstance(message, str):
+            encoded = {JSON_FORMAT: message}
+        else:
+            encoded = {MSGPACK_FORMAT: message}
+
+        for client in subscriptions.match(deserialized_message.msg_type):
+            wire_format = client.wire_format
+            if wire_format not in encoded:
+                encoded[wire_format] = \
+                    deserialized_message.serialize(wire_format)
+            if wire_format == JSON_FORMAT:
+                client.write_message(encoded[wire_format])
+            else:
+                client.write_message(encoded[wire_format], binary=True)
+
+    def set_wire_format(self, wire_format):
+        """Switch the format used when sending to this connection.
+
+        Unsupported formats are ignored, the response always reports the
+        format in use and is sent using that format.
+
+        Arguments:
+            wire_format (str): requested format, 'json' or 'msgpack'
+        """
+        if wire_format in supported_wire_formats():
+            self.wire_format = wire_format
+        response = Message('mycroft.messagebus.format.response',
+                           {'format': self.wire_format})
+        self.emit(response)
 
     def open(self):
         self.write_message(Message("connected").serialize())
         client_connections.append(self)
+        subscriptions.add(self)
 
     def on_close(self):
         client_connections.remove(self)
+        subscriptions.remove(self)
 
     def emit(self, channel_message):
         if (hasattr(channel_message, 'serialize') and
                 callable(getattr(channel_message, 'serialize'))):
-            self.write_message(channel_message.serialize())
+            if self.wire_format == JSON_FORMAT:
+                self.write_message(channel_message.serialize())
+            else:
+                self.write_message(
+                    channel_message.serialize(self.wire_format), binary=True)
         else:
             self.write_message(json.dumps(channel_message))
 
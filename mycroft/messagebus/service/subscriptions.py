@@ -0,0 +1,141 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Routing index used by the message bus to forward messages selectively.
+
+Clients may declare which message types they are interested in, either by
+exact name ("speak") or by prefix using a trailing wildcard
+("mycroft.mic.*"). The index keeps a lookup table per pattern kind so routing
+a message does not require checking every connection.
+
+Connections without any subscriptions keep receiving all traffic.
+"""
+from collections import defaultdict
+
+
+def parse_pattern(pattern):
+    """Split a subscription pattern into its kind and key.
+
+    Arguments:
+        pattern (str): message type, optionally ending with '*'
+
+    Returns:
+        tuple: (is_prefix, key) where key is the exact message type or the
+               prefix to match.
+    """
+    if pattern.endswith('*'):
+        return True, pattern[:-1]
+    else:
+        return False, pattern
+
+
+class SubscriptionIndex:
+    """Index from message type patterns to subscribed connections."""
+    def __init__(self):
+        self.broadcast = set()
+        self.exact = defaultdict(set)
+        self.prefixes = defaultdict(set)
+        self.subscriptions = {}
+        # Distinct prefix lengths, used to look up prefix matches by slicing
+        # the message type instead of testing every registered prefix.
+        self._prefix_lengths = []
+
+    def add(self, client):
+        """Add a new connection, receiving all messages by default."""
+        self.broadcast.add(client)
+
+    def remove(self, client):
+        """Forget a connection and all its subscriptions."""
+        self.unsubscribe(client)
+        self.broadcast.discard(client)
+
+    def subscribe(self, client, patterns):
+        """Limit the messages forwarded to a connection.
+
+        Subscriptions are cumulative, calling this several times adds the
+        new patterns to the ones already registered.
+
+        Arguments:
+            client: connection to route messages to
+            patterns (list): message types or prefixes ending with '*'
+        """
+        patterns = [p for p in patterns if isinstance(p, str)]
+        if not patterns:
+            return
+        self.broadcast.discard(client)
+        client_patterns = self.subscriptions.setdefault(client, set())
+        for pattern in patterns:
+            if pattern in client_patterns:
+                continue
+            client_patterns.add(pattern)
+            is_prefix, key = parse_pattern(pattern)
+            if is_prefix:
+                self.prefixes[key].add(client)
+            else:
+                self.exact[key].add(client)
+        self._update_prefix_lengths()
+
+    def unsubscribe(self, client, patterns=None):
+        """Remove subscriptions from a connection.
+
+        A connection left without subscriptions goes back to receiving all
+        messages.
+
+        Arguments:
+            client: connection to modify
+            patterns (list): patterns to remove, None removes all of them
+        """
+        client_patterns = self.subscriptions.get(client)
+        if client_patterns is None:
+            return
+        if patterns is None:
+            patterns = list(client_patterns)
+        for pattern in patterns:
+            if pattern not in client_patterns:
+                continue
+            client_patterns.remove(pattern)
+            is_prefix, key = parse_pattern(pattern)
+            table = self.prefixes if is_prefix else self.exact
+            table[key].discard(client)
+            if not table[key]:
+                del table[key]
+
+        if not client_patterns:
+            self.subscriptions.pop(client)
+            self.broadcast.add(client)
+        self._update_prefix_lengths()
+
+    def _update_prefix_lengths(self):
+        self._prefix_lengths = sorted({len(p) for p in self.prefixes})
+
+    def match(self, msg_type):
+        """Get all connections that should receive a message type.
+
+        Arguments:
+            msg_type (str): type of the message to route
+
+        Returns:
+            set: connections to forward the message to
+        """
+        clients = set(self.broadcast)
+        exact_match = self.exact.get(msg_type)
+        if exact_match:
+            clients.update(exact_match)
+        for length in self._prefix_lengths:
+            if length > len(msg_type):
+                break
+            prefix_match = self.prefixes.get(msg_type[:length])
+            if prefix_match:
+                clients.update(prefix_match)
+        return clients
@@ -0,0 +1,223 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Skill indexed registry of the Adapt vocabulary, regexes and intents.
+
+Every registration is stored under the skill that made it, keeping the
+Adapt engine in sync incrementally:
+    - registering the same vocabulary, regex or intent twice is a no-op
+    - detaching a skill removes only the entries of that skill
+    - vocabulary shared by several skills stays in the engine until the
+      last skill using it is detached
+
+The owning skill is taken from the 'skill_id' of the message context. When
+missing, intents fall back to the skill id part of the intent name and
+vocabulary is stored as unowned.
+"""
+from collections import Counter, OrderedDict, defaultdict
+from threading import Lock
+
+UNOWNED = ''
+
+
+def _vocab_key(data):
+    return data.get('start'), data.get('end'), data.get('alias_of')
+
+
+def _trie_entries(data):
+    """Get the (key, data) entries inserted in the Adapt trie for a vocab.
+
+    Mirrors IntentDeterminationEngine.register_entity()
+    """
+    start, end, alias_of = _vocab_key(data)
+    if alias_of:
+        return [(start.lower(), (alias_of, end))]
+    else:
+        return [(start.lower(), (start, end)),
+                (end.lower(), (end, 'Concept'))]
+
+
+class AdaptRegistry:
+    """Registry keeping an Adapt engine in sync with the skill registrations.
+
+    Arguments:
+        engine (IntentDeterminationEngine): engine to update
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.lock = Lock()
+        # skill_id -> {key: message data}
+        self.vocab = defaultdict(OrderedDict)
+        self.regexes = defaultdict(OrderedDict)
+        # skill_id -> {intent name: message data}
+        self.intents = defaultdict(OrderedDict)
+        # intent name -> (skill_id, intent parser)
+        self.intent_parsers = OrderedDict()
+        # Number of skills using each trie entry / regex
+        self._trie_refs = Counter()
+        self._regex_refs = Counter()
+        # Incremented on every change affecting intent matching
+        self.generation = 0
+
+    def register_vocab(self, data, skill_id=None):
+        """Register a vocabulary entry or regex.
+
+        Arguments:
+            data (dict): register_vocab message data
+            skill_id (str): skill registering the vocabulary
+
+        Returns:
+            bool: False if the skill already registered the entry
+        """
+        skill_id = skill_id or UNOWNED
+        with self.lock:
+            regex_str = data.get('regex')
+            if regex_str:
+                if regex_str in self.regexes[skill_id]:
+                    return False
+                self.regexes[skill_id][regex_str] = data
+                self._regex_refs[regex_str] += 1
+                if self._regex_refs[regex_str] == 1:
+                    self.engine.register_regex_entity(regex_str)
+            else:
+                key = _vocab_key(data)
+                if key in self.vocab[skill_id]:
+                    return False
+                self.vocab[skill_id][key] = data
+                for entry in _trie_entries(data):
+                    self._trie_refs[entry] += 1
+                    if self._trie_refs[entry] == 1:
+                        self.engine.trie.insert(entry[0], data=entry[1])
+            self.generation += 1
+            return True
+
+    def register_intent(self, data, intent_parser, skill_id=None):
+        """Register an intent, replacing any intent with the same name.
+
+        Arguments:
+            data (dict): register_intent message data
+            intent_parser (Intent): parser created from the data
+            skill_id (str): skill registering the intent
+        """
+        name = intent_parser.name
+        skill_id = skill_id or name.split(':')[0]
+        with self.lock:
+            if name in self.intent_parsers:
+                old_skill_id, _ = self.intent_parsers[name]
+                self.intents[old_skill_id].pop(name, None)
+                self.intent_parsers[name] = (skill_id, intent_parser)
+                self._update_engine_intents()
+            else:
+                self.engine.register_intent_parser(intent_parser)
+                self.intent_parsers[name] = (skill_id, intent_parser)
+            self.intents[skill_id][name] = data
+            self.generation += 1
+
+    def detach_intent(self, intent_name):
+        """Remove an intent from the engine.
+
+        Arguments:
+            intent_name (str): full intent name (skill_id:intent)
+        """
+        with self.lock:
+            if intent_name not in self.intent_parsers:
+                return
+            skill_id, _ = self.intent_parsers.pop(intent_name)
+            self.intents[skill_id].pop(intent_name, None)
+            if not self.intents[skill_id]:
+                del self.intents[skill_id]
+            self._update_engine_intents()
+            self.generation += 1
+
+    def detach_skill(self, skill_id):
+        """Remove all intents, vocabulary and regexes of a skill.
+
+        Arguments:
+            skill_id (str): skill identifier, an ending ':' is ignored
+        """
+        skill_id = skill_id.rstrip(':')
+        with self.lock:
+            intents = self.intents.pop(skill_id, {})
+            vocab = self.vocab.pop(skill_id, {})
+            regexes = self.regexes.pop(skill_id, {})
+            if intents or vocab or regexes:
+                self.generation += 1
+
+            for name in intents:
+                self.intent_parsers.pop(name, None)
+            if intents:
+                self._update_engine_intents()
+
+            for data in vocab.values():
+                for entry in _trie_entries(data):
+                    self._trie_refs[entry] -= 1
+                    if self._trie_refs[entry] <= 0:
+                        del self._trie_refs[entry]
+                        self._remove_trie_entry(*entry)
+
+            for regex_str in regexes:
+                self._regex_refs[regex_str] -= 1
+                if self._regex_refs[regex_str] <= 0:
+                    del self._regex_refs[regex_str]
+                    self._remove_regex(regex_str)
+
+    def _update_engine_intents(self):
+        self.engine.intent_parsers = [
+            parser for _, parser in self.intent_parsers.values()]
+
+    def _remove_trie_entry(self, key, data):
+        try:
+            self.engine.trie.remove(key, data)
+        except KeyError:
+            pass
+
+    def _remove_regex(self, regex_str):
+        self.engine._regex_strings.discard(regex_str)
+        # The list is shared with the entity tagger, modify it in place
+        regexes = self.engine.regular_expressions_entities
+        regexes[:] = [r for r in regexes if r.pattern != regex_str]
+
+    def vocab_manifest(self, skill_id=None):
+        """Get registered vocabulary and regexes.
+
+        Arguments:
+            skill_id (str): only get entries of this skill
+
+        Returns:
+            list: register_vocab message data of each entry
+        """
+        with self.lock:
+            if skill_id is not None:
+                skill_id = skill_id.rstrip(':')
+                return (list(self.vocab.get(skill_id, {}).values()) +
+                        list(self.regexes.get(skill_id, {}).values()))
+            manifest = []
+            for table in (self.vocab, self.regexes):
+                for entries in table.values():
+                    manifest.extend(entries.values())
+            return manifest
+
+    def intent_manifest(self, skill_id=None):
+        """Get names of the registered intents.
+
+        Arguments:
+            skill_id (str): only get intents of this skill
+
+        Returns:
+            list: intent names
+        """
+        with self.lock:
+            if skill_id is not None:
+                return list(self.intents.get(skill_id.rstrip(':'), {}))
+            return list(self.intent_parsers)
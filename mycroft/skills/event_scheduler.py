@@ -14,11 +14,17 @@
 #
 """Event scheduler system for calling skill (and other) methods at a specific
 times.
+
+Scheduled times are kept in a priority queue. The scheduler thread sleeps
+until the first event is due, changes to the schedule wake it up early when
+needed.
 """
+import heapq
 import json
 import time
 from datetime import datetime, timedelta
-from threading import Thread, Lock
+from itertools import count
+from threading import Thread, Condition
 from os.path import isfile, join, expanduser
 
 from mycroft.configuration import Configuration
@@ -26,6 +32,10 @@ from mycroft.messagebus.message import Message
 from mycroft.util.log import LOG
 from .mycroft_skill.event_container import EventContainer, create_basic_wrapper
 
+# Max time to sleep between checks, protects against changes of the system
+# clock making the scheduler oversleep.
+MAX_WAIT = 60
+
 
 def repeat_time(sched_time, repeat):
     """Next scheduled time for repeating event. Guarantees that the
@@ -44,6 +54,14 @@ def repeat_time(sched_time, repeat):
     return next_time
 
 
+def _index_of(entries, entry):
+    """Find the position of a specific entry object in a list."""
+    for index, e in enumerate(entries or []):
+        if e is entry:
+            return index
+    return None
+
+
 class EventScheduler(Thread):
     """Create an event scheduler thread. Will send messages at a
      predetermined time to the registered targets.
@@ -56,8 +74,15 @@ class EventScheduler(Thread):
         super().__init__()
         data_dir = expanduser(Configuration.get()['data_dir'])
 
+        # event name -> list of (time, repeat, data, context)
         self.events = {}
-        self.event_lock = Lock()
+        self.event_lock = Condition()
+        # Heap of [time, sequence number, event name, entry] ordered by time.
+        # Removed or updated entries are left in the queue and skipped when
+        # reaching the head.
+        self.queue = []
+        self._sequence = count()
+        self._stale = 0
 
         self.bus = bus
         self.is_running = True
@@ -91,38 +116,86 @@ class EventScheduler(Thread):
                     # discard non repeating events that has already happened
                     self.events[key] = [tuple(e) for e in event_list
                                         if e[0] > current_time or e[1]]
+                self.clear_empty()
+                self._rebuild_queue()
+
+    def _push(self, event, entry):
+        """Add an entry to the queue, must be called with the lock held.
+
+        Returns:
+            bool: True if the entry is the new head of the queue
+        """
+        heapq.heappush(self.queue,
+                       (entry[0], next(self._sequence), event, entry))
+        return self.queue[0][3] is entry
+
+    def _is_stale(self, item):
+        return _index_of(self.events.get(item[2]), item[3]) is None
+
+    def _prune(self):
+        """Drop stale entries from the head of the queue.
+
+        Rebuilds the queue when most of it is stale. Must be called with the
+        lock held.
+        """
+        while self.queue and self._is_stale(self.queue[0]):
+            heapq.heappop(self.queue)
+            self._stale -= 1
+        if self._stale > 100 and self._stale > len(self.queue) // 2:
+            self._rebuild_queue()
+
+    def _rebuild_queue(self):
+        self.queue = [(entry[0], next(self._sequence), event, entry)
+                      for event, entries in self.events.items()
+                      for entry in entries]
+        heapq.heapify(self.queue)
+        self._stale = 0
+
+    def _time_to_next(self):
+        """Seconds until the first event is due, None if nothing is queued.
+
+        Must be called with the lock held.
+        """
+        if not self.queue:
+            return None
+        return max(0.0, self.queue[0][0] - time.time())
 
     def run(self):
         while self.is_running:
             self.check_state()
-            time.sleep(0.5)
+            with self.event_lock:
+                if self.is_running:
+                    timeout = self._time_to_next()
+                    if timeout is None or timeout > MAX_WAIT:
+                        timeout = MAX_WAIT
+                    self.event_lock.wait(timeout)
 
     def check_state(self):
         """Check if an event should be triggered."""
+        pending_messages = []
         with self.event_lock:
-            # Check all events
-            pending_messages = []
-            for event in self.events:
-                current_time = time.time()
-                e = self.events[event]
-                # Get scheduled times that has passed
-                passed = [(t, r, d, c) for
-                          (t, r, d, c) in e if t <= current_time]
-                # and remaining times that we're still waiting for
-                remaining = [(t, r, d, c) for
-                             t, r, d, c in e if t > current_time]
+            current_time = time.time()
+            while self.queue and self.queue[0][0] <= current_time:
+                _, _, event, entry = heapq.heappop(self.queue)
+                entries = self.events.get(event)
+                index = _index_of(entries, entry)
+                if index is None:
+                    self._stale -= 1
+                    continue
+
+                sched_time, repeat, data, context = entry
                 # Trigger registered methods
-                for sched_time, repeat, data, context in passed:
-                    pending_messages.append(Message(event, data, context))
-                    # if this is a repeated event add a new trigger time
-                    if repeat:
-                        next_time = repeat_time(sched_time, repeat)
-                        remaining.append((next_time, repeat, data, context))
-                # update list of events
-                self.events[event] = remaining
-
-        # Remove events have are now completed
-        self.clear_empty()
+                pending_messages.append(Message(event, data, context))
+                # if this is a repeated event add a new trigger time
+                if repeat:
+                    next_time = repeat_time(sched_time, repeat)
+                    entries[index] = (next_time, repeat, data, context)
+                    self._push(event, entries[index])
+                else:
+                    del entries[index]
+                    # Remove events that are now completed
+                    if not entries:
+                        self.events.pop(event)
 
         # Finally, emit the queued up events that triggered
         for msg in pending_messages:
@@ -152,8 +225,12 @@ class EventScheduler(Thread):
                           .format(event))
             else:
                 # add received event and time
-                event_list.append((sched_time, repeat, data, context))
+                entry = (sched_time, repeat, data, context)
+                event_list.append(entry)
                 self.events[event] = event_list
+                if self._push(event, entry):
+                    # New first event, wake up the scheduler thread
+                    self.event_lock.notify()
 
     def schedule_event_handler(self, message):
         """Messagebus interface to the schedule_event method.
@@ -185,7 +262,11 @@ class EventScheduler(Thread):
         """
         with self.event_lock:
             if event in self.events:
-                self.events.pop(event)
+                head = self.queue[0] if self.queue else None
+                self._stale += len(self.events.pop(event))
+                self._prune()
+                if self.queue and self.queue[0] is not head:
+                    self.event_lock.notify()
 
     def remove_event_handler(self, message):
         """Messagebus interface to the remove_event method."""
@@ -207,6 +288,11 @@ class EventScheduler(Thread):
             if len(self.events.get(event, [])) > 0:
                 time, repeat, _, context = self.events[event][0]
                 self.events[event][0] = (time, repeat, data, context)
+                # The queue refers to the replaced entry
+                self._stale += 1
+                if self._push(event, self.events[event][0]):
+                    self.event_lock.notify()
+                self._prune()
 
     def update_event_handler(self, message):
         """Messagebus interface to the update_event method."""
@@ -238,6 +324,8 @@ class EventScheduler(Thread):
         with self.event_lock:
             for e in self.events:
                 self.events[e] = [i for i in self.events[e] if i[1] is None]
+            self.clear_empty()
+            self._rebuild_queue()
 
     def clear_empty(self):
         """Remove empty event entries from events dict."""
@@ -247,7 +335,9 @@ class EventScheduler(Thread):
 
     def shutdown(self):
         """Stop the running thread."""
-        self.is_running = False
+        with self.event_lock:
+            self.is_running = False
+            self.event_lock.notify()
         # Remove listeners
         self.bus.remove_all_listeners('mycroft.scheduler.schedule_event')
         self.bus.remove_all_listeners('mycroft.scheduler.remove_event')
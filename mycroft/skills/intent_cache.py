@@ -0,0 +1,111 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Cache of intent matching results.
+
+The intent service caches the Adapt and Padatious results for an utterance.
+Entries are keyed on the normalized utterances, the language, the state of
+the Adapt context and the generation of the intent registrations. When the
+generation changes (an intent or vocabulary was registered or detached) all
+entries are dropped.
+"""
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+
+
+class IntentCache:
+    """Least recently used cache of intent matches.
+
+    Arguments:
+        size (int): max number of cached utterances, 0 disables the cache
+    """
+    def __init__(self, size=100):
+        self.size = size
+        self.entries = OrderedDict()
+        self.generation = None
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    def check_generation(self, generation):
+        """Drop all entries if the intent registrations have changed.
+
+        Arguments:
+            generation: current generation of the intent registrations
+        """
+        with self.lock:
+            if generation != self.generation:
+                if self.entries:
+                    self.invalidations += 1
+                self.entries.clear()
+                self.generation = generation
+
+    def get(self, key):
+        """Get a cached result.
+
+        Arguments:
+            key (tuple): cache key
+
+        Returns:
+            copy of the cached value or None if not cached
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return deepcopy(self.entries[key])
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used one if full.
+
+        Arguments:
+            key (tuple): cache key
+            value: result to store, a copy is kept
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = deepcopy(value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: size, hits, misses, hit rate and invalidations
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'max_size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'invalidations': self.invalidations
+            }
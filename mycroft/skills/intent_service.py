@@ -23,6 +23,8 @@ from mycroft.util.lang import set_active_lang
 from mycroft.util.log import LOG
 from mycroft.util.parse import normalize
 from mycroft.metrics import report_timing, Stopwatch
+from mycroft.skills.adapt_registry import AdaptRegistry
+from mycroft.skills.intent_cache import IntentCache
 from mycroft.skills.padatious_service import PadatiousService
 from .intent_service_interface import open_intent_envelope
 
@@ -56,13 +58,28 @@ class ContextManager:
     def __init__(self, timeout):
         self.frame_stack = []
         self.timeout = timeout * 60  # minutes to seconds
+        # Incremented on every change of the frame stack
+        self.generation = 0
+
+    @property
+    def state(self):
+        """Key identifying the current context.
+
+        Changes whenever context is added or removed, or a frame expires.
+        """
+        now = time.time()
+        active_frames = len([t for (_, t) in self.frame_stack
+                             if now - t < self.timeout])
+        return self.generation, active_frames
 
     def clear_context(self):
         self.frame_stack = []
+        self.generation += 1
 
     def remove_context(self, context_id):
         self.frame_stack = [(f, t) for (f, t) in self.frame_stack
                             if context_id in f.entities[0].get('data', [])]
+        self.generation += 1
 
     def inject_context(self, entity, metadata=None):
         """
@@ -75,6 +92,7 @@ class ContextManager:
             metadata(object): dict, arbitrary metadata about entity injected
         """
         metadata = metadata or {}
+        self.generation += 1
         try:
             if len(self.frame_stack) > 0:
                 top_frame = self.frame_stack[0]
@@ -153,6 +171,7 @@ class IntentService:
     def __init__(self, bus):
         self.config = Configuration.get().get('context', {})
         self.engine = IntentDeterminationEngine()
+        self.registry = AdaptRegistry(self.engine)
 
         # Dictionary for translating a skill id to a name
         self.skill_names = {}
@@ -182,10 +201,18 @@ class IntentService:
         self.bus.on('active_skill_request', add_active_skill_handler)
         self.active_skills = []  # [skill_id , timestamp]
         self.converse_timeout = 5  # minutes to prune active_skills
+        skills_config = Configuration.get().get('skills', {})
+        converse_config = skills_config.get('converse', {})
+        self.parallel_converse = converse_config.get('parallel', False)
+        # seconds to wait for all responses in parallel mode
+        self.converse_response_timeout = converse_config.get('timeout', 3.0)
+
+        cache_config = skills_config.get('intent_cache', {})
+        self.intent_cache = IntentCache(cache_config.get('size', 100))
+        self.bus.on('intent.service.cache.stats.get',
+                    self.handle_cache_stats)
 
         # Intents API
-        self.registered_intents = []
-        self.registered_vocab = []
         self.bus.on('intent.service.adapt.get', self.handle_get_adapt)
         self.bus.on('intent.service.intent.get', self.handle_get_intent)
         self.bus.on('intent.service.skills.get', self.handle_get_skills)
@@ -218,10 +245,26 @@ class IntentService:
             self.do_converse(None, skill[0], lang, message)
 
     def do_converse(self, utterances, skill_id, lang, message):
-        converse_msg = (message.reply("skill.converse.request", {
-            "skill_id": skill_id, "utterances": utterances, "lang": lang}))
+        converse_msg = self._converse_request(utterances, skill_id, lang,
+                                              message)
         result = self.bus.wait_for_response(converse_msg,
                                             'skill.converse.response')
+        return self._handle_converse_response(result)
+
+    @staticmethod
+    def _converse_request(utterances, skill_id, lang, message):
+        return message.reply("skill.converse.request", {
+            "skill_id": skill_id, "utterances": utterances, "lang": lang})
+
+    def _handle_converse_response(self, result):
+        """Check if a converse response reports the utterance as handled.
+
+        Args:
+            result (Message): skill.converse.response, None if timed out
+
+        Returns:
+            bool: True if the skill handled the utterance
+        """
         if result and 'error' in result.data:
             self.handle_converse_error(result)
             return False
@@ -342,15 +385,8 @@ class IntentService:
 
                 if not converse:
                     # No conversation, use intent system to handle utterance
-                    intent = self._adapt_intent_match(utterances,
-                                                      norm_utterances, lang)
-                    for utt in combined:
-                        _intent = PadatiousService.instance.calc_intent(utt)
-                        if _intent:
-                            best = padatious_intent.conf if padatious_intent \
-                                else 0.0
-                            if best < _intent.conf:
-                                padatious_intent = _intent
+                    intent, padatious_intent = self._match_intents(
+                        utterances, norm_utterances, combined, lang)
                     LOG.debug("Padatious intent: {}".format(padatious_intent))
                     LOG.debug("    Adapt intent: {}".format(intent))
 
@@ -392,6 +428,55 @@ class IntentService:
         except Exception as e:
             LOG.exception(e)
 
+    def _intent_generation(self):
+        """Get the current generation of the Adapt and Padatious intents."""
+        padatious = PadatiousService.instance
+        return (self.registry.generation,
+                getattr(padatious, 'generation', None))
+
+    def _match_intents(self, utterances, norm_utterances, combined, lang):
+        """Find the best Adapt and Padatious intents for the utterances.
+
+        Results are cached, see IntentCache.
+
+        Args:
+            utterances (list): list of raw utterances
+            norm_utterances (list): the normalized utterances
+            combined (list): raw and normalized utterances
+            lang (str): language code, e.g "en-us"
+
+        Returns:
+            tuple: (Adapt intent, Padatious intent), None where no match
+        """
+        key = None
+        if self.intent_cache.enabled:
+            generation = self._intent_generation()
+            self.intent_cache.check_generation(generation)
+            key = (tuple(norm_utterances), lang, self.context_manager.state,
+                   generation)
+            cached = self.intent_cache.get(key)
+            if cached is not None:
+                intent, padatious_intent, utt_index = cached
+                if intent:
+                    # Utterances may differ in the raw form
+                    intent['utterance'] = utterances[utt_index]
+                return intent, padatious_intent
+
+        intent = self._adapt_intent_match(utterances, norm_utterances, lang)
+        padatious_intent = None
+        for utt in combined:
+            _intent = PadatiousService.instance.calc_intent(utt)
+            if _intent:
+                best = padatious_intent.conf if padatious_intent else 0.0
+                if best < _intent.conf:
+                    padatious_intent = _intent
+
+        if key is not None:
+            utt_index = utterances.index(intent['utterance']) if intent \
+                else None
+            self.intent_cache.put(key, (intent, padatious_intent, utt_index))
+        return intent, padatious_intent
+
     def _converse(self, utterances, lang, message):
         """Give active skills a chance at the utterance
 
@@ -409,15 +494,98 @@ class IntentService:
                               if time.time() - skill[
                                   1] <= self.converse_timeout * 60]
 
+        if self.parallel_converse:
+            return self._converse_parallel(utterances, lang, message)
+
         # check if any skill wants to handle utterance
+        timing = []
+        handled = False
         for skill in copy(self.active_skills):
-            if self.do_converse(utterances, skill[0], lang, message):
+            start = time.monotonic()
+            handled = self.do_converse(utterances, skill[0], lang, message)
+            timing.append((skill[0], time.monotonic() - start))
+            if handled:
                 # update timestamp, or there will be a timeout where
                 # intent stops conversing whether its being used or not
                 self.add_active_skill(skill[0])
-                return True
+                break
+        self._report_converse_timing(message, timing)
+        return handled
+
+    def _converse_parallel(self, utterances, lang, message):
+        """Send converse requests to all active skills at once.
+
+        The responses are checked in active skill order, so the most
+        recently used skill still gets priority. Lower priority skills are
+        only waited for until a higher priority skill handles the
+        utterance and all requests share a single deadline.
+
+        NOTE: Every active skill receives the utterance, even if a skill
+              with higher priority ends up handling it.
+
+        Args:
+            utterances (list):  list of utterances
+            lang (string):      4 letter ISO language code
+            message (Message):  message to use to generate reply
+
+        Returns:
+            bool: True if converse handled it, False if  no skill processes it
+        """
+        skill_ids = [skill[0] for skill in self.active_skills]
+        if not skill_ids:
+            return False
+
+        start = time.monotonic()
+        deadline = start + self.converse_response_timeout
+        requests = self.bus.send_requests(
+            [self._converse_request(utterances, skill_id, lang, message)
+             for skill_id in skill_ids],
+            'skill.converse.response')
+        handled_by = None
+        try:
+            for skill_id, request in zip(skill_ids, requests):
+                result = request.wait(max(deadline - time.monotonic(), 0))
+                if self._handle_converse_response(result):
+                    handled_by = skill_id
+                    break
+        finally:
+            for request in requests:
+                request.close()
+
+        self._report_converse_timing(
+            message,
+            [(skill_id, request.response_time - start if request.done
+              else None)
+             for skill_id, request in zip(skill_ids, requests)]
+        )
+        if handled_by:
+            # update timestamp, or there will be a timeout where
+            # intent stops conversing whether its being used or not
+            self.add_active_skill(handled_by)
+            return True
         return False
 
+    def _report_converse_timing(self, message, timing):
+        """Emit the time each skill took to respond to converse.
+
+        Args:
+            message (Message): message to use to generate reply
+            timing (list): (skill_id, seconds) tuples, seconds is None for
+                           skills that didn't respond in time
+        """
+        if not timing:
+            return
+        for skill_id, duration in timing:
+            if duration is None:
+                LOG.debug('{} did not respond to converse'.format(skill_id))
+            else:
+                LOG.debug('{} responded to converse in {:.3f}s'.format(
+                    skill_id, duration))
+        self.bus.emit(message.reply(
+            'intent.service.converse.timing',
+            {'skills': [{'skill_id': skill_id, 'duration': duration}
+                        for skill_id, duration in timing]}))
+
     def _adapt_intent_match(self, raw_utt, norm_utt, lang):
         """Run the Adapt engine to search for an matching intent
 
@@ -462,33 +630,21 @@ class IntentService:
         return best_intent
 
     def handle_register_vocab(self, message):
-        start_concept = message.data.get('start')
-        end_concept = message.data.get('end')
-        regex_str = message.data.get('regex')
-        alias_of = message.data.get('alias_of')
-        if regex_str:
-            self.engine.register_regex_entity(regex_str)
-        else:
-            self.engine.register_entity(
-                start_concept, end_concept, alias_of=alias_of)
-        self.registered_vocab.append(message.data)
+        self.registry.register_vocab(message.data,
+                                     message.context.get('skill_id'))
 
     def handle_register_intent(self, message):
         intent = open_intent_envelope(message)
-        self.engine.register_intent_parser(intent)
+        self.registry.register_intent(message.data, intent,
+                                      message.context.get('skill_id'))
 
     def handle_detach_intent(self, message):
         intent_name = message.data.get('intent_name')
-        new_parsers = [
-            p for p in self.engine.intent_parsers if p.name != intent_name]
-        self.engine.intent_parsers = new_parsers
+        self.registry.detach_intent(intent_name)
 
     def handle_detach_skill(self, message):
         skill_id = message.data.get('skill_id')
-        new_parsers = [
-            p for p in self.engine.intent_parsers if
-            not p.name.startswith(skill_id)]
-        self.engine.intent_parsers = new_parsers
+        self.registry.detach_skill(skill_id)
 
     def handle_add_context(self, message):
         """Add context
@@ -558,10 +714,24 @@ class IntentService:
                                     {"skills": [s[0] for s in
                                                 self.active_skills]}))
 
+    @property
+    def registered_intents(self):
+        return self.registry.intent_manifest()
+
+    @property
+    def registered_vocab(self):
+        return self.registry.vocab_manifest()
+
+    def handle_cache_stats(self, message):
+        self.bus.emit(message.reply("intent.service.cache.stats",
+                                    self.intent_cache.get_stats()))
+
     def handle_manifest(self, message):
+        intents = self.registry.intent_manifest(message.data.get('skill_id'))
         self.bus.emit(message.reply("intent.service.adapt.manifest",
-                                    {"intents": self.registered_intents}))
+                                    {"intents": intents}))
 
     def handle_vocab_manifest(self, message):
+        vocab = self.registry.vocab_manifest(message.data.get('skill_id'))
         self.bus.emit(message.reply("intent.service.adapt.vocab.manifest",
-                                    {"vocab": self.registered_vocab}))
+                                    {"vocab": vocab}))
@@ -34,11 +34,23 @@ class IntentServiceInterface:
 
     def __init__(self, bus=None):
         self.bus = bus
+        self.skill_id = None
         self.registered_intents = []
 
     def set_bus(self, bus):
         self.bus = bus
 
+    def set_id(self, skill_id):
+        """Set the id of the skill registering vocabulary and intents.
+
+        The id is sent in the message context allowing the intent service to
+        index the registrations per skill.
+        """
+        self.skill_id = skill_id
+
+    def _register_context(self):
+        return {'skill_id': self.skill_id} if self.skill_id else None
+
     def register_adapt_keyword(self, vocab_type, entity, aliases=None):
         """Send a message to the intent service to add an Adapt keyword.
 
@@ -47,12 +59,14 @@ class IntentServiceInterface:
             aliases (list): List of alternative kewords
         """
         aliases = aliases or []
+        context = self._register_context()
         self.bus.emit(Message("register_vocab",
-                              {'start': entity, 'end': vocab_type}))
+                              {'start': entity, 'end': vocab_type},
+                              context))
         for alias in aliases:
             self.bus.emit(Message("register_vocab", {
                 'start': alias, 'end': vocab_type, 'alias_of': entity
-            }))
+            }, context))
 
     def register_adapt_regex(self, regex):
         """Register a regex with the intent service.
@@ -61,7 +75,8 @@ class IntentServiceInterface:
             regex (str): Regex to be registered, (Adapt extracts keyword
                          reference from named match group.
         """
-        self.bus.emit(Message("register_vocab", {'regex': regex}))
+        self.bus.emit(Message("register_vocab", {'regex': regex},
+                              self._register_context()))
 
     def register_adapt_intent(self, name, intent_parser):
         """Register an Adapt intent parser object.
@@ -69,7 +84,8 @@ class IntentServiceInterface:
         Serializes the intent_parser and sends it over the messagebus to
         registered.
         """
-        self.bus.emit(Message("register_intent", intent_parser.__dict__))
+        self.bus.emit(Message("register_intent", intent_parser.__dict__,
+                              self._register_context()))
         self.registered_intents.append((name, intent_parser))
 
     def detach_intent(self, intent_name):
@@ -258,8 +274,10 @@ class IntentQueryApi:
             return None
         return data["skills"]
 
-    def get_adapt_manifest(self):
+    def get_adapt_manifest(self, skill_id=None):
+        """ get adapt intent names, optionally only those of skill_id """
         msg = Message("intent.service.adapt.manifest.get",
+                      {"skill_id": skill_id},
                       context={"destination": "intent_service",
                                "source": "intent_api"})
         resp = self.bus.wait_for_response(msg,
@@ -290,8 +308,9 @@ class IntentQueryApi:
         return {"adapt": adapt,
                 "padatious": padatious}
 
-    def get_vocab_manifest(self):
+    def get_vocab_manifest(self, skill_id=None):
         msg = Message("intent.service.adapt.vocab.manifest.get",
+                      {"skill_id": skill_id},
                       context={"destination": "intent_service",
                                "source": "intent_api"})
         reply_msg_type = 'intent.service.adapt.vocab.manifest'
@@ -313,8 +332,9 @@ class IntentQueryApi:
         return [{"name": voc, "samples": vocab[voc]["samples"]}
                 for voc in vocab]
 
-    def get_regex_manifest(self):
+    def get_regex_manifest(self, skill_id=None):
         msg = Message("intent.service.adapt.vocab.manifest.get",
+                      {"skill_id": skill_id},
                       context={"destination": "intent_service",
                                "source": "intent_api"})
         reply_msg_type = 'intent.service.adapt.vocab.manifest'
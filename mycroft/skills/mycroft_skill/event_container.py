@@ -78,6 +78,8 @@ def create_wrapper(handler, skill_id, on_start, on_end, on_error):
                 report_timing(context['ident'], 'skill_handler', stopwatch,
                               {'handler': handler.__name__,
                                'skill_id': skill_id})
+    # Used by the messagebus dispatcher for per skill limits and stats
+    wrapper.skill_id = skill_id
     return wrapper
 
 
@@ -135,6 +137,8 @@ class EventContainer:
             self.remove(name)
             handler(message)
 
+        once_wrapper.skill_id = getattr(handler, 'skill_id', None)
+
         if handler:
             if once:
                 self.bus.once(name, once_wrapper)
@@ -19,7 +19,6 @@ import sys
 import re
 import traceback
 from itertools import chain
-from os import walk
 from os.path import join, abspath, dirname, basename, exists
 from pathlib import Path
 from threading import Event, Timer
@@ -52,6 +51,8 @@ from ..event_scheduler import EventSchedulerInterface
 from ..intent_service_interface import IntentServiceInterface
 from ..settings import get_local_settings, save_settings
 from ..skill_data import (
+    ResourceIndex,
+    compile_vocabulary,
     load_vocabulary,
     load_regex,
     to_alnum,
@@ -126,6 +127,7 @@ class MycroftSkill:
         #: Member variable containing the absolute path of the skill's root
         #: directory. E.g. /opt/mycroft/skills/my-skill.me/
         self.root_dir = dirname(abspath(sys.modules[self.__module__].__file__))
+        self._resource_index = None
 
         self.gui = SkillGUI(self)
 
@@ -251,6 +253,7 @@ class MycroftSkill:
             self._bus = bus
             self.events.set_bus(bus)
             self.intent_service.set_bus(bus)
+            self.intent_service.set_id(self.skill_id)
             self.event_scheduler.set_bus(bus)
             self.event_scheduler.set_id(self.skill_id)
             self._enclosure = EnclosureAPI(bus, self.name)
@@ -557,8 +560,9 @@ class MycroftSkill:
         way around to allow the user to say things like "yes, please" and
         still match against "Yes.voc" containing only "yes". The method first
         checks in the current skill's .voc files and secondly the "res/text"
-        folder of mycroft-core. The result is cached to avoid hitting the
-        disk each time the method is called.
+        folder of mycroft-core. The vocabulary is compiled into a single
+        matcher and cached to avoid hitting the disk each time the method is
+        called.
 
         Arguments:
             utt (str): Utterance to be tested
@@ -581,13 +585,14 @@ class MycroftSkill:
             if not voc or not exists(voc):
                 raise FileNotFoundError(
                     'Could not find {}.voc file'.format(voc_filename))
-            # load vocab and flatten into a simple list
+            # load vocab and compile it into a single matcher
             vocab = read_vocab_file(voc)
-            self.voc_match_cache[cache_key] = list(chain(*vocab))
-        if utt:
+            self.voc_match_cache[cache_key] = compile_vocabulary(
+                chain(*vocab))
+        matcher = self.voc_match_cache[cache_key]
+        if utt and matcher:
             # Check for matches against complete words
-            return any([re.match(r'.*\b' + i + r'\b.*', utt)
-                        for i in self.voc_match_cache[cache_key]])
+            return matcher.search(utt) is not None
         else:
             return False
 
@@ -725,25 +730,15 @@ class MycroftSkill:
     def _find_resource(self, res_name, lang, res_dirname=None):
         """Finds a resource by name, lang and dir
         """
-        if res_dirname:
-            # Try the old translated directory (dialog/vocab/regex)
-            path = join(self.root_dir, res_dirname, lang, res_name)
-            if exists(path):
-                return path
-
-            # Try old-style non-translated resource
-            path = join(self.root_dir, res_dirname, res_name)
-            if exists(path):
-                return path
-
-        # New scheme:  search for res_name under the 'locale' folder
-        root_path = join(self.root_dir, 'locale', lang)
-        for path, _, files in walk(root_path):
-            if res_name in files:
-                return join(path, res_name)
-
-        # Not found
-        return None
+        return self.resource_index.find(res_name, lang, res_dirname)
+
+    @property
+    def resource_index(self):
+        """Index of the skill's resource files, built on first use."""
+        index = self._resource_index
+        if index is None or index.root_dir != self.root_dir:
+            index = self._resource_index = ResourceIndex(self.root_dir)
+        return index
 
     def translate_namedvalues(self, name, delim=','):
         """Load translation dict containing names and values.
@@ -1082,7 +1077,7 @@ class MycroftSkill:
         """
         self.bus.emit(Message('register_vocab', {
             'start': entity, 'end': to_alnum(self.skill_id) + entity_type
-        }))
+        }, {'skill_id': self.skill_id}))
 
     def register_regex(self, regex_str):
         """Register a new regex.
@@ -1175,6 +1170,7 @@ class MycroftSkill:
             root_directory (str): root folder to use when loading files.
         """
         root_directory = root_directory or self.root_dir
+        self._resource_index = ResourceIndex(self.root_dir)
         self.init_dialog(root_directory)
         self.load_vocab_files(root_directory)
         self.load_regex_files(root_directory)
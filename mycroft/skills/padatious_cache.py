@@ -0,0 +1,138 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Persistent training cache for the Padatious intent parser.
+
+Padatious skips training objects whose saved model matches a hash of the
+intent lines and its major.minor version. An index stored in the intent
+cache directory adds a hash of the whole source file and the full
+Padatious version, files whose hash changed are registered with
+reload_cache so Padatious retrains them.
+
+The index only holds the currently registered intents and entities, it's
+rewritten after each training.
+"""
+import hashlib
+import json
+import time
+from os import makedirs
+from os.path import join
+
+from mycroft.util.log import LOG
+
+INDEX_FILE = 'mycroft_training_index.json'
+
+
+def content_hash(file_name, version):
+    """Hash the contents of an intent or entity file.
+
+    Arguments:
+        file_name (str): path to the file
+        version (str): Padatious version, included in the hash so a new
+                       version invalidates all cached models
+
+    Returns:
+        str: hex digest
+    """
+    sha = hashlib.sha256(version.encode('utf-8'))
+    with open(file_name, 'rb') as f:
+        sha.update(f.read())
+    return sha.hexdigest()
+
+
+class TrainingCache:
+    """Index of the trained Padatious models in the cache directory.
+
+    Arguments:
+        cache_dir (str): Padatious intent cache directory
+        version (str): Padatious version
+    """
+    def __init__(self, cache_dir, version):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.index_file = join(cache_dir, INDEX_FILE)
+        self.index = self._load_index()
+        # Hashes of the registered files
+        self.registered = {}
+        # Registered objects forced to retrain since the last training
+        self.changed = set()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the index to the cache directory."""
+        try:
+            makedirs(self.cache_dir, exist_ok=True)
+            with open(self.index_file, 'w') as f:
+                json.dump(self.index, f, indent=2)
+        except OSError as e:
+            LOG.warning('Could not save Padatious training index '
+                        '({})'.format(repr(e)))
+
+    def check(self, name, file_name):
+        """Check if a registered file can be loaded from the cache.
+
+        Files missing from the index (e.g. trained before the index
+        existed) are left to the hash check done by Padatious itself.
+
+        Arguments:
+            name (str): name of the Padatious object, entities use the
+                        wrapped '{name}' form
+            file_name (str): intent or entity file
+
+        Returns:
+            bool: False if the file changed since the model was trained and
+                  the object must be retrained
+        """
+        key = content_hash(file_name, self.version)
+        self.registered[name] = key
+        entry = self.index.get(name)
+        if entry is None or entry.get('hash') == key:
+            self.changed.discard(name)
+            return True
+        self.changed.add(name)
+        return False
+
+    def forget(self, name):
+        """Drop a detached object from the index at the next training."""
+        self.registered.pop(name, None)
+        self.changed.discard(name)
+
+    def train(self, container, single_thread=False, timeout=20):
+        """Train an IntentContainer and update the index.
+
+        Arguments:
+            container (IntentContainer): container to train
+            single_thread (bool): train in the current process
+            timeout (float): seconds to wait for the training processes
+
+        Returns:
+            dict: seconds spent training and the names of the objects
+                  retrained because their file changed
+        """
+        start = time.monotonic()
+        container.train(single_thread=single_thread, timeout=timeout)
+        duration = time.monotonic() - start
+
+        retrained = sorted(self.changed)
+        self.changed = set()
+        self.index = {name: {'hash': key}
+                      for name, key in self.registered.items()}
+        self.save()
+        return {'duration': duration, 'retrained': retrained}
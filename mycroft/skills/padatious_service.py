@@ -22,6 +22,7 @@ from os.path import expanduser, isfile
 from mycroft.configuration import Configuration
 from mycroft.messagebus.message import Message
 from mycroft.skills.core import FallbackSkill
+from mycroft.skills.padatious_cache import TrainingCache
 from mycroft.util.log import LOG
 
 
@@ -42,6 +43,7 @@ class PadatiousService(FallbackSkill):
 
         try:
             from padatious import IntentContainer
+            from padatious import __version__ as padatious_version
         except ImportError:
             LOG.error('Padatious not installed. Please re-run dev_setup.sh')
             try:
@@ -52,6 +54,7 @@ class PadatiousService(FallbackSkill):
             return
 
         self.container = IntentContainer(intent_cache)
+        self.training_cache = TrainingCache(intent_cache, padatious_version)
 
         self._bus = bus
         self.bus.on('padatious:register_intent', self.register_intent)
@@ -81,6 +84,8 @@ class PadatiousService(FallbackSkill):
 
         self.registered_intents = []
         self.registered_entities = []
+        # Incremented on every change affecting intent matching
+        self.generation = 0
 
     def make_active(self):
         """Override the make active since this is not a real fallback skill."""
@@ -98,8 +103,11 @@ class PadatiousService(FallbackSkill):
         self.finished_training_event.clear()
 
         LOG.info('Training... (single_thread={})'.format(single_thread))
-        self.container.train(single_thread=single_thread)
-        LOG.info('Training complete.')
+        result = self.training_cache.train(self.container,
+                                           single_thread=single_thread)
+        LOG.info('Training complete in {:.2f}s.'.format(result['duration']))
+        self._report_training(result)
+        self.generation += 1
 
         self.finished_training_event.set()
         if not self.finished_initial_train:
@@ -107,6 +115,17 @@ class PadatiousService(FallbackSkill):
             self.bus.emit(Message('mycroft.ready'))
             self.finished_initial_train = True
 
+    def _report_training(self, result):
+        """Log and emit the training time and the retrained objects.
+
+        Arguments:
+            result (dict): training result of TrainingCache.train()
+        """
+        if result['retrained']:
+            LOG.debug('Retrained changed files: {}'.format(
+                ', '.join(result['retrained'])))
+        self.bus.emit(Message('intent.service.padatious.training', result))
+
     def wait_and_train(self):
         if not self.finished_initial_train:
             return
@@ -127,6 +146,8 @@ class PadatiousService(FallbackSkill):
         if intent_name in self.registered_intents:
             self.registered_intents.remove(intent_name)
             self.container.remove_intent(intent_name)
+            self.training_cache.forget(intent_name)
+            self.generation += 1
 
     def handle_detach_intent(self, message):
         self.__detach_intent(message.data.get('intent_name'))
@@ -147,7 +168,11 @@ class PadatiousService(FallbackSkill):
             LOG.warning('Could not find file ' + file_name)
             return
 
-        register_func(name, file_name)
+        # Padatious stores entities under the wrapped '{name}'
+        cache_name = name if object_name == 'intent' else '{' + name + '}'
+        cached = self.training_cache.check(cache_name, file_name)
+        register_func(name, file_name, reload_cache=not cached)
+        self.generation += 1
         self.train_time = get_time() + self.train_delay
         self.wait_and_train()
 
@@ -18,7 +18,7 @@
 import collections
 import csv
 import re
-from os import walk
+from os import scandir, walk
 from os.path import splitext, join
 
 from mycroft.util.format import expand_options
@@ -47,6 +47,23 @@ def read_vocab_file(path):
     return vocab
 
 
+def compile_vocabulary(terms):
+    """Compile vocabulary into a regex finding any of the terms as words.
+
+    The terms are matched literally, longest first, at word boundaries.
+
+    Arguments:
+        terms (iterable): vocabulary terms
+
+    Returns:
+        compiled regex, None if there are no terms
+    """
+    terms = sorted(set(terms), key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r'\b(?:{})\b'.format('|'.join(map(re.escape, terms))))
+
+
 def load_regex_from_file(path, skill_id):
     """Load regex from file
     The regex is sent to the intent handler using the message bus
@@ -228,3 +245,66 @@ def read_translated_file(filename, data):
             return text.format(**data or {}).rstrip('\n').split('\n')
     else:
         return None
+
+
+def _list_dir(path):
+    try:
+        return list(scandir(path))
+    except OSError:
+        return []
+
+
+class ResourceIndex:
+    """Index of the resource files of a skill.
+
+    The skill directory is listed once so resources can be looked up
+    without touching the file system. The index covers the same locations
+    MycroftSkill.find_resource() searches:
+        <skill>/<res_dirname>/<lang>/<res_name>
+        <skill>/<res_dirname>/<res_name>
+        <skill>/locale/<lang>/.../<res_name>
+
+    Arguments:
+        root_dir (str): skill directory
+    """
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self._resources = {}  # (lang or None, res_dirname, res_name): path
+        self._locale = {}  # (lang, res_name): path
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the index from the skill directory."""
+        resources = {}
+        locale = {}
+        for res_dir in _list_dir(self.root_dir):
+            if (not res_dir.is_dir() or res_dir.name.startswith('.') or
+                    res_dir.name == '__pycache__'):
+                continue
+            for entry in _list_dir(res_dir.path):
+                resources[(None, res_dir.name, entry.name)] = entry.path
+                if entry.is_dir():
+                    for res in _list_dir(entry.path):
+                        key = (entry.name, res_dir.name, res.name)
+                        resources[key] = res.path
+            if res_dir.name == 'locale':
+                for lang_dir in _list_dir(res_dir.path):
+                    for path, _, files in walk(lang_dir.path):
+                        for name in files:
+                            locale.setdefault((lang_dir.name, name),
+                                              join(path, name))
+        self._resources = resources
+        self._locale = locale
+
+    def find(self, res_name, lang, res_dirname=None):
+        """Find a resource by name, lang and dir.
+
+        Returns:
+            str: path of the resource, None if not found
+        """
+        if res_dirname:
+            path = (self._resources.get((lang, res_dirname, res_name)) or
+                    self._resources.get((None, res_dirname, res_name)))
+            if path:
+                return path
+        return self._locale.get((lang, res_name))
@@ -17,14 +17,19 @@ import gc
 import imp
 import os
 import sys
-from time import time
+from threading import Lock
+from time import monotonic, time
 
 from mycroft.configuration import Configuration
 from mycroft.messagebus import Message
 from mycroft.skills.settings import save_settings
+from mycroft.util import create_daemon
 from mycroft.util.log import LOG
 
 from .settings import SettingsMetaUploader
+from .skill_manifest import (RecordingBus, build_manifest, load_manifest,
+                             save_manifest)
+from .skill_watcher import is_ignored_file
 
 SKILL_MAIN_MODULE = '__init__.py'
 
@@ -45,13 +50,7 @@ def _get_last_modified_time(path):
     for root_dir, dirs, files in os.walk(path):
         dirs[:] = [d for d in dirs if not d.startswith('.')]
         for f in files:
-            ignore_file = (
-                    f.endswith('.pyc') or
-                    f == 'settings.json' or
-                    f.startswith('.') or
-                    f.endswith('.qmlc')
-            )
-            if not ignore_file:
+            if not is_ignored_file(f):
                 all_files.append(os.path.join(root_dir, f))
 
     # check files of interest in the skill root directory
@@ -59,7 +58,15 @@ def _get_last_modified_time(path):
 
 
 class SkillLoader:
-    def __init__(self, bus, skill_directory):
+    """Load, reload and unload a skill.
+
+    Arguments:
+        bus: Mycroft messagebus connection
+        skill_directory (str): directory of the skill
+        lazy (bool): only register the skill's intents until one of them is
+                     triggered, if the skill allows it
+    """
+    def __init__(self, bus, skill_directory, lazy=False):
         self.bus = bus
         self.skill_directory = skill_directory
         self.skill_id = os.path.basename(skill_directory)
@@ -67,9 +74,16 @@ class SkillLoader:
         self.loaded = False
         self.last_modified = 0
         self.last_loaded = 0
+        self.load_time = 0  # seconds taken by the last load
         self.instance = None
         self.active = True
         self.config = Configuration.get()
+        self.lazy = lazy
+        self.deferred = False  # True while only the intents are registered
+        self.last_used = 0
+        self._intent_triggers = []
+        self._recording = None
+        self._activation_lock = Lock()
 
     @property
     def is_blacklisted(self):
@@ -80,18 +94,27 @@ class SkillLoader:
         else:
             return False
 
-    def reload_needed(self):
+    def reload_needed(self, last_modified=None):
         """Load an unloaded skill or reload unloaded/changed skill.
 
+        Arguments:
+            last_modified (float): time of the last change reported by the
+                                   skill watcher, if not provided the skill
+                                   directory is scanned
+
         Returns:
              bool: if the skill was loaded/reloaded
         """
-        try:
-            self.last_modified = _get_last_modified_time(self.skill_directory)
-        except FileNotFoundError as e:
-            LOG.error('Failed to get last_modification time '
-                      '({})'.format(repr(e)))
-            self.last_modified = self.last_loaded
+        if last_modified is not None:
+            self.last_modified = max(self.last_modified, last_modified)
+        else:
+            try:
+                self.last_modified = _get_last_modified_time(
+                    self.skill_directory)
+            except FileNotFoundError as e:
+                LOG.error('Failed to get last_modification time '
+                          '({})'.format(repr(e)))
+                self.last_modified = self.last_loaded
 
         modified = self.last_modified > self.last_loaded
 
@@ -104,16 +127,131 @@ class SkillLoader:
         )
         return modified and reload_allowed
 
+    @property
+    def manifest_file(self):
+        data_dir = os.path.expanduser(self.config['data_dir'])
+        return os.path.join(data_dir, 'skill_manifests',
+                            self.skill_id + '.json')
+
     def reload(self):
         LOG.info('ATTEMPTING TO RELOAD SKILL: ' + self.skill_id)
         if self.instance:
             self._unload()
+        self._undefer()
         return self._load()
 
     def load(self):
         LOG.info('ATTEMPTING TO LOAD SKILL: ' + self.skill_id)
+        if self.lazy and not self.is_blacklisted and self._defer():
+            return True
         return self._load()
 
+    def defer_if_idle(self, idle_time):
+        """Unload a lazily loaded skill that hasn't been used for a while.
+
+        The skill's intents stay registered and it's loaded again when one
+        of them is triggered.
+
+        Arguments:
+            idle_time (float): seconds since the last triggered intent
+
+        Returns:
+            bool: True if the skill was unloaded
+        """
+        with self._activation_lock:
+            idle = monotonic() - self.last_used >= idle_time
+            if not (self.loaded and self._intent_triggers and idle):
+                return False
+            # Keep the skill loaded if it can't be deferred again
+            manifest = self._load_manifest()
+            if not manifest or not manifest['deferrable']:
+                return False
+            LOG.info('Unloading idle skill {}'.format(self.skill_id))
+            self._unload()
+            self.instance = None
+            # Drop the module so it can be garbage collected
+            sys.modules.pop(self.skill_id.replace('.', '_'), None)
+            if self._defer(manifest):
+                return True
+            self._load()
+            return False
+
+    def _load_manifest(self):
+        """Load the manifest of the skill, None if missing or stale."""
+        return load_manifest(self.manifest_file, self._get_modified_time(),
+                             self.config.get('lang'))
+
+    def _defer(self, manifest=None):
+        """Register the intents from the manifest without loading the skill.
+
+        Arguments:
+            manifest (dict): already loaded manifest of the skill
+
+        Returns:
+            bool: True if the skill was deferred
+        """
+        manifest = manifest or self._load_manifest()
+        if not manifest or not manifest['deferrable']:
+            return False
+        for msg_type, data in manifest['messages']:
+            self.bus.emit(Message(msg_type, data))
+        self._watch_intents(manifest['intents'])
+        self.load_attempted = True
+        self.loaded = False
+        self.deferred = True
+        self.last_loaded = time()
+        self.bus.emit(Message(
+            'mycroft.skills.loaded',
+            data=dict(path=self.skill_directory, id=self.skill_id,
+                      name=manifest['name'], modified=self.last_modified,
+                      deferred=True)
+        ))
+        LOG.info('Skill {} deferred until first use'.format(self.skill_id))
+        return True
+
+    def _undefer(self):
+        """Remove the intents registered for a deferred skill."""
+        if self.deferred:
+            self.deferred = False
+            self.bus.emit(Message('detach_skill',
+                                  {'skill_id': self.skill_id + ':'}))
+
+    def _watch_intents(self, intents):
+        """Track usage of the skill's intents, loading it when deferred."""
+        if intents == self._intent_triggers:
+            return
+        self._remove_intent_triggers()
+        for intent in intents:
+            self.bus.on(intent, self._handle_intent)
+        self._intent_triggers = intents
+
+    def _remove_intent_triggers(self):
+        for intent in self._intent_triggers:
+            self.bus.remove(intent, self._handle_intent)
+        self._intent_triggers = []
+
+    def _handle_intent(self, message):
+        self.last_used = monotonic()
+        if self.deferred:
+            # Loading may wait for bus responses, don't block the bus thread
+            create_daemon(self._activate, args=(message,))
+
+    def _activate(self, message):
+        """Load a deferred skill and pass it the intent that triggered it."""
+        with self._activation_lock:
+            if self.deferred:
+                LOG.info('Loading deferred skill {}'.format(self.skill_id))
+                self._undefer()
+                self._load()
+        if self.loaded:
+            self.bus.emit(message)
+
+    def _get_modified_time(self):
+        try:
+            return _get_last_modified_time(self.skill_directory)
+        except (OSError, ValueError):
+            return None
+
     def _unload(self):
         """Remove listeners and stop threads before loading"""
         self._execute_instance_shutdown()
@@ -125,6 +263,8 @@ class SkillLoader:
     def unload(self):
         if self.instance:
             self._execute_instance_shutdown()
+        self._undefer()
+        self._remove_intent_triggers()
         self.loaded = False
 
     def activate(self):
@@ -165,21 +305,39 @@ class SkillLoader:
         self.bus.emit(message)
 
     def _load(self):
+        start = monotonic()
         self._prepare_for_load()
         if self.is_blacklisted:
             self._skip_load()
         else:
             skill_module = self._load_skill_source()
             if skill_module and self._create_skill_instance(skill_module):
+                if self.lazy:
+                    self._save_manifest()
                 self._check_for_first_run()
                 self.loaded = True
 
         self.last_loaded = time()
+        self.load_time = monotonic() - start
         self._communicate_load_status()
         if self.loaded:
             self._prepare_settings_meta()
         return self.loaded
 
+    def _save_manifest(self):
+        """Save what the skill registered, for deferring it next time."""
+        self._recording.recording = False
+        manifest = build_manifest(self._recording, self.skill_id,
+                                  self.instance.name,
+                                  self._get_modified_time(),
+                                  self.config.get('lang'))
+        save_manifest(self.manifest_file, manifest)
+        if manifest['deferrable']:
+            self.last_used = monotonic()
+            self._watch_intents(manifest['intents'])
+        else:
+            self._remove_intent_triggers()
+
     def _prepare_settings_meta(self):
         settings_meta = SettingsMetaUploader(self.skill_directory,
                                              self.instance.name)
@@ -233,7 +391,11 @@ class SkillLoader:
 
         if self.instance:
             self.instance.skill_id = self.skill_id
-            self.instance.bind(self.bus)
+            bus = self.bus
+            if self.lazy:
+                # Record what the skill registers for the manifest
+                self._recording = bus = RecordingBus(self.bus)
+            self.instance.bind(bus)
             try:
                 self.instance.load_data_files()
                 # Set up intent handlers
@@ -273,7 +435,8 @@ class SkillLoader:
                     path=self.skill_directory,
                     id=self.skill_id,
                     name=self.instance.name,
-                    modified=self.last_modified
+                    modified=self.last_modified,
+                    load_time=self.load_time
                 )
             )
             self.bus.emit(message)
@@ -281,7 +444,8 @@ class SkillLoader:
         else:
             message = Message(
                 'mycroft.skills.loading_failure',
-                data=dict(path=self.skill_directory, id=self.skill_id)
+                data=dict(path=self.skill_directory, id=self.skill_id,
+                          load_time=self.load_time)
             )
             self.bus.emit(message)
             LOG.error('Skill {} failed to load'.format(self.skill_id))
@@ -14,6 +14,8 @@
 #
 """Load, update and manage skills on this device."""
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from glob import glob
 from threading import Thread, Event, Lock
 from time import sleep, time, monotonic
@@ -27,6 +29,7 @@ from .msm_wrapper import create_msm as msm_creator, build_msm_config
 from .settings import SkillSettingsDownloader
 from .skill_loader import SkillLoader
 from .skill_updater import SkillUpdater
+from .skill_watcher import create_skill_watcher
 
 SKILL_MAIN_MODULE = '__init__.py'
 
@@ -63,10 +66,11 @@ class UploadQueue:
         if queue:
             LOG.info('New Settings meta to upload.')
             for loader in queue:
-                if self.started:
-                    loader.instance.settings_meta.upload()
-                else:
+                if not self.started:
                     break
+                # Deferred skills uploaded their meta when last loaded
+                if loader.instance is not None:
+                    loader.instance.settings_meta.upload()
 
     def __len__(self):
         return len(self._queue)
@@ -128,6 +132,8 @@ class SkillManager(Thread):
         self.initial_load_complete = False
         self.num_install_retries = 0
         self.settings_downloader = SkillSettingsDownloader(self.bus)
+        self.skill_watcher = None
+        self._priority_skill_dirs = set()
         self._define_message_bus_events()
         self.skill_updater = SkillUpdater()
         self.daemon = True
@@ -156,6 +162,8 @@ class SkillManager(Thread):
         self.bus.on('mycroft.paired', self.handle_paired)
         self.bus.on('mycroft.skills.is_alive', self.is_alive)
         self.bus.on('mycroft.skills.all_loaded', self.is_all_loaded)
+        self.bus.on('skillmanager.watcher.stats.get',
+                    self.handle_watcher_stats)
         self.bus.on(
             'mycroft.skills.settings.update',
             self.settings_downloader.download
@@ -199,6 +207,7 @@ class SkillManager(Thread):
     def load_priority(self):
         skills = {skill.name: skill for skill in self.msm.all_skills}
         priority_skills = self.skills_config.get("priority_skills", [])
+        skill_dirs = []
         for skill_name in priority_skills:
             skill = skills.get(skill_name)
             if skill is not None:
@@ -209,33 +218,36 @@ class SkillManager(Thread):
                         log_msg = 'Downloading priority skill: {} failed'
                         LOG.exception(log_msg.format(skill_name))
                         continue
-                loader = self._load_skill(skill.path)
-                if loader:
-                    self.upload_queue.put(loader)
+                skill_dirs.append(skill.path)
             else:
                 LOG.error(
                     'Priority skill {} can\'t be found'.format(skill_name)
                 )
 
+        self._priority_skill_dirs = set(skill_dirs)
+        for loader in self._load_skills(skill_dirs):
+            self.upload_queue.put(loader)
         self._alive_status = True
 
     def run(self):
         """Load skills and update periodically from disk and internet."""
         self._remove_git_locks()
         self._connected_event.wait()
+        self.skill_watcher = create_skill_watcher(
+            self.msm.skills_dir, self.skills_config.get('watcher', {}))
         self._load_on_startup()
 
         # Sync backend and skills.
         if is_paired() and not self.upload_queue.started:
             self._start_settings_update()
 
-        # Scan the file folder that contains Skills.  If a Skill is updated,
-        # unload the existing version from memory and reload from the disk.
+        # Check the skills reported changed by the watcher. If a Skill is
+        # updated, unload the existing version from memory and reload from
+        # the disk.
         while not self._stop_event.is_set():
             try:
-                self._reload_modified_skills()
-                self._load_new_skills()
-                self._unload_removed_skills()
+                self._handle_skill_changes()
+                self._unload_idle_skills()
                 self._update_skills()
                 if (is_paired() and self.upload_queue.started and
                         len(self.upload_queue) > 0):
@@ -264,12 +276,32 @@ class SkillManager(Thread):
         self.bus.emit(Message('mycroft.skills.initialized'))
         self._loaded_status = True
 
-    def _reload_modified_skills(self):
-        """Handle reload of recently changed skill(s)"""
-        for skill_dir in self._get_skill_directories():
+    def _handle_skill_changes(self):
+        """Reload, load and unload the skills changed on disk."""
+        changes = self.skill_watcher.get_changes()
+        self._reload_modified_skills(changes.modified)
+        new_skill_changed = any(skill_dir not in self.skill_loaders
+                                for skill_dir in changes.modified)
+        if changes.tree_changed or new_skill_changed:
+            self._load_new_skills()
+            self._unload_removed_skills()
+
+    def _reload_modified_skills(self, modified=None):
+        """Handle reload of recently changed skill(s)
+
+        Arguments:
+            modified (dict): last modification time of the changed skill
+                             directories, if not provided all skills are
+                             checked
+        """
+        if modified is None:
+            modified = {skill_dir: None
+                        for skill_dir in self._get_skill_directories()}
+        for skill_dir, last_modified in modified.items():
             try:
                 skill_loader = self.skill_loaders.get(skill_dir)
-                if skill_loader is not None and skill_loader.reload_needed():
+                if (skill_loader is not None and
+                        skill_loader.reload_needed(last_modified)):
                     # If reload succeed add settingsmeta to upload queue
                     if skill_loader.reload():
                         self.upload_queue.put(skill_loader)
@@ -279,22 +311,82 @@ class SkillManager(Thread):
 
     def _load_new_skills(self):
         """Handle load of skills installed since startup."""
-        for skill_dir in self._get_skill_directories():
-            if skill_dir not in self.skill_loaders:
-                loader = self._load_skill(skill_dir)
-                if loader:
-                    self.upload_queue.put(loader)
+        new_skill_dirs = [skill_dir
+                          for skill_dir in self._get_skill_directories()
+                          if skill_dir not in self.skill_loaders]
+        for loader in self._load_skills(new_skill_dirs):
+            self.upload_queue.put(loader)
+
+    def _load_skills(self, skill_dirs):
+        """Load skills, on a pool of workers if parallel loading is enabled.
+
+        A skill failing to load or taking long to initialize doesn't hold up
+        the others. Returns when all skills are loaded or the load timeout
+        expired, skills still loading then finish in the background and
+        queue their settings meta for upload themselves.
+
+        The loaders are registered before the loading starts, so a skill
+        still loading isn't loaded again.
+
+        Arguments:
+            skill_dirs (list): directories of the skills to load
+
+        Returns:
+            list: loaders of the skills that loaded
+        """
+        loading_config = self.skills_config.get('loading', {})
+        workers = loading_config.get('workers', 4)
+        if (not loading_config.get('parallel', False) or workers < 2 or
+                len(skill_dirs) < 2):
+            loaders = [self._load_skill(skill_dir) for skill_dir in skill_dirs]
+            return [loader for loader in loaders if loader]
+
+        skill_loaders = [self._create_skill_loader(skill_dir)
+                         for skill_dir in skill_dirs]
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(self._run_skill_loader, skill_loader)
+                   for skill_loader in skill_loaders]
+        _, not_done = wait(futures, timeout=loading_config.get('timeout'))
+        executor.shutdown(wait=False)
+
+        loaders = []
+        for skill_loader, future in zip(skill_loaders, futures):
+            if future in not_done:
+                LOG.warning('{} is still loading, continuing without '
+                            'it'.format(skill_loader.skill_directory))
+                future.add_done_callback(
+                    partial(self._handle_late_load, skill_loader))
+            elif future.result():
+                loaders.append(skill_loader)
+        return loaders
+
+    def _handle_late_load(self, skill_loader, future):
+        """Queue the settings meta of a skill loaded after the timeout."""
+        if future.result():
+            self.upload_queue.put(skill_loader)
 
     def _load_skill(self, skill_directory):
-        skill_loader = SkillLoader(self.bus, skill_directory)
+        skill_loader = self._create_skill_loader(skill_directory)
+        load_status = self._run_skill_loader(skill_loader)
+        return skill_loader if load_status else None
+
+    def _create_skill_loader(self, skill_directory):
+        """Create the loader of a skill and register it."""
+        # Priority skills are always loaded at startup
+        lazy = (self.skills_config.get('lazy_loading', {}).get('enabled') and
+                skill_directory not in self._priority_skill_dirs)
+        skill_loader = SkillLoader(self.bus, skill_directory, lazy=bool(lazy))
+        self.skill_loaders[skill_directory] = skill_loader
+        return skill_loader
+
+    def _run_skill_loader(self, skill_loader):
+        """Load a skill, returns True if it loaded."""
         try:
-            load_status = skill_loader.load()
+            return skill_loader.load()
         except Exception:
-            LOG.exception('Load of skill {} failed!'.format(skill_directory))
-        finally:
-            self.skill_loaders[skill_directory] = skill_loader
-
-        return skill_loader if load_status else None
+            LOG.exception('Load of skill {} failed!'.format(
+                skill_loader.skill_directory))
+            return False
 
     def _get_skill_directories(self):
         skill_glob = glob(os.path.join(self.msm.skills_dir, '*/'))
@@ -331,6 +423,19 @@ class SkillManager(Thread):
         if removed_skills:
             self.skill_updater.post_manifest(reload_skills_manifest=True)
 
+    def _unload_idle_skills(self):
+        """Unload lazily loaded skills that haven't been used for a while."""
+        lazy_config = self.skills_config.get('lazy_loading', {})
+        idle_timeout = lazy_config.get('idle_timeout', 0)
+        if not (lazy_config.get('enabled') and idle_timeout):
+            return
+        for skill_dir, skill_loader in list(self.skill_loaders.items()):
+            try:
+                skill_loader.defer_if_idle(idle_timeout)
+            except Exception:
+                LOG.exception('Failed to unload idle skill '
+                              '{}'.format(skill_dir))
+
     def _update_skills(self):
         """Update skills once an hour if update is enabled"""
         do_skill_update = (
@@ -355,13 +460,21 @@ class SkillManager(Thread):
 
         return self._loaded_status
 
+    def handle_watcher_stats(self, message):
+        """Respond with the cost of detecting skill changes."""
+        stats = {}
+        if self.skill_watcher:
+            stats = self.skill_watcher.get_stats()
+        self.bus.emit(message.response(data=stats))
+
     def send_skill_list(self, _):
         """Send list of loaded skills."""
         try:
             message_data = {}
             for skill_dir, skill_loader in self.skill_loaders.items():
+                loaded = skill_loader.loaded or skill_loader.deferred
                 message_data[skill_loader.skill_id] = dict(
-                    active=skill_loader.active and skill_loader.loaded,
+                    active=skill_loader.active and loaded,
                     id=skill_loader.skill_id
                 )
             self.bus.emit(Message('mycroft.skills.list', data=message_data))
@@ -409,6 +522,8 @@ class SkillManager(Thread):
         self._stop_event.set()
         self.settings_downloader.stop_downloading()
         self.upload_queue.stop()
+        if self.skill_watcher:
+            self.skill_watcher.stop()
 
         # Do a clean shutdown of all skills
         for skill_loader in self.skill_loaders.values():
@@ -0,0 +1,156 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Manifests of what skills register while loading, used for lazy loading.
+
+Adapt intents are built in the skill's Python code, so they can't be read
+from the skill's files without importing it. Instead, when a skill is
+loaded, everything it registers on the messagebus is recorded in a
+manifest. As long as the skill doesn't change, the skill loader can replay
+the intent and vocabulary registrations of the manifest instead of
+importing the skill, and import it the first time one of its intents is
+triggered.
+
+Only skills that do nothing but register intents and vocabulary while
+loading can be deferred. Skills scheduling events, registering fallbacks or
+resting screens, or listening for other messages stay resident.
+"""
+import json
+import os
+
+from mycroft.util.log import LOG
+from mycroft.version import CORE_VERSION_STR
+
+# Messages replayed to register a deferred skill's intents and vocabulary
+REGISTRATION_MESSAGES = (
+    'register_vocab',
+    'register_intent',
+    'padatious:register_intent',
+    'padatious:register_entity'
+)
+INTENT_MESSAGES = ('register_intent', 'padatious:register_intent')
+
+# Handlers added to every skill, only needed while the skill is loaded
+SYSTEM_EVENTS = (
+    'mycroft.stop',
+    'mycroft.skill.enable_intent',
+    'mycroft.skill.disable_intent',
+    'mycroft.skill.set_cross_context',
+    'mycroft.skill.remove_cross_context',
+    'mycroft.skills.settings.changed'
+)
+
+
+class RecordingBus:
+    """Messagebus wrapper recording the messages and handlers of a skill.
+
+    Recording stops when recording is set to False, the wrapper then just
+    forwards to the bus.
+
+    Arguments:
+        bus: messagebus connection to forward to
+    """
+    def __init__(self, bus):
+        self.bus = bus
+        self.recording = True
+        self.emitted = []
+        self.handled = []
+
+    def emit(self, message):
+        if self.recording:
+            self.emitted.append(message)
+        self.bus.emit(message)
+
+    def on(self, msg_type, handler):
+        if self.recording:
+            self.handled.append(msg_type)
+        self.bus.on(msg_type, handler)
+
+    def once(self, msg_type, handler):
+        if self.recording:
+            self.handled.append(msg_type)
+        self.bus.once(msg_type, handler)
+
+    def __getattr__(self, name):
+        return getattr(self.bus, name)
+
+
+def build_manifest(recording, skill_id, name, modified, lang):
+    """Create the manifest of a loaded skill.
+
+    Arguments:
+        recording (RecordingBus): bus the skill was loaded with
+        skill_id (str): skill id
+        name (str): skill name
+        modified (float): last modification time of the skill files
+        lang (str): language the vocabulary was loaded for
+
+    Returns:
+        dict: the manifest
+    """
+    messages = [[m.msg_type, m.data] for m in recording.emitted]
+    intents = [data['name'] for msg_type, data in messages
+               if msg_type in INTENT_MESSAGES]
+    allowed_events = set(intents + list(SYSTEM_EVENTS))
+    allowed_events.add('{}.set'.format(skill_id))  # GUI default handler
+    deferrable = (
+        all(msg_type in REGISTRATION_MESSAGES for msg_type, _ in messages) and
+        all(msg_type in allowed_events for msg_type in recording.handled)
+    )
+    return {
+        'core_version': CORE_VERSION_STR,
+        'lang': lang,
+        'modified': modified,
+        'name': name,
+        'deferrable': deferrable,
+        'intents': intents,
+        'messages': messages
+    }
+
+
+def save_manifest(path, manifest):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+    except (OSError, TypeError, ValueError) as e:
+        LOG.warning('Could not save skill manifest {} ({})'.format(path,
+                                                                   repr(e)))
+
+
+def load_manifest(path, modified, lang):
+    """Load a manifest if it's up to date.
+
+    Arguments:
+        path (str): manifest file
+        modified (float): current last modification time of the skill
+        lang (str): configured language
+
+    Returns:
+        dict: the manifest, None if missing or stale
+    """
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        LOG.warning('Could not read skill manifest {} ({})'.format(path,
+                                                                   repr(e)))
+        return None
+    if (manifest.get('modified') != modified or
+            manifest.get('lang') != lang or
+            manifest.get('core_version') != CORE_VERSION_STR):
+        return None
+    return manifest
@@ -0,0 +1,374 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Detect changes to the installed skills.
+
+The skill manager asks the watcher which skills changed instead of walking
+every skill directory every few seconds. Two backends are available:
+
+InotifySkillWatcher gets notified by the Linux kernel of changes in the
+skill directories.
+
+PollingSkillWatcher walks the skill directories, at most once per poll
+interval, comparing the last modification times. It's used where inotify
+isn't available.
+
+Changes are debounced: a skill is only reported once it hasn't changed for
+the debounce time, so a git pull or msm install reloads it once.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from collections import namedtuple
+from threading import Lock, Thread
+from time import monotonic, time
+
+from mycroft.util.log import LOG
+
+SkillChanges = namedtuple('SkillChanges', ['modified', 'tree_changed'])
+SkillChanges.__doc__ = """Changes reported by a skill watcher.
+
+    modified (dict): modification time per changed skill directory
+    tree_changed (bool): skill directories were added or removed
+"""
+
+
+def is_ignored_file(name):
+    """Check if a file change should not trigger a skill reload.
+
+    Compiled python files, hidden files and the settings.json file are
+    ignored.
+    """
+    return (name.endswith('.pyc') or name == 'settings.json' or
+            name.startswith('.') or name.endswith('.qmlc'))
+
+
+def is_ignored_dir(name):
+    return name.startswith('.') or name == '__pycache__'
+
+
+class SkillWatcher:
+    """Base class keeping track of changed skills.
+
+    Arguments:
+        skills_dir (str): directory holding the skill directories
+        debounce (float): seconds a skill must be unchanged before the change
+                          is reported
+    """
+    backend = None
+
+    def __init__(self, skills_dir, debounce=1.0):
+        self.skills_dir = skills_dir
+        self.debounce = debounce
+        self.lock = Lock()
+        self._pending = {}  # skill directory: (change time, monotonic time)
+        self._tree_changed = None  # monotonic time of the last change
+        self.stats = {
+            'backend': self.backend,
+            'scans': 0,
+            'dirs_scanned': 0,
+            'files_checked': 0,
+            'scan_time': 0.0,
+            'events': 0,
+            'changes_reported': 0
+        }
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def skill_directory(self, path):
+        """Get the skill directory containing a path, None for the root."""
+        relative = os.path.relpath(path, self.skills_dir)
+        if relative == '.' or relative.startswith('..'):
+            return None
+        return os.path.join(self.skills_dir, relative.split(os.sep)[0])
+
+    def mark_changed(self, skill_dir=None, tree_changed=False):
+        """Record a change of a skill directory or of the set of skills."""
+        now = monotonic()
+        with self.lock:
+            if skill_dir:
+                self._pending[skill_dir] = (time(), now)
+            if tree_changed:
+                self._tree_changed = now
+
+    def get_changes(self):
+        """Get the changes that have settled since the last call.
+
+        Returns:
+            SkillChanges: changed skills and whether skills were added or
+                          removed
+        """
+        settled = monotonic() - self.debounce
+        with self.lock:
+            modified = {
+                skill_dir: changed
+                for skill_dir, (changed, detected) in self._pending.items()
+                if detected <= settled
+            }
+            for skill_dir in modified:
+                del self._pending[skill_dir]
+            tree_changed = (self._tree_changed is not None and
+                            self._tree_changed <= settled)
+            if tree_changed:
+                self._tree_changed = None
+            self.stats['changes_reported'] += len(modified)
+        return SkillChanges(modified, tree_changed)
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+class PollingSkillWatcher(SkillWatcher):
+    """Watcher comparing the last modification times of the skills.
+
+    Arguments:
+        skills_dir (str): directory holding the skill directories
+        debounce (float): seconds a skill must be unchanged before the change
+                          is reported
+        interval (float): min seconds between scans of the skills
+    """
+    backend = 'poll'
+
+    def __init__(self, skills_dir, debounce=1.0, interval=2.0):
+        super().__init__(skills_dir, debounce)
+        self.interval = interval
+        self._last_scan = None
+        self._mtimes = {}
+
+    def start(self):
+        self._mtimes = self._scan()
+
+    def get_changes(self):
+        now = monotonic()
+        if self._last_scan is None or now - self._last_scan >= self.interval:
+            mtimes = self._scan()
+            if set(mtimes) != set(self._mtimes):
+                self.mark_changed(tree_changed=True)
+            for skill_dir, mtime in mtimes.items():
+                if mtime != self._mtimes.get(skill_dir, mtime):
+                    self.mark_changed(skill_dir)
+            self._mtimes = mtimes
+        return super().get_changes()
+
+    def _scan(self):
+        """Get the last modification time of every skill."""
+        start = monotonic()
+        dirs = 0
+        files = 0
+        mtimes = {}
+        try:
+            skill_dirs = [e.path for e in os.scandir(self.skills_dir)
+                          if e.is_dir() and not is_ignored_dir(e.name)]
+        except OSError:
+            skill_dirs = []
+        for skill_dir in skill_dirs:
+            last_modified = 0
+            for root_dir, subdirs, filenames in os.walk(skill_dir):
+                dirs += 1
+                subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+                for name in filenames:
+                    if is_ignored_file(name):
+                        continue
+                    files += 1
+                    try:
+                        last_modified = max(last_modified, os.path.getmtime(
+                            os.path.join(root_dir, name)))
+                    except OSError:
+                        pass
+            mtimes[skill_dir] = last_modified
+        self._last_scan = monotonic()
+        with self.lock:
+            self.stats['scans'] += 1
+            self.stats['dirs_scanned'] += dirs
+            self.stats['files_checked'] += files
+            self.stats['scan_time'] += self._last_scan - start
+        return mtimes
+
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+_EVENT = struct.Struct('iIII')
+
+
+class InotifySkillWatcher(SkillWatcher):
+    """Watcher notified of changes by inotify.
+
+    Every directory of the skills is watched, except hidden directories and
+    python caches, matching what the polling watcher looks at.
+
+    Raises OSError if inotify is not available.
+    """
+    backend = 'inotify'
+
+    def __init__(self, skills_dir, debounce=1.0):
+        super().__init__(skills_dir, debounce)
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.watches = {}  # watch descriptor: directory
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._add_watch(self.skills_dir)
+        for entry in os.scandir(self.skills_dir):
+            if entry.is_dir() and not is_ignored_dir(entry.name):
+                self._add_tree(entry.path)
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path),
+                                         WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        self.watches[wd] = path
+        self.stats['watches'] = len(self.watches)
+
+    def _add_tree(self, path):
+        start = monotonic()
+        dirs = 0
+        for root_dir, subdirs, _ in os.walk(path):
+            dirs += 1
+            subdirs[:] = [d for d in subdirs if not is_ignored_dir(d)]
+            self._add_watch(root_dir)
+        with self.lock:
+            self.stats['dirs_scanned'] += dirs
+            self.stats['scan_time'] += monotonic() - start
+
+    def _run(self):
+        while self._running:
+            readable, _, _ = select.select([self.fd], [], [], 0.5)
+            if not readable:
+                continue
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            try:
+                self._handle_events(data)
+            except Exception:
+                LOG.exception('Failed to handle skill directory changes')
+
+    def _handle_events(self, data):
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            with self.lock:
+                self.stats['events'] += 1
+            self._handle_event(wd, mask, os.fsdecode(name))
+
+    def _handle_event(self, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            LOG.warning('Skill watcher queue overflowed, checking all skills')
+            for entry in os.scandir(self.skills_dir):
+                self.mark_changed(entry.path, tree_changed=True)
+            return
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            self.stats['watches'] = len(self.watches)
+            return
+        directory = self.watches.get(wd)
+        if directory is None:
+            return
+        path = os.path.join(directory, name) if name else directory
+        skill_dir = self.skill_directory(path)
+        if skill_dir is None:
+            return
+
+        if mask & IN_ISDIR:
+            if is_ignored_dir(name):
+                return
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._add_tree(path)
+                except OSError as e:
+                    LOG.warning('Could not watch {} ({})'.format(path,
+                                                                 repr(e)))
+        elif name and is_ignored_file(name):
+            return
+
+        # Skill directories added or removed in the skills directory
+        self.mark_changed(skill_dir,
+                          tree_changed=directory == self.skills_dir)
+
+
+def create_skill_watcher(skills_dir, config):
+    """Create the skill watcher from the "skills": "watcher" configuration.
+
+    The polling watcher is used if inotify is not configured or not
+    available.
+
+    Arguments:
+        skills_dir (str): directory holding the skill directories
+        config (dict): watcher configuration
+
+    Returns:
+        SkillWatcher: the started watcher
+    """
+    debounce = config.get('debounce', 1.0)
+    if config.get('backend', 'inotify') == 'inotify':
+        watcher = None
+        try:
+            watcher = InotifySkillWatcher(skills_dir, debounce)
+            watcher.start()
+            return watcher
+        except (OSError, AttributeError) as e:
+            LOG.warning('Could not watch the skills with inotify ({}), '
+                        'polling for changes instead'.format(repr(e)))
+            if watcher:
+                watcher.stop()
+    watcher = PollingSkillWatcher(skills_dir, debounce,
+                                  config.get('poll_interval', 2.0))
+    watcher.start()
+    return watcher
@@ -12,16 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import audioop
 import re
 import json
+import struct
 from abc import ABCMeta, abstractmethod
-from requests import post, put, exceptions
+from requests import exceptions
 from speech_recognition import Recognizer
 from queue import Queue
 from threading import Thread
 
 from mycroft.api import STTApi, HTTPError
 from mycroft.configuration import Configuration
+from mycroft.util.http_session import post, put
 from mycroft.util.log import LOG
 
 
@@ -35,6 +38,12 @@ class STT(metaclass=ABCMeta):
         self.credential = self.config.get("credential", {})
         self.recognizer = Recognizer()
         self.can_stream = False
+        # [connect, read] timeout of HTTP requests to the engine. Results
+        # can take as long as the utterance, so only connecting is timed
+        # out by default.
+        timeout = self.config.get("timeout", (3.05, None))
+        self.timeout = tuple(timeout) if isinstance(timeout, list) \
+            else timeout
 
     @staticmethod
     def init_language(config_core):
@@ -77,6 +86,128 @@ class KeySTT(STT, metaclass=ABCMeta):
         self.key = str(self.credential.get("client_key"))
 
 
+def wav_stream_header(sample_rate, sample_width=2, channels=1):
+    """Create a WAV header for audio of unknown length.
+
+    The RIFF and data sizes are set to the max value, the usual convention
+    for streamed WAV data.
+    """
+    return struct.pack('<4sI4s4sIHHIIHH4sI',
+                       b'RIFF', 0xFFFFFFFF, b'WAVE',
+                       b'fmt ', 16, 1, channels, sample_rate,
+                       sample_rate * sample_width * channels,
+                       sample_width * channels, sample_width * 8,
+                       b'data', 0xFFFFFFFF)
+
+
+class ChunkedUploadSTT(STT, metaclass=ABCMeta):
+    """Base for engines posting the audio as the body of an HTTP request.
+
+    When "stream" is enabled in the engine config the recorded audio is
+    encoded and sent with chunked transfer encoding while the user is
+    speaking, so the engine can start working before the end of the
+    utterance. Otherwise, or for audio not recorded through the stream, the
+    audio is sent in a single request.
+
+    Subclasses implement upload() and can override the stream_format
+    ("wav" or "raw" 16 bit PCM) and convert_rate().
+    """
+    stream_format = 'wav'
+
+    def __init__(self):
+        super().__init__()
+        self.can_stream = self.config.get('stream', False)
+        listener_config = Configuration.get().get('listener', {})
+        # Sample rate of the recorded audio chunks
+        self.sample_rate = listener_config.get('sample_rate', 16000)
+        self.stream = None
+        self.queue = None
+
+    def stream_start(self, language=None):
+        self.stream_stop()
+        self.queue = Queue()
+        self.stream = ChunkedUploadThread(self.queue, language or self.lang,
+                                          self)
+        self.stream.start()
+
+    def stream_data(self, data):
+        self.queue.put(data)
+
+    def stream_stop(self):
+        if self.stream is not None:
+            self.queue.put(None)
+            self.stream.join()
+            text = self.stream.text
+            self.stream = None
+            self.queue = None
+            return text
+        return None
+
+    def convert_rate(self, sample_rate):
+        """Get the sample rate to send audio recorded at sample_rate."""
+        return sample_rate
+
+    def encode_stream(self, chunks):
+        """Encode recorded audio chunks on the fly.
+
+        Arguments:
+            chunks (iterable): raw 16 bit mono audio chunks
+
+        Returns:
+            generator: encoded request body chunks
+        """
+        rate = self.convert_rate(self.sample_rate)
+        if self.stream_format == 'wav':
+            yield wav_stream_header(rate)
+        state = None
+        for chunk in chunks:
+            if rate != self.sample_rate:
+                chunk, state = audioop.ratecv(chunk, 2, 1, self.sample_rate,
+                                              rate, state)
+            yield chunk
+
+    def encode_audio(self, audio):
+        """Encode complete audio.
+
+        Arguments:
+            audio (AudioData): recorded utterance
+
+        Returns:
+            tuple: encoded request body and its sample rate
+        """
+        rate = self.convert_rate(audio.sample_rate)
+        if self.stream_format == 'wav':
+            return audio.get_wav_data(convert_rate=rate), rate
+        return audio.get_raw_data(convert_rate=rate, convert_width=2), rate
+
+    @abstractmethod
+    def upload(self, data, language, sample_rate):
+        """Send audio to the engine and get the transcription.
+
+        Arguments:
+            data (bytes|generator): encoded audio, a generator when streaming
+            language (str): language code
+            sample_rate (int): sample rate of the encoded audio
+
+        Returns:
+            str: transcription
+        """
+
+    def execute(self, audio, language=None):
+        language = language or self.lang
+        stream = self.stream
+        if stream is not None:
+            text = self.stream_stop()
+            # The stream was started for another language, its
+            # transcription is dropped and the audio sent again.
+            if stream.language == language:
+                if stream.error:
+                    raise stream.error
+                return text
+        data, rate = self.encode_audio(audio)
+        return self.upload(data, language, rate)
+
+
 class GoogleSTT(TokenSTT):
     def __init__(self):
         super(GoogleSTT, self).__init__()
@@ -162,7 +293,8 @@ class IBMSTT(TokenSTT):
         }
 
         response = post(url, auth=('apikey', self.token), headers=headers,
-                        data=audio.get_flac_data(), params=params)
+                        data=audio.get_flac_data(), params=params,
+                        timeout=self.timeout)
 
         if response.status_code == 200:
             result = json.loads(response.text)
@@ -188,7 +320,7 @@ class IBMSTT(TokenSTT):
                     response.status_code, response.text))
 
 
-class YandexSTT(STT):
+class YandexSTT(ChunkedUploadSTT):
     """
         Yandex SpeechKit STT
         To use create service account with role 'editor' in your cloud folder,
@@ -205,6 +337,8 @@ class YandexSTT(STT):
             }
         }
     """
+    stream_format = 'raw'
+
     def __init__(self):
         super(YandexSTT, self).__init__()
         self.lang = self.config.get('lang') or self.lang
@@ -212,37 +346,33 @@ class YandexSTT(STT):
         if self.api_key is None:
             raise ValueError("API key for Yandex STT is not defined")
 
-    def execute(self, audio, language=None):
-        self.lang = language or self.lang
-        if self.lang not in ["en-US", "ru-RU", "tr-TR"]:
-            raise ValueError(
-                "Unsupported language '{}' for Yandex STT".format(self.lang))
-
+    def convert_rate(self, sample_rate):
         # Select sample rate based on source sample rate
         # and supported sample rate list
         supported_sample_rates = [8000, 16000, 48000]
-        sample_rate = audio.sample_rate
         if sample_rate not in supported_sample_rates:
             for supported_sample_rate in supported_sample_rates:
-                if audio.sample_rate < supported_sample_rate:
-                    sample_rate = supported_sample_rate
-                    break
-            if sample_rate not in supported_sample_rates:
-                sample_rate = supported_sample_rates[-1]
+                if sample_rate < supported_sample_rate:
+                    return supported_sample_rate
+            return supported_sample_rates[-1]
+        return sample_rate
 
-        raw_data = audio.get_raw_data(convert_rate=sample_rate,
-                                      convert_width=2)
+    def upload(self, data, language, sample_rate):
+        if language not in ["en-US", "ru-RU", "tr-TR"]:
+            raise ValueError(
+                "Unsupported language '{}' for Yandex STT".format(language))
 
         # Based on https://cloud.yandex.com/docs/speechkit/stt#request
         url = "https://stt.api.cloud.yandex.net/speech/v1/stt:recognize"
         headers = {"Authorization": "Api-Key {}".format(self.api_key)}
         params = "&".join([
-            "lang={}".format(self.lang),
+            "lang={}".format(language),
             "format=lpcm",
             "sampleRateHertz={}".format(sample_rate)
         ])
 
-        response = post(url + "?" + params, headers=headers, data=raw_data)
+        response = post(url + "?" + params, headers=headers, data=data,
+                        timeout=self.timeout)
         if response.status_code == 200:
             result = json.loads(response.text)
             if result.get("error_code") is None:
@@ -305,7 +435,7 @@ class MycroftDeepSpeechSTT(STT):
         return self.api.stt(audio.get_wav_data(), self.lang, 1)
 
 
-class DeepSpeechServerSTT(STT):
+class DeepSpeechServerSTT(ChunkedUploadSTT):
     """
         STT interface for the deepspeech-server:
         https://github.com/MainRo/deepspeech-server
@@ -314,11 +444,11 @@ class DeepSpeechServerSTT(STT):
     def __init__(self):
         super(DeepSpeechServerSTT, self).__init__()
 
-    def execute(self, audio, language=None):
-        language = language or self.lang
+    def upload(self, data, language, sample_rate):
         if not language.startswith("en"):
             raise ValueError("Deepspeech is currently english only")
-        response = post(self.config.get("uri"), data=audio.get_wav_data())
+        response = post(self.config.get("uri"), data=data,
+                        timeout=self.timeout)
         return response.text
 
 
@@ -388,15 +518,37 @@ class StreamingSTT(STT, metaclass=ABCMeta):
         pass
 
 
+class ChunkedUploadThread(StreamThread):
+    """Upload audio to an HTTP STT engine while it's being recorded."""
+    def __init__(self, queue, language, stt):
+        super().__init__(queue, language)
+        self.stt = stt
+        self.error = None
+
+    def handle_audio_stream(self, audio, language):
+        try:
+            self.text = self.stt.upload(
+                self.stt.encode_stream(audio),
+                language, self.stt.convert_rate(self.stt.sample_rate))
+        except Exception as e:
+            self.error = e
+            # Consume the remaining audio so the recording isn't blocked
+            for _ in audio:
+                pass
+        return self.text
+
+
 class DeepSpeechStreamThread(StreamThread):
-    def __init__(self, queue, language, url):
+    def __init__(self, queue, language, url, timeout=(3.05, None)):
         if not language.startswith("en"):
             raise ValueError("Deepspeech is currently english only")
         super().__init__(queue, language)
         self.url = url
+        self.timeout = timeout
 
     def handle_audio_stream(self, audio, language):
-        self.response = post(self.url, data=audio, stream=True)
+        self.response = post(self.url, data=audio, stream=True,
+                             timeout=self.timeout)
         self.text = self.response.text if self.response else None
         return self.text
 
@@ -415,11 +567,11 @@ class DeepSpeechStreamServerSTT(StreamingSTT):
         ...
     """
     def create_streaming_thread(self):
-        self.queue = Queue()
         return DeepSpeechStreamThread(
             self.queue,
             self.lang,
-            self.config.get('stream_uri')
+            self.config.get('stream_uri'),
+            self.timeout
         )
 
 
@@ -482,7 +634,6 @@ class GoogleCloudStreamingSTT(StreamingSTT):
         )
 
     def create_streaming_thread(self):
-        self.queue = Queue()
         return GoogleStreamThread(
             self.queue,
             self.language,
@@ -491,13 +642,13 @@ class GoogleCloudStreamingSTT(StreamingSTT):
         )
 
 
-class KaldiSTT(STT):
+class KaldiSTT(ChunkedUploadSTT):
     def __init__(self):
         super(KaldiSTT, self).__init__()
 
-    def execute(self, audio, language=None):
-        language = language or self.lang
-        response = post(self.config.get("uri"), data=audio.get_wav_data())
+    def upload(self, data, language, sample_rate):
+        response = post(self.config.get("uri"), data=data,
+                        timeout=self.timeout)
         return self.get_response(response)
 
     def get_response(self, response):
@@ -527,7 +678,7 @@ class HoundifySTT(KeySTT):
         return self.recognizer.recognize_houndify(audio, self.id, self.key)
 
 
-class GoVivaceSTT(TokenSTT):
+class GoVivaceSTT(TokenSTT, ChunkedUploadSTT):
     def __init__(self):
         super(GoVivaceSTT, self).__init__()
         self.default_uri = "https://services.govivace.com:49149/telephony"
@@ -536,11 +687,13 @@ class GoVivaceSTT(TokenSTT):
             LOG.error("GoVivace STT only supports english and spanish")
             raise NotImplementedError
 
-    def execute(self, audio, language=None):
+    def convert_rate(self, sample_rate):
+        return 8000
+
+    def upload(self, data, language, sample_rate):
         url = self.config.get("uri", self.default_uri) + "?key=" + \
               self.token + "&action=find&format=8K_PCM16&validation_string="
-        response = put(url,
-                       data=audio.get_wav_data(convert_rate=8000))
+        response = put(url, data=data, timeout=self.timeout)
         return self.get_response(response)
 
     def get_response(self, response):
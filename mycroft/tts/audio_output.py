@@ -0,0 +1,229 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""In-process playback of TTS audio.
+
+Instead of starting a player process per sentence the audio is decoded in
+the voice process and written to a single long-lived output stream, so
+consecutive sentences play without gaps. WAV files are read directly,
+MP3 files are decoded to raw PCM by mpg123.
+
+The output stream is an AudioSink, PyAudioSink by default.
+"""
+import audioop
+import subprocess
+import wave
+
+from mycroft.util.log import LOG
+
+SAMPLE_WIDTH = 2  # Bytes per sample written to the sink
+DEFAULT_SAMPLE_RATE = 22050
+
+
+class AudioSink:
+    """Output stream for raw 16 bit PCM audio.
+
+    Implementations only need to be used from the playback thread.
+    """
+    def open(self, sample_rate, channels):
+        """Open the stream, reopening it if the format changed."""
+        pass
+
+    def write(self, data):
+        """Queue audio for output, blocking while the stream buffer is full.
+        """
+        pass
+
+    def drain(self):
+        """Wait until the queued audio has been played."""
+        pass
+
+    def abort(self):
+        """Discard the queued audio."""
+        pass
+
+    def close(self):
+        """Close the stream, open() opens it again."""
+        pass
+
+    def terminate(self):
+        """Close the sink for good."""
+        self.close()
+
+
+class PyAudioSink(AudioSink):
+    """Sink writing to a PyAudio (PortAudio) output stream.
+
+    Arguments:
+        device_index (int): output device, None for the default device
+        frames_per_buffer (int): size of the stream buffer, this bounds the
+                                 latency of a stop
+    """
+    def __init__(self, device_index=None, frames_per_buffer=1024):
+        import pyaudio
+        self.pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+        self.device_index = device_index
+        self.frames_per_buffer = frames_per_buffer
+        self.stream = None
+        self.format = None
+
+    def open(self, sample_rate, channels):
+        if self.stream and self.format == (sample_rate, channels):
+            return
+        self.close()
+        self.stream = self.audio.open(
+            format=self.pyaudio.paInt16, channels=channels, rate=sample_rate,
+            output=True, output_device_index=self.device_index,
+            frames_per_buffer=self.frames_per_buffer)
+        self.format = (sample_rate, channels)
+
+    def write(self, data):
+        if self.stream.is_stopped():
+            self.stream.start_stream()
+        self.stream.write(data)
+
+    def drain(self):
+        if self.stream and not self.stream.is_stopped():
+            self.stream.stop_stream()
+
+    def abort(self):
+        if self.stream and not self.stream.is_stopped():
+            self.stream.abort_stream()
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+    def terminate(self):
+        """Close the stream and release PortAudio."""
+        self.close()
+        self.audio.terminate()
+
+
+class StreamPlayer:
+    """Plays audio files into one long-lived AudioSink.
+
+    play() blocks until the audio is written to the sink, stop() may be
+    called from any thread and interrupts the playback within a chunk.
+    Once stopped, nothing is played until reset() is called by the thread
+    calling play().
+
+    Arguments:
+        sink (AudioSink): output stream
+        chunk_frames (int): frames written to the sink at a time
+        duck_volume (float): volume while ducked, 0.0 - 1.0
+    """
+    def __init__(self, sink, chunk_frames=1024, duck_volume=0.3):
+        self.sink = sink
+        self.chunk_frames = chunk_frames
+        self.duck_volume = duck_volume
+        self.volume = 1.0
+        self._stopped = False
+
+    def play(self, path, snd_type='wav'):
+        """Play an audio file.
+
+        Arguments:
+            path (str): wav or mp3 file
+            snd_type (str): 'wav' or 'mp3'
+
+        Returns:
+            bool: False if the playback was stopped
+        """
+        if snd_type == 'mp3':
+            return self._play_mp3(path)
+        with wave.open(path, 'rb') as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError('Unsupported sample width {}'.format(
+                    wav.getsampwidth()))
+            channels = wav.getnchannels()
+            self.sink.open(wav.getframerate(), channels)
+            return self._write(
+                iter(lambda: wav.readframes(self.chunk_frames), b''))
+
+    def _play_mp3(self, path):
+        # Decode at the rate of the open stream to keep it open
+        sample_rate = DEFAULT_SAMPLE_RATE
+        stream_format = getattr(self.sink, 'format', None)
+        if stream_format:
+            sample_rate = stream_format[0]
+        decoder = subprocess.Popen(
+            ['mpg123', '-q', '-s', '-m', '-e', 's16', '-r', str(sample_rate),
+             path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            self.sink.open(sample_rate, 1)
+            chunk_size = self.chunk_frames * SAMPLE_WIDTH
+            return self._write(
+                iter(lambda: decoder.stdout.read(chunk_size), b''))
+        finally:
+            decoder.kill()
+            decoder.wait()
+            decoder.stdout.close()
+
+    def _write(self, chunks):
+        for chunk in chunks:
+            if self._stopped:
+                self.sink.abort()
+                return False
+            if self.volume != 1.0:
+                chunk = audioop.mul(chunk, SAMPLE_WIDTH, self.volume)
+            self.sink.write(chunk)
+        return not self._stopped
+
+    def drain(self):
+        """Wait until the written audio has been played."""
+        self.sink.drain()
+
+    def stop(self):
+        """Stop the current playback."""
+        self._stopped = True
+
+    def reset(self):
+        """Allow playback again after a stop."""
+        self._stopped = False
+
+    def duck(self):
+        """Lower the volume, for instance while the user is speaking."""
+        self.volume = self.duck_volume
+
+    def unduck(self):
+        """Restore the normal volume."""
+        self.volume = 1.0
+
+    def close(self):
+        self.stop()
+        self.sink.terminate()
+
+
+def create_player(config):
+    """Create the in-process player from the "tts": "playback" config.
+
+    Arguments:
+        config (dict): playback configuration
+
+    Returns:
+        StreamPlayer: the player, None if playback uses external players
+                      or the output stream can't be set up
+    """
+    if config.get('backend', 'process') != 'stream':
+        return None
+    try:
+        sink = PyAudioSink(device_index=config.get('device_index'))
+    except Exception as e:
+        LOG.warning('Could not open the audio output ({}), falling back to '
+                    'external players'.format(repr(e)))
+        return None
+    return StreamPlayer(sink, duck_volume=config.get('duck_volume', 0.3))
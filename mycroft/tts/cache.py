@@ -0,0 +1,325 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Indexed cache of synthesized sentences.
+
+The audio files of a TTS engine are kept in its cache directory. An index
+held in memory, and saved as index.json in the same directory, maps each
+cache key to its audio file, phonemes, size and last use so lookups don't
+touch the file system.
+
+Entries are evicted least recently used first when the audio exceeds the
+size limit, and when they haven't been used for longer than the age limit.
+Pinned entries, like the pre-generated phrases of cache_handler, are never
+evicted and don't count towards the size limit.
+
+The index is saved by curate(), not after every change. Files in the cache
+directory missing from the index when it's loaded, like the audio left by
+a crash or by older versions, are removed if they are older than the
+index. Newer files may still be added by another TTSCache instance, like
+the one of a TTS being replaced.
+"""
+import json
+import os
+import shutil
+import time
+from tempfile import mkstemp
+from collections import OrderedDict
+from os.path import basename, exists, getsize, join
+from threading import Lock
+
+import psutil
+
+from mycroft.util.file_utils import mb_to_bytes
+from mycroft.util.log import LOG
+
+
+class CacheEntry:
+    """Audio file and phonemes of a cached sentence."""
+    def __init__(self, audio_file, phonemes, size, last_used, pinned=False):
+        self.audio_file = audio_file
+        self.phonemes = phonemes
+        self.size = size
+        self.last_used = last_used
+        self.pinned = pinned
+
+    def as_dict(self):
+        return {
+            'audio_file': self.audio_file,
+            'phonemes': self.phonemes,
+            'size': self.size,
+            'last_used': self.last_used,
+            'pinned': self.pinned
+        }
+
+
+class TTSCache:
+    """Bounded cache of synthesized audio with least recently used eviction.
+
+    Arguments:
+        directory (str): directory holding the audio files and the index
+        audio_ext (str): extension of the audio files
+        max_size (int): max bytes of unpinned audio, 0 for no limit
+        max_age (float): seconds since the last use after which an unpinned
+                         entry is evicted, 0 for no limit
+    """
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory, audio_ext='wav', max_size=0, max_age=0):
+        self.directory = directory
+        self.audio_ext = audio_ext
+        self.max_size = max_size
+        self.max_age = max_age
+        self.lock = Lock()
+        self.save_lock = Lock()
+        # Least recently used entry first
+        self.entries = OrderedDict()
+        self.size = 0  # Bytes of unpinned audio
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self.load()
+
+    @property
+    def index_file(self):
+        return join(self.directory, self.INDEX_FILE)
+
+    def path(self, key):
+        """Get the audio file path for a cache key."""
+        return join(self.directory, key + '.' + self.audio_ext)
+
+    def load(self):
+        """Load the index, dropping entries whose audio is missing.
+
+        Files older than the index and not in it are removed.
+        """
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = {}
+        except Exception as e:
+            LOG.warning('Could not read TTS cache index ({})'.format(repr(e)))
+            index = {}
+        with self.lock:
+            for key, data in index.get('entries', []):
+                entry = CacheEntry(**data)
+                if exists(join(self.directory, entry.audio_file)):
+                    self._add(key, entry)
+            self._remove_unindexed()
+
+    def _remove_unindexed(self):
+        indexed = {entry.audio_file for entry in self.entries.values()}
+        indexed.add(self.INDEX_FILE)
+        try:
+            saved = os.stat(self.index_file).st_mtime
+        except OSError:
+            saved = time.time()
+        try:
+            files = [e for e in os.scandir(self.directory)
+                     if e.is_file() and e.name not in indexed]
+        except OSError:
+            return
+        removed = 0
+        for unindexed in files:
+            try:
+                if unindexed.stat().st_mtime < saved:
+                    os.remove(unindexed.path)
+                    removed += 1
+            except OSError:
+                pass
+        if removed:
+            LOG.debug('Removed {} files missing from the TTS cache '
+                      'index'.format(removed))
+
+    def save(self):
+        """Write the index if it changed since it was last saved."""
+        with self.save_lock:
+            with self.lock:
+                if not self._dirty:
+                    return
+                index = {'entries': [(key, entry.as_dict())
+                                     for key, entry in self.entries.items()]}
+                self._dirty = False
+            tmp_file = None
+            try:
+                fd, tmp_file = mkstemp(dir=self.directory,
+                                       prefix=self.INDEX_FILE)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(index, f)
+                os.replace(tmp_file, self.index_file)
+            except Exception as e:
+                LOG.warning('Could not save TTS cache index '
+                            '({})'.format(repr(e)))
+                with self.lock:
+                    self._dirty = True
+                if tmp_file:
+                    try:
+                        os.remove(tmp_file)
+                    except OSError:
+                        pass
+
+    def get(self, key):
+        """Look up a sentence.
+
+        Arguments:
+            key (str): cache key of the sentence
+
+        Returns:
+            tuple: (audio file path, phonemes) or None if not cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not exists(join(self.directory, entry.audio_file)):
+                # Removed behind our back
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.last_used = time.time()
+            self.entries.move_to_end(key)
+            self._dirty = True
+            return join(self.directory, entry.audio_file), entry.phonemes
+
+    def put(self, key, audio_file, phonemes=None, pinned=False):
+        """Add synthesized audio to the cache.
+
+        Audio not already at path(key) is copied there.
+
+        Arguments:
+            key (str): cache key of the sentence
+            audio_file (str): synthesized audio
+            phonemes: phonemes of the audio, anything JSON serializable
+            pinned (bool): never evict the entry
+        """
+        path = self.path(key)
+        try:
+            if audio_file != path:
+                shutil.copyfile(audio_file, path)
+            size = getsize(path)
+        except OSError as e:
+            LOG.warning('Could not cache {} ({})'.format(audio_file,
+                                                         repr(e)))
+            return
+        with self.lock:
+            self._remove(key, delete=False)
+            self._add(key, CacheEntry(basename(path), phonemes, size,
+                                      time.time(), pinned))
+        self.evict()
+
+    def pin(self, key, pinned=True):
+        """Pin or unpin a cached sentence.
+
+        Returns:
+            bool: True if the sentence is cached
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            if entry.pinned != pinned:
+                self.size += -entry.size if pinned else entry.size
+                entry.pinned = pinned
+                self._dirty = True
+        self.evict()
+        return True
+
+    def evict(self):
+        """Evict expired entries and entries above the size limit."""
+        with self.lock:
+            if self.max_age:
+                expiry = time.time() - self.max_age
+                expired = [key for key, entry in self.entries.items()
+                           if not entry.pinned and entry.last_used < expiry]
+                for key in expired:
+                    self._remove(key)
+                    self.evictions += 1
+            if self.max_size:
+                for key in self._unpinned():
+                    if self.size <= self.max_size:
+                        break
+                    self._remove(key)
+                    self.evictions += 1
+
+    def curate(self, min_free_disk=50):
+        """Apply the limits, clear the cache if the disk is nearly full and
+        save the index.
+
+        Arguments:
+            min_free_disk (float): free space in MB below which all unpinned
+                                   entries are removed
+        """
+        self.evict()
+        try:
+            free = psutil.disk_usage(self.directory).free
+        except OSError:
+            free = None
+        if free is not None and free < mb_to_bytes(min_free_disk):
+            LOG.info('Low diskspace detected, cleaning TTS cache')
+            self.clear()
+        self.save()
+
+    def clear(self):
+        """Remove all entries that aren't pinned."""
+        with self.lock:
+            for key in self._unpinned():
+                self._remove(key)
+        self.save()
+
+    def get_stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: number of entries, bytes, hits, misses and evictions
+        """
+        with self.lock:
+            pinned = [e for e in self.entries.values() if e.pinned]
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'pinned': len(pinned),
+                'bytes': self.size + sum(e.size for e in pinned),
+                'pinned_bytes': sum(e.size for e in pinned),
+                'max_bytes': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+    def _unpinned(self):
+        return [key for key, entry in self.entries.items()
+                if not entry.pinned]
+
+    def _add(self, key, entry):
+        self.entries[key] = entry
+        if not entry.pinned:
+            self.size += entry.size
+        self._dirty = True
+
+    def _remove(self, key, delete=True):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        if not entry.pinned:
+            self.size -= entry.size
+        self._dirty = True
+        if delete:
+            try:
+                os.remove(join(self.directory, entry.audio_file))
+            except OSError:
+                pass
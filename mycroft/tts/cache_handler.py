@@ -23,12 +23,11 @@ import base64
 import glob
 import os
 import re
-import shutil
 import hashlib
 import json
-import mycroft.util as util
 from urllib import parse
 from requests_futures.sessions import FuturesSession
+from mycroft.util.http_session import get_session
 from mycroft.util.log import LOG
 
 
@@ -104,7 +103,7 @@ def download_audio(cache_audio_dir, cache_text_file):
     if os.path.isfile(cache_text_file) and \
             os.path.exists(cache_audio_dir):
         if not os.listdir(cache_audio_dir):
-            session = FuturesSession()
+            session = FuturesSession(session=get_session())
             with open(cache_text_file, 'r') as fp:
                 all_dialogs = fp.readlines()
                 for each_dialog in all_dialogs:
@@ -147,33 +146,57 @@ def download_audio(cache_audio_dir, cache_text_file):
                   .format(missing_path))
 
 
-def copy_cache(cache_audio_dir):
+def load_phonemes(pho_file):
+    if not os.path.isfile(pho_file):
+        return None
+    try:
+        with open(pho_file, 'r') as cachefile:
+            return json.load(cachefile)
+    except Exception:
+        LOG.debug("Failed to read {}".format(pho_file))
+        return None
+
+
+def copy_cache(cache_audio_dir, cache_text_file, tts):
     """
-    This method copies the cache from 'cache_audio_dir'
-    to TTS specific cache directory given by
-    get_cache_directory()
+    This method adds the audio in 'cache_audio_dir' to the
+    cache of the TTS, pinned so it is never evicted
     Args:
         cache_audio_dir (path): path containing .wav files
+        cache_text_file (file): file containing the sentences
+        tts (TTS): TTS instance whose cache gets the audio
     """
-    if os.path.exists(cache_audio_dir):
-        # get tmp directory where tts cache is stored
-        dest = util.get_cache_directory('tts/' + 'Mimic2')
-        files = os.listdir(cache_audio_dir)
-        for f in files:
-            shutil.copy2(os.path.join(cache_audio_dir, f), dest)
-        LOG.debug("Copied all pre-loaded cache for {} to {}"
-                  .format(TTS, dest))
+    if os.path.exists(cache_audio_dir) and \
+            os.path.isfile(cache_text_file):
+        copied = 0
+        with open(cache_text_file, 'r') as fp:
+            for each_dialog in fp.readlines():
+                each_dialog = each_dialog.strip()
+                key = str(hashlib.md5(
+                    each_dialog.encode('utf-8', 'ignore')).hexdigest())
+                wav_file = os.path.join(cache_audio_dir, key + '.wav')
+                if not os.path.isfile(wav_file):
+                    continue
+                cache_key = tts.cache_key(each_dialog)
+                if tts.cache.pin(cache_key):
+                    continue  # Already copied
+                phonemes = load_phonemes(
+                    os.path.join(cache_audio_dir, key + '.pho'))
+                tts.cache.put(cache_key, wav_file, phonemes, pinned=True)
+                copied += 1
+        LOG.debug("Copied {} pre-loaded sentences for {} to {}"
+                  .format(copied, TTS, tts.cache.directory))
     else:
         LOG.debug("No Source directory for {} pre-loaded cache"
                   .format(TTS))
 
 
 # Start here
-def main(cache_audio_dir):
+def main(cache_audio_dir, tts):
     # Path where cache is stored and not cleared on reboot/TTS change
     if cache_audio_dir:
         cache_text_file = os.path.join(cache_audio_dir,
                                        '..', 'cache_text.txt')
         generate_cache_text(cache_audio_dir, cache_text_file)
         download_audio(cache_audio_dir, cache_text_file)
-        copy_cache(cache_audio_dir)
+        copy_cache(cache_audio_dir, cache_text_file, tts)
@@ -12,10 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import requests
 
 from .tts import TTSValidator
 from .remote_tts import RemoteTTS
+from mycroft.util import http_session
 
 
 class FATTS(RemoteTTS):
@@ -50,7 +50,8 @@ class FATTSValidator(TTSValidator):
 
     def validate_connection(self):
         try:
-            resp = requests.get(self.tts.url + "/info/version", verify=False)
+            resp = http_session.get(self.tts.url + "/info/version",
+                                    verify=False)
             content = resp.json()
             if content.get('product', '').find('FA-TTS') < 0:
                 raise Exception('Invalid FA-TTS server.')
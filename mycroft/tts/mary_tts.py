@@ -12,10 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import requests
 
 from .tts import TTSValidator
 from .remote_tts import RemoteTTS
+from mycroft.util import http_session
 
 
 class MaryTTS(RemoteTTS):
@@ -50,7 +50,7 @@ class MaryTTSValidator(TTSValidator):
 
     def validate_connection(self):
         try:
-            resp = requests.get(self.tts.url + "/version", verify=False)
+            resp = http_session.get(self.tts.url + "/version", verify=False)
             if resp.status_code == 200:
                 return True
         except Exception:
@@ -17,7 +17,7 @@ from .tts import TTS, TTSValidator
 from .remote_tts import RemoteTTSException, RemoteTTSTimeoutException
 from mycroft.util.log import LOG
 from mycroft.tts import cache_handler
-from mycroft.util import get_cache_directory
+from mycroft.util.http_session import get_session
 from requests_futures.sessions import FuturesSession
 from requests.exceptions import (
     ReadTimeout, ConnectionError, ConnectTimeout, HTTPError
@@ -26,9 +26,7 @@ from urllib import parse
 from .mimic_tts import VISIMES
 import math
 import base64
-import os
 import re
-import json
 
 
 # Heuristic value, caps character length of a chunk of text to be spoken as a
@@ -174,13 +172,13 @@ class Mimic2(TTS):
         )
         try:
             LOG.info("Getting Pre-loaded cache")
-            cache_handler.main(config['preloaded_cache'])
+            cache_handler.main(config['preloaded_cache'], self)
             LOG.info("Successfully downloaded Pre-loaded cache")
         except Exception as e:
             LOG.error("Could not get the pre-loaded cache ({})"
                       .format(repr(e)))
         self.url = config['url']
-        self.session = FuturesSession()
+        self.session = FuturesSession(session=get_session())
 
     def _requests(self, sentence):
         """Create asynchronous request list
@@ -246,38 +244,6 @@ class Mimic2(TTS):
                 "Mimic 2 server request timed out. Falling back to mimic")
         return (wav_file, vis)
 
-    def save_phonemes(self, key, phonemes):
-        """Cache phonemes
-
-        Arguments:
-            key:        Hash key for the sentence
-            phonemes:   phoneme string to save
-        """
-        cache_dir = get_cache_directory("tts/" + self.tts_name)
-        pho_file = os.path.join(cache_dir, key + ".pho")
-        try:
-            with open(pho_file, "w") as cachefile:
-                cachefile.write(json.dumps(phonemes))
-        except Exception:
-            LOG.exception("Failed to write {} to cache".format(pho_file))
-
-    def load_phonemes(self, key):
-        """Load phonemes from cache file.
-
-        Arguments:
-            Key:    Key identifying phoneme cache
-        """
-        pho_file = os.path.join(get_cache_directory("tts/" + self.tts_name),
-                                key + ".pho")
-        if os.path.exists(pho_file):
-            try:
-                with open(pho_file, "r") as cachefile:
-                    phonemes = json.load(cachefile)
-                return phonemes
-            except Exception as e:
-                LOG.error("Failed to read .PHO from cache ({})".format(e))
-        return None
-
 
 class Mimic2Validator(TTSValidator):
 
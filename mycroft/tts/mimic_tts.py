@@ -96,7 +96,6 @@ class Mimic(TTS):
             ssml_tags=["speak", "ssml", "phoneme", "voice", "audio", "prosody"]
         )
         self.dl = None
-        self.clear_cache()
 
         # Download subscriber voices if needed
         self.is_subscriber = DeviceApi().is_subscriber
@@ -18,6 +18,7 @@ from requests_futures.sessions import FuturesSession
 
 from .tts import TTS
 from mycroft.util import play_wav
+from mycroft.util.http_session import get_session
 from mycroft.util.log import LOG
 
 
@@ -42,7 +43,7 @@ class RemoteTTS(TTS):
         self.api_path = api_path
         self.auth = None
         self.url = config.get('url', url).rstrip('/')
-        self.session = FuturesSession()
+        self.session = FuturesSession(session=get_session())
 
     def execute(self, sentence, ident=None, listen=False):
         phrases = self.__get_phrases(sentence)
@@ -12,8 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import requests
 from .tts import TTS, TTSValidator
+from mycroft.util import http_session
 
 
 class ResponsiveVoice(TTS):
@@ -22,7 +22,6 @@ class ResponsiveVoice(TTS):
             lang, config, ResponsiveVoiceValidator(self), 'mp3',
             ssml_tags=[]
         )
-        self.clear_cache()
         self.pitch = config.get("pitch", 0.5)
         self.rate = config.get("rate", 0.5)
         self.vol = config.get("vol", 1)
@@ -37,7 +36,7 @@ class ResponsiveVoice(TTS):
                   "pitch": self.pitch, "rate": self.rate,
                   "vol": self.vol, "sv": self.sv, "vn": self.vn}
         base_url = "http://responsivevoice.org/responsivevoice/getvoice.php"
-        r = requests.get(base_url, params)
+        r = http_session.get(base_url, params)
         with open(wav_file, "w") as f:
             f.write(r.content)
         return wav_file, None
@@ -52,7 +51,7 @@ class ResponsiveVoiceValidator(TTSValidator):
         pass
 
     def validate_connection(self):
-        r = requests.get("http://responsivevoice.org")
+        r = http_session.get("http://responsivevoice.org")
         if r.status_code == 200:
             return True
         raise AssertionError("Could not reach http://responsivevoice.org")
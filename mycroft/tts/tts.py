@@ -14,11 +14,13 @@
 #
 from copy import deepcopy
 import hashlib
+import json
 import os
 import random
 import re
 from abc import ABCMeta, abstractmethod
-from threading import Thread
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from threading import Condition, Thread
 from time import time
 
 import os.path
@@ -32,9 +34,13 @@ from mycroft.metrics import report_timing, Stopwatch
 from mycroft.util import (
     play_wav, play_mp3, check_for_signal, create_signal, resolve_resource_file
 )
+from mycroft.util.file_utils import mb_to_bytes
 from mycroft.util.log import LOG
 from queue import Queue, Empty
 
+from .audio_output import create_player
+from .cache import TTSCache
+
 
 _TTS_ENV = deepcopy(os.environ)
 _TTS_ENV['PULSE_PROP'] = 'media.role=phone'
@@ -43,40 +49,136 @@ _TTS_ENV['PULSE_PROP'] = 'media.role=phone'
 EMPTY_PLAYBACK_QUEUE_TUPLE = (None, None, None, None, None)
 
 
+class SynthesisPipeline:
+    """Synthesizes sentences on a worker pool ahead of their playback.
+
+    Each submitted sentence is put on the playback queue as a Future right
+    away, in submission order, so the playback thread plays the sentences
+    in order while later sentences are synthesized in parallel.
+
+    At most lookahead sentences wait on the playback queue, submit() blocks
+    until the playback thread has taken the older ones.
+
+    Arguments:
+        queue (Queue): playback queue
+        workers (int): number of sentences synthesized in parallel
+        lookahead (int): max number of sentences waiting for playback
+    """
+    def __init__(self, queue, workers=2, lookahead=3):
+        self.queue = queue
+        self.lookahead = max(lookahead, 1)
+        self.executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+        self.condition = Condition()
+        self.pending = 0
+        self.generation = 0  # Incremented when the pipeline is cancelled
+
+    def submit(self, func, *args):
+        """Synthesize in the background and queue the result for playback.
+
+        Arguments:
+            func (callable): synthesis function returning a playback queue
+                             entry
+            args: arguments for func
+
+        Returns:
+            Future: the queued synthesis, None if the pipeline was cancelled
+                    while waiting for room in the lookahead
+        """
+        with self.condition:
+            generation = self.generation
+            self.condition.wait_for(lambda: (self.pending < self.lookahead or
+                                             self.generation != generation))
+            if self.generation != generation:
+                return None
+            self.pending += 1
+            future = self.executor.submit(func, *args)
+            self.queue.put(future)
+        return future
+
+    def release(self):
+        """Free the lookahead slot of a queued sentence."""
+        with self.condition:
+            self.pending = max(self.pending - 1, 0)
+            self.condition.notify_all()
+
+    def cancel(self):
+        """Abort submissions waiting for room in the lookahead."""
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+
 class PlaybackThread(Thread):
     """Thread class for playing back tts audio and sending
     viseme data to enclosure.
+
+    Arguments:
+        queue (Queue): playback queue
+        pipeline (SynthesisPipeline): pipeline putting synthesis Futures
+                                      on the queue, if any
     """
 
-    def __init__(self, queue):
+    def __init__(self, queue, pipeline=None):
         super(PlaybackThread, self).__init__()
         self.queue = queue
+        self.pipeline = pipeline
         self._terminated = False
         self._processing_queue = False
         self.enclosure = None
         self.p = None
+        tts_config = Configuration.get().get('tts', {})
         # Check if the tts shall have a ducking role set
-        if Configuration.get().get('tts', {}).get('pulse_duck'):
+        if tts_config.get('pulse_duck'):
             self.pulse_env = _TTS_ENV
         else:
             self.pulse_env = None
+        # In-process output stream, None to use external players
+        self.player = create_player(tts_config.get('playback', {}))
 
     def init(self, tts):
         self.tts = tts
 
     def clear_queue(self):
         """Remove all pending playbacks."""
+        if self.pipeline:
+            self.pipeline.cancel()
         while not self.queue.empty():
-            self.queue.get()
+            entry = self.queue.get()
+            if isinstance(entry, Future):
+                entry.cancel()
+                self.pipeline.release()
+        if self.player:
+            self.player.stop()
         try:
             self.p.terminate()
         except Exception:
             pass
 
+    def _get_synthesized(self, future):
+        """Wait for a queued synthesis to finish.
+
+        Returns:
+            tuple: playback queue entry, None if the synthesis was cancelled
+        """
+        generation = self.pipeline.generation
+        self.pipeline.release()
+        try:
+            entry = future.result()
+        except CancelledError:
+            return None
+        if self.pipeline.generation != generation:
+            return None  # Queue was cleared while synthesizing
+        return entry
+
     def run(self):
         """Thread main loop. Get audio and extra data from queue and play.
 
-        The queue messages is a tuple containing
+        The queue messages is a tuple, or a Future resolving to a tuple when
+        the sentence is still being synthesized, containing
         snd_type: 'mp3' or 'wav' telling the loop what format the data is in
         data: path to temporary audio data
         videmes: list of visemes to display while playing
@@ -91,8 +193,15 @@ class PlaybackThread(Thread):
         """
         while not self._terminated:
             try:
-                (snd_type, data,
-                 visemes, ident, listen) = self.queue.get(timeout=2)
+                entry = self._next_entry()
+                if isinstance(entry, Future):
+                    entry = self._get_synthesized(entry)
+                    if entry is None:
+                        if not self._processing_queue:
+                            continue
+                        # Finish the audio sequence
+                        entry = EMPTY_PLAYBACK_QUEUE_TUPLE
+                (snd_type, data, visemes, ident, listen) = entry
                 self.blink(0.5)
                 if not self._processing_queue:
                     self._processing_queue = True
@@ -100,18 +209,13 @@ class PlaybackThread(Thread):
 
                 stopwatch = Stopwatch()
                 with stopwatch:
-                    if snd_type == 'wav':
-                        self.p = play_wav(data, environment=self.pulse_env)
-                    elif snd_type == 'mp3':
-                        self.p = play_mp3(data, environment=self.pulse_env)
-                    if visemes:
-                        self.show_visemes(visemes)
-                    if self.p:
-                        self.p.communicate()
-                        self.p.wait()
+                    if not self._play_in_process(snd_type, data, visemes):
+                        self._play_process(snd_type, data, visemes)
                 report_timing(ident, 'speech_playback', stopwatch)
 
                 if self.queue.empty():
+                    if self.player:
+                        self.player.drain()
                     self.tts.end_audio(listen)
                     self._processing_queue = False
                 self.blink(0.2)
@@ -122,6 +226,67 @@ class PlaybackThread(Thread):
                 if self._processing_queue:
                     self.tts.end_audio(listen)
                     self._processing_queue = False
+        if self.player:
+            self.player.close()
+        # A TTS created to replace this one loads the saved cache index
+        self.tts.cache.save()
+
+    def _next_entry(self):
+        """Take the next entry of the queue.
+
+        A stop of the in-process player is cleared before the entry is
+        taken, so a clear_queue() after that still stops its playback.
+        """
+        if self.player:
+            self.player.reset()
+        try:
+            return self.queue.get_nowait()
+        except Empty:
+            entry = self.queue.get(timeout=2)
+        # Stops while waiting were meant for earlier entries
+        if self.player:
+            self.player.reset()
+        return entry
+
+    def _play_in_process(self, snd_type, data, visemes):
+        """Write the audio to the output stream.
+
+        Returns:
+            bool: False if the audio needs to be played by a player process
+        """
+        if not self.player or snd_type not in ('wav', 'mp3'):
+            return False
+        if visemes:
+            self.show_visemes(visemes)
+        try:
+            self.player.play(data, snd_type)
+        except Exception as e:
+            LOG.warning('In-process playback of {} failed ({}), using the '
+                        'external player'.format(data, repr(e)))
+            return False
+        return True
+
+    def _play_process(self, snd_type, data, visemes):
+        """Play the audio with a player process and wait for it to end."""
+        if snd_type == 'wav':
+            self.p = play_wav(data, environment=self.pulse_env)
+        elif snd_type == 'mp3':
+            self.p = play_mp3(data, environment=self.pulse_env)
+        if visemes:
+            self.show_visemes(visemes)
+        if self.p:
+            self.p.communicate()
+            self.p.wait()
+
+    def duck(self):
+        """Lower the volume of the in-process playback."""
+        if self.player:
+            self.player.duck()
+
+    def unduck(self):
+        """Restore the volume of the in-process playback."""
+        if self.player:
+            self.player.unduck()
 
     def show_visemes(self, pairs):
         """Send viseme data to enclosure
@@ -148,6 +313,8 @@ class PlaybackThread(Thread):
         """Stop thread"""
         self._terminated = True
         self.clear_queue()
+        if self.pipeline:
+            self.pipeline.shutdown()
 
 
 class TTS(metaclass=ABCMeta):
@@ -179,11 +346,24 @@ class TTS(metaclass=ABCMeta):
         self.enclosure = None
         random.seed()
         self.queue = Queue()
-        self.playback = PlaybackThread(self.queue)
+        tts_config = Configuration.get().get('tts', {})
+        self.pipeline = SynthesisPipeline(
+            self.queue,
+            workers=tts_config.get('synthesis_workers', 2),
+            lookahead=tts_config.get('lookahead', 3))
+        self.playback = PlaybackThread(self.queue, self.pipeline)
         self.playback.start()
-        self.clear_cache()
         self.spellings = self.load_spellings()
         self.tts_name = type(self).__name__
+        cache_config = tts_config.get('cache', {})
+        self.cache = TTSCache(
+            mycroft.util.get_cache_directory("tts/" + self.tts_name),
+            self.audio_ext,
+            max_size=mb_to_bytes(cache_config.get('max_size_mb', 50)),
+            max_age=cache_config.get('max_age_days', 7) * 24 * 3600)
+        # Called with the sentence and the error when synthesis fails, may
+        # return a TTS to synthesize the sentence with instead
+        self.fallback = None
 
     def load_spellings(self):
         """Load phonetic spellings of words as dictionary"""
@@ -221,8 +401,7 @@ class TTS(metaclass=ABCMeta):
         if listen:
             self.bus.emit(Message('mycroft.mic.listen'))
         # Clean the cache as needed
-        cache_dir = mycroft.util.get_cache_directory("tts/" + self.tts_name)
-        mycroft.util.curate_cache(cache_dir, min_free_percent=100)
+        self.cache.curate()
 
         # This check will clear the "signal"
         check_for_signal("isSpeaking")
@@ -338,81 +517,82 @@ class TTS(metaclass=ABCMeta):
                   for i in range(len(chunks))]
 
         for sentence, l in chunks:
-            key = str(hashlib.md5(
-                sentence.encode('utf-8', 'ignore')).hexdigest())
-            wav_file = os.path.join(
-                mycroft.util.get_cache_directory("tts/" + self.tts_name),
-                key + '.' + self.audio_ext)
-
-            if os.path.exists(wav_file):
-                LOG.debug("TTS cache hit")
-                phonemes = self.load_phonemes(key)
-            else:
-                wav_file, phonemes = self.get_tts(sentence, wav_file)
-                if phonemes:
-                    self.save_phonemes(key, phonemes)
+            if self.pipeline.submit(self._synthesize,
+                                    sentence, ident, l) is None:
+                break  # Speech was stopped
 
-            vis = self.viseme(phonemes) if phonemes else None
-            self.queue.put((self.audio_ext, wav_file, vis, ident, l))
+    def _synthesize(self, sentence, ident, listen):
+        """Synthesize a sentence, run on the synthesis pipeline workers.
 
-    def viseme(self, phonemes):
-        """Create visemes from phonemes. Needs to be implemented for all
-            tts backends.
+        Returns:
+            tuple: playback queue entry, without audio if synthesis failed
+        """
+        try:
+            try:
+                audio_ext, wav_file, vis = self.get_audio(sentence)
+            except Exception as e:
+                fallback = None
+                if self.fallback:
+                    fallback = self.fallback(sentence, e)
+                if fallback is None:
+                    raise
+                audio_ext, wav_file, vis = fallback.get_audio(sentence)
+        except Exception as e:
+            LOG.error('TTS synthesis failed ({})'.format(repr(e)))
+            return (None, None, None, ident, listen)
+        return (audio_ext, wav_file, vis, ident, listen)
+
+    def get_audio(self, sentence):
+        """Get the audio for a sentence from the cache or the engine.
 
-            Arguments:
-                phonemes(str): String with phoneme data
+        Arguments:
+            sentence (str): preprocessed sentence to synthesize
+
+        Returns:
+            tuple: (audio_ext, audio file, visemes)
         """
-        return None
+        key = self.cache_key(sentence)
+        cached = self.cache.get(key)
+        if cached:
+            LOG.debug("TTS cache hit")
+            wav_file, phonemes = cached
+        else:
+            wav_file, phonemes = self.get_tts(sentence, self.cache.path(key))
+            self.cache.put(key, wav_file, phonemes)
 
-    def clear_cache(self):
-        """Remove all cached files."""
-        if not os.path.exists(mycroft.util.get_cache_directory('tts')):
-            return
-        for d in os.listdir(mycroft.util.get_cache_directory("tts")):
-            dir_path = os.path.join(mycroft.util.get_cache_directory("tts"), d)
-            if os.path.isdir(dir_path):
-                for f in os.listdir(dir_path):
-                    file_path = os.path.join(dir_path, f)
-                    if os.path.isfile(file_path):
-                        os.unlink(file_path)
-            # If no sub-folders are present, check if it is a file & clear it
-            elif os.path.isfile(dir_path):
-                os.unlink(dir_path)
-
-    def save_phonemes(self, key, phonemes):
-        """Cache phonemes
+        vis = self.viseme(phonemes) if phonemes else None
+        return self.audio_ext, wav_file, vis
+
+    def cache_key(self, sentence):
+        """Get the cache key of a sentence.
+
+        The key covers the engine, language, voice and engine configuration
+        so changing any of them doesn't return stale audio.
 
         Arguments:
-            key:        Hash key for the sentence
-            phonemes:   phoneme string to save
+            sentence (str): preprocessed sentence
+
+        Returns:
+            str: md5 hex digest identifying the audio
         """
-        cache_dir = mycroft.util.get_cache_directory("tts/" + self.tts_name)
-        pho_file = os.path.join(cache_dir, key + ".pho")
-        try:
-            with open(pho_file, "w") as cachefile:
-                cachefile.write(phonemes)
-        except Exception:
-            LOG.exception("Failed to write {} to cache".format(pho_file))
-            pass
+        data = json.dumps([self.tts_name, self.lang, self.voice,
+                           self.config, sentence],
+                          sort_keys=True, default=str)
+        return hashlib.md5(data.encode('utf-8', 'ignore')).hexdigest()
 
-    def load_phonemes(self, key):
-        """Load phonemes from cache file.
+    def viseme(self, phonemes):
+        """Create visemes from phonemes. Needs to be implemented for all
+            tts backends.
 
-        Arguments:
-            Key:    Key identifying phoneme cache
+            Arguments:
+                phonemes(str): String with phoneme data
         """
-        pho_file = os.path.join(
-            mycroft.util.get_cache_directory("tts/" + self.tts_name),
-            key + ".pho")
-        if os.path.exists(pho_file):
-            try:
-                with open(pho_file, "r") as cachefile:
-                    phonemes = cachefile.read().strip()
-                return phonemes
-            except Exception:
-                LOG.debug("Failed to read .PHO from cache")
         return None
 
+    def clear_cache(self):
+        """Remove all cached sentences except the pinned ones."""
+        self.cache.clear()
+
     def __del__(self):
         self.playback.stop()
         self.playback.join()
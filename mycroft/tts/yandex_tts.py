@@ -15,8 +15,8 @@
 
 from .tts import TTS, TTSValidator
 from mycroft.configuration import Configuration
+from mycroft.util import http_session
 
-import requests
 import wave
 
 _API_URL = "https://tts.api.cloud.yandex.net/speech/v1/tts:synthesize"
@@ -54,8 +54,8 @@ class YandexTTS(TTS):
             "sampleRateHertz": self.sample_rate
         }
 
-        with requests.post(_API_URL, headers=headers, data=data,
-                           stream=True) as resp:
+        with http_session.post(_API_URL, headers=headers, data=data,
+                               stream=True) as resp:
             if resp.status_code != 200:
                 raise Exception(
                     "Request to Yandex TTS failed: code: {}, body: {}".format(
@@ -81,7 +81,7 @@ class YandexTTSValidator(TTSValidator):
         api_key = config.get("api_key")
         if api_key is not None:
             headers = {"Authorization": "Api-Key {}".format(api_key)}
-            r = requests.get(_API_URL, headers=headers)
+            r = http_session.get(_API_URL, headers=headers)
             if r.status_code == 400:  # Authorized, but bad request
                 return True
             elif r.status_code == 401:  # Unauthorized
@@ -0,0 +1,205 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Shared HTTP session keeping connections alive between requests.
+
+The STT and TTS engines and the backend API send their requests through a
+single requests Session per process, so connections (and TLS sessions) to
+a host are reused instead of being set up for every request.
+
+The session is configured from the "http" section of the configuration:
+    pool_size: max connections kept per host
+    retries: retries for failed connections and idempotent requests
+    backoff_factor: delay between retries, backoff_factor * 2 ^ (retry - 1)
+    timeout: default (connect, read) timeout in seconds
+
+Per host statistics of the requests, new connections and latency are
+available through get_stats().
+"""
+import time
+from collections import defaultdict
+from threading import Lock
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import mycroft.configuration
+from mycroft.configuration.config import DEFAULT_CONFIG, SYSTEM_CONFIG, \
+    USER_CONFIG
+
+
+class HostStats:
+    """Request statistics for a host."""
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'connections': self.connections,
+            'reused': max(self.requests - self.connections, 0),
+            'errors': self.errors,
+            'avg_latency': (self.total_latency / self.requests
+                            if self.requests else 0.0),
+            'max_latency': self.max_latency
+        }
+
+
+def _host_key(url):
+    parsed = urlparse(url)
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    return '{}:{}'.format(parsed.hostname, port)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """Adapter reporting every new connection opened by its pools.
+
+    Arguments:
+        on_new_connection (callable): called with the "host:port" key
+    """
+    def __init__(self, on_new_connection, **kwargs):
+        self.on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pool_classes = self.poolmanager.pool_classes_by_scheme
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool_class(pool_class)
+            for scheme, pool_class in pool_classes.items()
+        }
+
+    def _counting_pool_class(self, pool_class):
+        on_new_connection = self.on_new_connection
+
+        class CountingPool(pool_class):
+            def _new_conn(self):
+                on_new_connection('{}:{}'.format(self.host, self.port))
+                return super()._new_conn()
+
+        return CountingPool
+
+
+class PooledSession(requests.Session):
+    """Session with connection pooling, retries and default timeouts.
+
+    Arguments:
+        pool_size (int): max connections kept per host
+        retries (int): max retries of a request
+        backoff_factor (float): factor of the delay between retries
+        timeout (tuple|float): default (connect, read) timeout or timeout
+                               of both in seconds
+    """
+    def __init__(self, pool_size=10, retries=2, backoff_factor=0.3,
+                 timeout=(3.05, 15)):
+        super().__init__()
+        self.timeout = tuple(timeout) if isinstance(timeout, list) \
+            else timeout
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=(502, 503, 504),
+                      raise_on_status=False)
+        self.stats = defaultdict(HostStats)
+        self.stats_lock = Lock()
+        for prefix in ('http://', 'https://'):
+            self.mount(prefix, _CountingAdapter(self._count_connection,
+                                                pool_connections=pool_size,
+                                                pool_maxsize=pool_size,
+                                                max_retries=retry))
+
+    def _count_connection(self, host):
+        with self.stats_lock:
+            self.stats[host].connections += 1
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        host = _host_key(url)
+        start = time.monotonic()
+        try:
+            response = super().request(method, url, **kwargs)
+        except Exception:
+            with self.stats_lock:
+                self.stats[host].errors += 1
+            raise
+        latency = time.monotonic() - start
+        with self.stats_lock:
+            stats = self.stats[host]
+            stats.requests += 1
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+        return response
+
+    def get_stats(self):
+        """Get the request statistics.
+
+        Returns:
+            dict: requests, new connections, reused connections, errors and
+                  average and max latency in seconds per "host:port"
+        """
+        with self.stats_lock:
+            return {host: stats.as_dict()
+                    for host, stats in self.stats.items()}
+
+
+_session = None
+_session_lock = Lock()
+
+
+def get_session():
+    """Get the HTTP session shared by the process.
+
+    Returns:
+        PooledSession: the shared session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Skip the remote config, the backend API uses the session
+                config = mycroft.configuration.Configuration.get(
+                    [DEFAULT_CONFIG, SYSTEM_CONFIG, USER_CONFIG],
+                    cache=False).get('http', {})
+                _session = PooledSession(
+                    pool_size=config.get('pool_size', 10),
+                    retries=config.get('retries', 2),
+                    backoff_factor=config.get('backoff_factor', 0.3),
+                    timeout=config.get('timeout', (3.05, 15)))
+    return _session
+
+
+def get_stats():
+    """Get the request statistics of the shared session per host."""
+    return get_session().get_stats()
+
+
+def request(method, url, **kwargs):
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url, params=None, **kwargs):
+    return get_session().get(url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return get_session().post(url, data=data, json=json, **kwargs)
+
+
+def put(url, data=None, **kwargs):
+    return get_session().put(url, data=data, **kwargs)
@@ -87,6 +87,7 @@ def create_echo_function(name, whitelist=None):
     """
 
     from mycroft.configuration import Configuration
+    from mycroft.messagebus.message import load_frame
     blacklist = Configuration.get().get("ignore_logs")
 
     # Make sure whitelisting doesn't remove the log level setting command
@@ -96,7 +97,7 @@ def create_echo_function(name, whitelist=None):
     def echo(message):
         global _log_all_bus_messages
         try:
-            msg = json.loads(message)
+            msg = load_frame(message)
             msg_type = msg.get("type", "")
             # Whitelist match beginning of message
             # i.e 'mycroft.audio.service' will allow the message
@@ -114,6 +115,9 @@ def create_echo_function(name, whitelist=None):
                 # do not log tokens from registration messages
                 msg["data"]["token"] = None
                 message = json.dumps(msg)
+            elif _log_all_bus_messages and not isinstance(message, str):
+                # Binary frame, log it as json
+                message = json.dumps(msg)
         except Exception as e:
             LOG.info("Error: {}".format(repr(e)), exc_info=True)
 
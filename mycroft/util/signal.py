@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import fcntl
+import mmap
+import struct
 import tempfile
 import time
+from threading import Lock
 
 import os
 import os.path
@@ -21,6 +25,11 @@ import os.path
 import mycroft
 from .file_utils import ensure_directory_exists, create_file
 
+# Signals kept in shared memory when the signal mode is "memory", other
+# signals always use files.
+SHARED_SIGNALS = ('buttonPress', 'isSpeaking', 'startListening',
+                  'stoppingTTS')
+
 
 def get_ipc_directory(domain=None):
     """Get the directory used for Inter Process Communication
@@ -43,6 +52,119 @@ def get_ipc_directory(domain=None):
     return ensure_directory_exists(dir, domain)
 
 
+class SharedSignals:
+    """Signals and mic level stored in a memory map shared by processes.
+
+    The map is backed by a small file in the IPC directory. Each signal is
+    the time it was created (0 when not set) and the mic level is stored
+    with a sequence number incremented on every update. Once mapped,
+    reading and writing involves no system calls.
+
+    Arguments:
+        path (str): file backing the memory map
+    """
+    MAGIC = b'MYCS0001'
+    _SIGNAL = struct.Struct('d')
+    _MIC_LEVEL = struct.Struct('Qddd')  # sequence, energy, threshold, muted
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = Lock()
+        self._signal_offset = len(self.MAGIC)
+        self._mic_offset = (self._signal_offset +
+                            self._SIGNAL.size * len(SHARED_SIGNALS))
+        self.size = self._mic_offset + self._MIC_LEVEL.size
+
+        save = os.umask(0)
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        finally:
+            os.umask(save)
+        try:
+            # Lock while initializing to not race other processes
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+            self._map = mmap.mmap(fd, self.size)
+            if self._map[:len(self.MAGIC)] != self.MAGIC:
+                self._map[:self.size] = bytes(self.size)
+                self._map[:len(self.MAGIC)] = self.MAGIC
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _offset(self, signal_name):
+        return (self._signal_offset +
+                self._SIGNAL.size * SHARED_SIGNALS.index(signal_name))
+
+    def create(self, signal_name):
+        self._SIGNAL.pack_into(self._map, self._offset(signal_name),
+                               time.time())
+        return True
+
+    def check(self, signal_name, sec_lifetime=0):
+        offset = self._offset(signal_name)
+        with self.lock:
+            created = self._SIGNAL.unpack_from(self._map, offset)[0]
+            if not created:
+                return False
+            if sec_lifetime == 0:
+                # consume this single-use signal
+                self._SIGNAL.pack_into(self._map, offset, 0.0)
+            elif sec_lifetime == -1:
+                return True
+            elif int(created + sec_lifetime) < int(time.time()):
+                # remove once expired
+                self._SIGNAL.pack_into(self._map, offset, 0.0)
+                return False
+            return True
+
+    def write_mic_level(self, energy, threshold, muted):
+        with self.lock:
+            sequence = self._MIC_LEVEL.unpack_from(self._map,
+                                                   self._mic_offset)[0]
+            self._MIC_LEVEL.pack_into(self._map, self._mic_offset,
+                                      sequence + 1, energy, threshold, muted)
+
+    def read_mic_level(self):
+        """Get the latest mic level.
+
+        Returns:
+            tuple: (sequence, energy, threshold, muted), sequence is 0 if
+                   the level was never written
+        """
+        return self._MIC_LEVEL.unpack_from(self._map, self._mic_offset)
+
+
+_shared_signals = None
+_shared_signals_lock = Lock()
+
+
+def get_shared_signals():
+    """Get the shared memory signals of this process.
+
+    Returns:
+        SharedSignals: shared signals, None if the signal mode is "file"
+    """
+    global _shared_signals
+    if _shared_signals is None:
+        with _shared_signals_lock:
+            if _shared_signals is None:
+                config = mycroft.configuration.Configuration.get()
+                if config.get('signal', {}).get('mode', 'memory') == 'file':
+                    _shared_signals = False
+                else:
+                    _shared_signals = SharedSignals(
+                        os.path.join(get_ipc_directory(), 'signals.mmap'))
+    return _shared_signals or None
+
+
+def _get_shared(signal_name):
+    if signal_name in SHARED_SIGNALS:
+        return get_shared_signals()
+    return None
+
+
 def create_signal(signal_name):
     """Create a named signal
 
@@ -50,6 +172,9 @@ def create_signal(signal_name):
         signal_name (str): The signal's name.  Must only contain characters
             valid in filenames.
     """
+    shared = _get_shared(signal_name)
+    if shared:
+        return shared.create(signal_name)
     try:
         path = os.path.join(get_ipc_directory(), "signal", signal_name)
         create_file(path)
@@ -71,6 +196,9 @@ def check_for_signal(signal_name, sec_lifetime=0):
     Returns:
         bool: True if the signal is defined, False otherwise
     """
+    shared = _get_shared(signal_name)
+    if shared:
+        return shared.check(signal_name, sec_lifetime)
     path = os.path.join(get_ipc_directory(), "signal", signal_name)
     if os.path.isfile(path):
         if sec_lifetime == 0:
@@ -86,3 +214,45 @@ def check_for_signal(signal_name, sec_lifetime=0):
 
     # No such signal exists
     return False
+
+
+def write_mic_level(energy, threshold, muted):
+    """Publish the microphone level, e.g. for the CLI level meter.
+
+    Args:
+        energy (float): current energy of the microphone audio
+        threshold (float): energy threshold for speech
+        muted (bool): True if the microphone is muted
+    """
+    shared = get_shared_signals()
+    if shared:
+        shared.write_mic_level(energy, threshold, int(muted))
+    else:
+        with open(os.path.join(get_ipc_directory(), "mic_level"), 'w') as f:
+            f.write('Energy:  cur={} thresh={:.3f} muted={}'.format(
+                energy, threshold, int(muted)))
+
+
+def read_mic_level():
+    """Get the latest microphone level.
+
+    Returns:
+        tuple: (energy, threshold, muted) or None if not available
+    """
+    shared = get_shared_signals()
+    if shared:
+        sequence, energy, threshold, muted = shared.read_mic_level()
+        if not sequence:
+            return None
+        return energy, threshold, bool(muted)
+
+    try:
+        with open(os.path.join(get_ipc_directory(), "mic_level")) as f:
+            line = f.readline()
+        # Ex:Energy:  cur=4 thresh=1.5 muted=0
+        cur_text, thresh_text, muted_text = line.split(' ')[-3:]
+        return (float(cur_text.split('=')[-1]),
+                float(thresh_text.split('=')[-1]),
+                muted_text.split('=')[-1].strip() == '1')
+    except (OSError, ValueError):
+        return None
@@ -60,6 +60,7 @@ setup(
     extras_require={
         'audio-backend': required('requirements/extra-audiobackend.txt'),
         'mark1': required('requirements/extra-mark1.txt'),
+        'messagebus': required('requirements/extra-messagebus.txt'),
         'stt': required('requirements/extra-stt.txt')
     },
     packages=find_packages(include=['mycroft*']),
@@ -0,0 +1,125 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""CPU time spent on audio buffering per second of microphone audio.
+
+Compares the previous bytes concatenation in the wake word loop and the
+phrase recording with the CyclicAudioBuffer, using the default listener
+parameters (16 kHz, 16 bit, 1024 sample chunks, 3 s of saved audio and
+checks every 0.2 s). The wake word engine and the energy calculations are
+left out, only the buffer handling is measured.
+
+Run with:
+    python -m test.benchmarks.bench_audio_buffer
+"""
+import os
+import time
+
+from mycroft.client.speech.audio_buffer import CyclicAudioBuffer
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+CHUNK = 1024
+SAVED_WW_SEC = 3
+TEST_WW_SEC = 1.2
+SEC_BETWEEN_WW_CHECKS = 0.2
+RECORDING_TIMEOUT = 10.0
+
+SEC_PER_BUFFER = CHUNK / SAMPLE_RATE
+MAX_SIZE = int(SAVED_WW_SEC * SAMPLE_RATE) * SAMPLE_WIDTH
+TEST_SIZE = int(TEST_WW_SEC * SAMPLE_RATE) * SAMPLE_WIDTH
+SILENCE = b'\0' * int(0.01 * SAMPLE_RATE * SAMPLE_WIDTH)
+BUFFERS_PER_CHECK = SEC_BETWEEN_WW_CHECKS / SEC_PER_BUFFER
+
+
+def wake_word_loop_bytes(chunks):
+    byte_data = SILENCE
+    buffers_since_check = 0.0
+    for chunk in chunks:
+        if len(byte_data) < MAX_SIZE:
+            byte_data += chunk
+        else:
+            byte_data = byte_data[len(chunk):] + chunk
+        buffers_since_check += 1.0
+        if buffers_since_check > BUFFERS_PER_CHECK:
+            buffers_since_check -= BUFFERS_PER_CHECK
+            chopped = byte_data[-TEST_SIZE:] \
+                if TEST_SIZE < len(byte_data) else byte_data
+            chopped + SILENCE
+
+
+def wake_word_loop_cyclic(chunks, audio_buffer):
+    audio_buffer.clear()
+    buffers_since_check = 0.0
+    for chunk in chunks:
+        audio_buffer.append(chunk)
+        buffers_since_check += 1.0
+        if buffers_since_check > BUFFERS_PER_CHECK:
+            buffers_since_check -= BUFFERS_PER_CHECK
+            b''.join((audio_buffer.get_last(TEST_SIZE), SILENCE))
+
+
+def record_phrase_bytes(chunks):
+    byte_data = b'\0' * SAMPLE_WIDTH
+    for chunk in chunks:
+        byte_data += chunk
+    return byte_data
+
+
+def record_phrase_cyclic(chunks, audio_buffer):
+    start = audio_buffer.written
+    for chunk in chunks:
+        audio_buffer.append(chunk)
+    return b''.join((b'\0' * SAMPLE_WIDTH, audio_buffer.get_since(start)))
+
+
+def cpu_per_audio_second(func, chunks, repeats):
+    audio_seconds = len(chunks) * SEC_PER_BUFFER * repeats
+    start = time.process_time()
+    for _ in range(repeats):
+        func(chunks)
+    return (time.process_time() - start) / audio_seconds
+
+
+def run(seconds=60, repeats=5):
+    chunk_count = int(seconds / SEC_PER_BUFFER)
+    chunks = [os.urandom(CHUNK * SAMPLE_WIDTH) for _ in range(chunk_count)]
+    phrase_chunks = chunks[:int(RECORDING_TIMEOUT / SEC_PER_BUFFER)]
+    max_chunks = int(RECORDING_TIMEOUT / SEC_PER_BUFFER) + 1
+    audio_buffer = CyclicAudioBuffer(max(MAX_SIZE,
+                                         max_chunks * CHUNK * SAMPLE_WIDTH))
+
+    results = [
+        ('wake word loop', 'bytes',
+         cpu_per_audio_second(wake_word_loop_bytes, chunks, repeats)),
+        ('wake word loop', 'cyclic',
+         cpu_per_audio_second(
+             lambda c: wake_word_loop_cyclic(c, audio_buffer),
+             chunks, repeats)),
+        ('record phrase (10 s)', 'bytes',
+         cpu_per_audio_second(record_phrase_bytes, phrase_chunks,
+                              repeats * 6)),
+        ('record phrase (10 s)', 'cyclic',
+         cpu_per_audio_second(
+             lambda c: record_phrase_cyclic(c, audio_buffer),
+             phrase_chunks, repeats * 6)),
+    ]
+    print('{:<24}{:<10}{:>24}'.format('loop', 'buffer',
+                                      'CPU ms / audio second'))
+    for loop, buffer_type, cpu in results:
+        print('{:<24}{:<10}{:>24.3f}'.format(loop, buffer_type, cpu * 1000))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,100 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Measure EventScheduler overhead and accuracy with many pending timers.
+
+Run with:
+    python -m test.benchmarks.bench_event_scheduler
+"""
+import random
+import time
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+from timeit import timeit
+
+from mycroft.skills.event_scheduler import EventScheduler
+
+
+class LatencyBus:
+    """Bus recording how late each scheduled message is emitted."""
+    def __init__(self, expected):
+        self.expected = expected
+        self.latencies = []
+        self.done = Event()
+
+    def on(self, event, handler):
+        pass
+
+    def remove_all_listeners(self, event):
+        pass
+
+    def emit(self, message):
+        due = message.data.get('due')
+        if due is not None:
+            self.latencies.append(time.time() - due)
+            if len(self.latencies) >= self.expected:
+                self.done.set()
+
+
+def run(timers=50000, fired=1000):
+    tmp_dir = mkdtemp()
+    bus = LatencyBus(fired)
+    scheduler = EventScheduler(bus, join(tmp_dir, 'schedule.json'))
+    try:
+        now = time.time()
+        # Background timers due within the next hour
+        start = time.perf_counter()
+        for i in range(timers):
+            scheduler.schedule_event('background.{}'.format(i),
+                                     now + 60 + random.random() * 3600)
+        schedule_time = time.perf_counter() - start
+        print('schedule {} timers: {:.1f} us/timer'.format(
+            timers, schedule_time / timers * 1e6))
+
+        iterations = 1000
+        check = timeit(scheduler.check_state, number=iterations)
+        print('check_state, nothing due: {:.2f} us'.format(
+            check / iterations * 1e6))
+
+        start = time.perf_counter()
+        for i in range(0, timers, 10):
+            scheduler.remove_event('background.{}'.format(i))
+        remove_time = time.perf_counter() - start
+        print('remove {} timers: {:.1f} us/timer'.format(
+            timers // 10, remove_time / (timers // 10) * 1e6))
+
+        # Timers due within the next second, among the background timers
+        now = time.time()
+        for i in range(fired):
+            due = now + 0.5 + random.random()
+            scheduler.schedule_event('due.{}'.format(i), due,
+                                     data={'due': due})
+        bus.done.wait(10)
+        latencies = sorted(bus.latencies)
+        if latencies:
+            print('fired {} timers, latency avg {:.2f} ms, '
+                  'p99 {:.2f} ms, max {:.2f} ms'.format(
+                      len(latencies),
+                      sum(latencies) / len(latencies) * 1000,
+                      latencies[int(len(latencies) * 0.99)] * 1000,
+                      latencies[-1] * 1000))
+    finally:
+        scheduler.shutdown()
+        rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,83 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Compare encode/decode cost and size of the messagebus wire formats.
+
+Run with:
+    python -m test.benchmarks.bench_message_serialization
+"""
+from timeit import timeit
+
+from mycroft.messagebus.message import Message, supported_wire_formats
+
+CONTEXT = {
+    'client_name': 'mycroft_listener',
+    'source': 'audio',
+    'destination': ['skills']
+}
+
+MESSAGES = {
+    'speak': Message(
+        'speak',
+        {
+            'utterance': 'It is currently 15 degrees and partly cloudy. '
+                         'Expect a high of 21 and a low of 9 today.',
+            'expect_response': False,
+            'meta': {'skill': 'WeatherSkill', 'dialog': 'current.weather'}
+        },
+        CONTEXT
+    ),
+    'recognizer_loop:utterance': Message(
+        'recognizer_loop:utterance',
+        {'utterances': ['what is the weather like tomorrow'],
+         'lang': 'en-us'},
+        CONTEXT
+    ),
+    'gui.value.set': Message(
+        'gui.value.set',
+        {
+            '__from': 'mycroft-weather.mycroftai',
+            'current': 15,
+            'min': 9,
+            'max': 21,
+            'location': 'Lawrence, Kansas',
+            'condition': 'partial clouds',
+            'weathercode': 1,
+            'forecast': [{'date': '2020-06-0{}'.format(i), 'min': 9 + i,
+                          'max': 21 + i, 'weathercode': i % 4}
+                         for i in range(1, 8)]
+        }
+    )
+}
+
+
+def run(iterations=20000):
+    print('{:<28}{:<10}{:>8}{:>14}{:>14}'.format(
+        'message', 'format', 'bytes', 'encode (us)', 'decode (us)'))
+    for name, message in MESSAGES.items():
+        for wire_format in supported_wire_formats():
+            frame = message.serialize(wire_format)
+            size = len(frame if isinstance(frame, bytes)
+                       else frame.encode('utf-8'))
+            encode = timeit(lambda: message.serialize(wire_format),
+                            number=iterations)
+            decode = timeit(lambda: Message.deserialize(frame),
+                            number=iterations)
+            print('{:<28}{:<10}{:>8}{:>14.2f}{:>14.2f}'.format(
+                name, wire_format, size,
+                encode / iterations * 1e6, decode / iterations * 1e6))
+
+
+if __name__ == '__main__':
+    run()
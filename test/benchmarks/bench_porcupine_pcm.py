@@ -0,0 +1,103 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Throughput of the PCM handling in PorcupineHotWord.update.
+
+Compares the previous struct unpacking into a Python list with the typed
+int16 buffer, using a stand in for Porcupine that only receives the frames
+(512 samples, as the real engine). The conversion done inside the
+Porcupine Python binding is not included.
+
+Run with:
+    python -m test.benchmarks.bench_porcupine_pcm
+"""
+import os
+import struct
+import time
+from array import array
+
+from mycroft.client.speech.hotword_factory import PorcupineHotWord
+
+CHUNK = 1024
+SAMPLE_WIDTH = 2
+
+
+class NullPorcupine:
+    frame_length = 512
+
+    def process(self, pcm):
+        return False
+
+
+class ListPorcupineHotWord:
+    """The previous implementation of PorcupineHotWord.update."""
+    def __init__(self):
+        self.porcupine = NullPorcupine()
+        self.num_keywords = 1
+        self.audio_buffer = []
+        self.has_found = False
+
+    def update(self, chunk):
+        pcm = struct.unpack_from("h" * (len(chunk)//2), chunk)
+        self.audio_buffer += pcm
+        while True:
+            if len(self.audio_buffer) >= self.porcupine.frame_length:
+                result = self.porcupine.process(
+                    self.audio_buffer[0:self.porcupine.frame_length])
+                self.has_found |= (
+                    (self.num_keywords == 1 and result) |
+                    (self.num_keywords > 1 and result >= 0))
+                self.audio_buffer = self.audio_buffer[
+                    self.porcupine.frame_length:]
+            else:
+                return
+
+
+def typed_hotword():
+    hotword = PorcupineHotWord.__new__(PorcupineHotWord)
+    hotword.porcupine = NullPorcupine()
+    hotword.num_keywords = 1
+    hotword.audio_buffer = array('h')
+    hotword.has_found = False
+    return hotword
+
+
+def samples_per_second(hotword, chunks, repeats):
+    start = time.process_time()
+    for _ in range(repeats):
+        for chunk in chunks:
+            hotword.update(chunk)
+    elapsed = time.process_time() - start
+    return len(chunks) * repeats * CHUNK / elapsed
+
+
+def run(chunk_count=1000, repeats=5):
+    # Chunks not aligned with the Porcupine frames
+    chunks = [os.urandom(CHUNK * SAMPLE_WIDTH - 6)
+              for _ in range(chunk_count)]
+    results = [
+        ('struct + list', samples_per_second(ListPorcupineHotWord(),
+                                             chunks, repeats)),
+        ('typed buffer', samples_per_second(typed_hotword(),
+                                            chunks, repeats))
+    ]
+    print('{:<16}{:>20}{:>20}'.format('buffer', 'Msamples / s',
+                                      'x real time 16kHz'))
+    for name, rate in results:
+        print('{:<16}{:>20.2f}{:>20.0f}'.format(name, rate / 1e6,
+                                                rate / 16000))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,66 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Time per voc_match() call against growing vocabularies.
+
+Compares the previous check, one re.match(r'.*\\b' + term + r'\\b.*') per
+vocabulary term, with the single compiled matcher. The vocabulary is
+cached in both cases, only the matching is measured. Utterances with the
+term at the end of the vocabulary and without any match are the worst case
+for the per-term check.
+
+Run with:
+    python -m test.benchmarks.bench_voc_match
+"""
+import random
+import re
+import string
+from timeit import timeit
+
+from mycroft.skills.skill_data import compile_vocabulary
+
+UTTERANCES = {
+    'no match': 'what is the weather going to be like tomorrow in london',
+    'last term': 'could you please {} the lights in the kitchen',
+}
+
+
+def random_term(words=2):
+    return ' '.join(''.join(random.choice(string.ascii_lowercase)
+                            for _ in range(random.randint(3, 8)))
+                    for _ in range(words))
+
+
+def per_term_match(terms, utt):
+    return any([re.match(r'.*\b' + i + r'\b.*', utt) for i in terms])
+
+
+def run(sizes=(10, 100, 1000), number=200):
+    random.seed(1)
+    print('{:>6} {:>10} {:>12} {:>12}'.format('terms', 'utterance',
+                                              'per term', 'compiled'))
+    for size in sizes:
+        terms = [random_term(random.randint(1, 3)) for _ in range(size)]
+        matcher = compile_vocabulary(terms)
+        for name, utt in UTTERANCES.items():
+            utt = utt.format(terms[-1])
+            assert per_term_match(terms, utt) == bool(matcher.search(utt))
+            old = timeit(lambda: per_term_match(terms, utt), number=number)
+            new = timeit(lambda: matcher.search(utt), number=number)
+            print('{:>6} {:>10} {:>9.1f} us {:>9.1f} us'.format(
+                size, name, old / number * 1e6, new / number * 1e6))
+
+
+if __name__ == '__main__':
+    run()
@@ -35,9 +35,6 @@ CONFIG.merge(
 )
 
 
-mycroft.api.requests.post = MagicMock()
-
-
 def create_identity(uuid, expired=False):
     mock_identity = MagicMock()
     mock_identity.is_expired.return_value = expired
@@ -71,7 +68,7 @@ class TestApi(unittest.TestCase):
         self.assertEqual(a.identity.uuid, '1234')
 
     @patch('mycroft.api.IdentityManager')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_send(self, mock_request, mock_identity_manager):
         # Setup an OK response
         mock_response_ok = create_response(200, {})
@@ -115,7 +112,7 @@ class TestDeviceApi(unittest.TestCase):
         super().setUp()
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_init(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200)
         mock_identity_get.return_value = create_identity('1234')
@@ -125,7 +122,7 @@ class TestDeviceApi(unittest.TestCase):
         self.assertEqual(device.path, 'device')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_activate(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200)
         mock_identity_get.return_value = create_identity('1234')
@@ -137,7 +134,7 @@ class TestDeviceApi(unittest.TestCase):
         self.assertEqual(json['token'], 'token')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200)
         mock_identity_get.return_value = create_identity('1234')
@@ -149,7 +146,7 @@ class TestDeviceApi(unittest.TestCase):
 
     @patch('mycroft.api.IdentityManager.update')
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get_code(self, mock_request, mock_identity_get,
                              mock_identit_update):
         mock_request.return_value = create_response(200, '123ABC')
@@ -162,7 +159,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/code?state=state')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get_settings(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -173,7 +170,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/1234/setting')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_report_metric(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -190,7 +187,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/1234/metric/mymetric')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_send_email(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -207,7 +204,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/1234/message')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get_oauth_token(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -219,7 +216,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/1234/token/1')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get_location(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -230,7 +227,7 @@ class TestDeviceApi(unittest.TestCase):
             url, 'https://api-test.mycroft.ai/v1/device/1234/location')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_get_subscription(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -250,7 +247,7 @@ class TestDeviceApi(unittest.TestCase):
         self.assertTrue(device.is_subscriber)
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_device_upload_skills_data(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200)
         mock_identity_get.return_value = create_identity('1234')
@@ -271,7 +268,7 @@ class TestDeviceApi(unittest.TestCase):
             device.upload_skills_data('This isn\'t right at all')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_stt(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -279,7 +276,7 @@ class TestDeviceApi(unittest.TestCase):
         self.assertEqual(stt.path, 'stt')
 
     @patch('mycroft.api.IdentityManager.get')
-    @patch('mycroft.api.requests.request')
+    @patch('mycroft.api.http_session.request')
     def test_stt_stt(self, mock_request, mock_identity_get):
         mock_request.return_value = create_response(200, {})
         mock_identity_get.return_value = create_identity('1234')
@@ -309,7 +306,7 @@ class TestDeviceApi(unittest.TestCase):
 
 
 @patch('mycroft.api.IdentityManager.get')
-@patch('mycroft.api.requests.request')
+@patch('mycroft.api.http_session.request')
 class TestSettingsMeta(unittest.TestCase):
     def setUp(self):
         patcher = patch('mycroft.configuration.Configuration.get',
@@ -369,7 +366,7 @@ class TestSettingsMeta(unittest.TestCase):
 
 @patch('mycroft.api._paired_cache', False)
 @patch('mycroft.api.IdentityManager.get')
-@patch('mycroft.api.requests.request')
+@patch('mycroft.api.http_session.request')
 class TestIsPaired(unittest.TestCase):
     def setUp(self):
         patcher = patch('mycroft.configuration.Configuration.get',
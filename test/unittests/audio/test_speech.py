@@ -97,6 +97,22 @@ class TestSpeech(unittest.TestCase):
                 [mock.call('hello there.', 'a', False),
                  mock.call('world', 'a', False)])
 
+    @mock.patch('mycroft.audio.speech.Mimic')
+    def test_fallback_synthesis(self, mimic_cls_mock, tts_factory_mock,
+                                config_mock):
+        """Ensure sentences failing on the remote tts use mimic."""
+        setup_mocks(config_mock, tts_factory_mock)
+        speech.mimic_fallback_obj = None
+        self.addCleanup(setattr, speech, 'mimic_fallback_obj', None)
+        bus = mock.Mock()
+        speech.init(bus)
+        self.assertEqual(tts_mock.fallback, speech.fallback_tts)
+
+        self.assertEqual(speech.fallback_tts('hello',
+                                             RemoteTTSTimeoutException()),
+                         mimic_cls_mock.return_value)
+        self.assertIsNone(speech.fallback_tts('hello', ValueError()))
+
     @mock.patch('mycroft.audio.speech.check_for_signal')
     def test_abort_speak(self, check_for_signal_mock, tts_factory_mock,
                          config_mock):
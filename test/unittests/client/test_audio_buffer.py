@@ -0,0 +1,55 @@
+import unittest
+
+from mycroft.client.speech.audio_buffer import CyclicAudioBuffer
+
+
+class TestCyclicAudioBuffer(unittest.TestCase):
+    def test_fill(self):
+        buffer = CyclicAudioBuffer(8)
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(bytes(buffer.get_last(4)), b'')
+        buffer.append(b'abc')
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(bytes(buffer.get_last(8)), b'abc')
+        self.assertEqual(bytes(buffer.get_last(2)), b'bc')
+
+    def test_wrap_around(self):
+        buffer = CyclicAudioBuffer(8)
+        buffer.append(b'abcdef')
+        buffer.append(b'ghij')
+        self.assertEqual(len(buffer), 8)
+        self.assertEqual(bytes(buffer.get_last(8)), b'cdefghij')
+        self.assertEqual(bytes(buffer.get_last(3)), b'hij')
+        for chunk in (b'kl', b'mnop', b'qrs'):
+            buffer.append(chunk)
+        self.assertEqual(bytes(buffer.get_last(8)), b'lmnopqrs')
+
+    def test_chunk_larger_than_buffer(self):
+        buffer = CyclicAudioBuffer(4)
+        buffer.append(b'ab')
+        buffer.append(b'cdefgh')
+        self.assertEqual(bytes(buffer.get_last(4)), b'efgh')
+        self.assertEqual(buffer.written, 8)
+
+    def test_get_since(self):
+        buffer = CyclicAudioBuffer(8)
+        buffer.append(b'abcde')
+        position = buffer.written
+        buffer.append(b'fg')
+        buffer.append(b'hijk')
+        self.assertEqual(bytes(buffer.get_since(position)), b'fghijk')
+
+    def test_view_without_copy(self):
+        buffer = CyclicAudioBuffer(8)
+        buffer.append(b'abcd')
+        view = buffer.get_last(4)
+        self.assertIsInstance(view, memoryview)
+        self.assertIs(view.obj, buffer.get_last(1).obj)
+
+    def test_clear(self):
+        buffer = CyclicAudioBuffer(8)
+        buffer.append(b'abcd')
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        buffer.append(b'ef')
+        self.assertEqual(bytes(buffer.get_last(8)), b'ef')
@@ -12,15 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import time
 import unittest
+from threading import Event
+from unittest import mock
 
 import speech_recognition
 from os.path import dirname, join
+from pyee import EventEmitter
 from speech_recognition import WavFile, AudioData
 
 from mycroft.client.speech.listener import (AudioConsumer, RecognizerLoop,
-                                            AUDIO_DATA, STREAM_START,
-                                            STREAM_DATA, STREAM_STOP)
+                                            RecognizerLoopState, AUDIO_DATA)
 from mycroft.stt import MycroftSTT
 from queue import Queue
 
@@ -209,3 +212,120 @@ class AudioConsumerTest(unittest.TestCase):
         self.assertIsNotNone(utterances)
         self.assertTrue(len(utterances) == 1)
         self.assertEqual("record", utterances[0])
+
+
+class GatedSTT:
+    """STT returning the frame data as text once released."""
+    def __init__(self, can_stream=False):
+        self.lang = 'en-US'
+        self.can_stream = can_stream
+        self.gates = {}
+
+    def gate(self, text):
+        self.gates[text] = Event()
+        return self.gates[text]
+
+    def execute(self, audio, language=None):
+        text = audio.frame_data.decode().strip()
+        if text in self.gates:
+            self.gates[text].wait(5)
+        return text
+
+
+def create_audio(text):
+    # One second of 16 kHz audio
+    return AudioData(text.encode().ljust(32000), 16000, 2)
+
+
+@mock.patch('mycroft.client.speech.listener.report_timing', mock.Mock())
+@mock.patch('mycroft.client.speech.listener.SessionManager', mock.Mock())
+class STTWorkerPoolTest(unittest.TestCase):
+    def create_consumer(self, stt, deadline=None):
+        state = RecognizerLoopState()
+        state.running = True
+        self.emitter = EventEmitter()
+        self.utterances = []
+        self.unknown = []
+        self.emitter.on('recognizer_loop:utterance',
+                        lambda p: self.utterances.append(p['utterances'][0]))
+        self.emitter.on('recognizer_loop:speech.recognition.unknown',
+                        lambda: self.unknown.append(True))
+        config = {'stt': {'workers': 2, 'deadline': deadline}}
+        with mock.patch('mycroft.client.speech.listener.Configuration.get',
+                        return_value=config):
+            return AudioConsumer(state, None, self.emitter, stt,
+                                 None, None)
+
+    def wait_for(self, predicate, timeout=2):
+        end = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < end:
+            time.sleep(0.01)
+        return predicate()
+
+    def test_ordered_delivery(self):
+        stt = GatedSTT()
+        consumer = self.create_consumer(stt)
+        slow = stt.gate('first')
+        consumer.process(create_audio('first'))
+        consumer.process(create_audio('second'))
+        # Second utterance is transcribed while the first is in flight
+        self.assertTrue(self.wait_for(
+            lambda: consumer.stt_requests[1].future.done()))
+        self.assertEqual(self.utterances, [])
+
+        slow.set()
+        self.assertTrue(self.wait_for(lambda: len(self.utterances) == 2))
+        self.assertEqual(self.utterances, ['first', 'second'])
+
+    def test_deadline(self):
+        stt = GatedSTT()
+        consumer = self.create_consumer(stt, deadline=0.1)
+        slow = stt.gate('first')
+        consumer.process(create_audio('first'))
+        consumer.process(create_audio('second'))
+        time.sleep(0.2)
+        consumer.deliver_transcriptions()
+        self.assertEqual(self.utterances, ['second'])
+        self.assertEqual(self.unknown, [True])
+
+        slow.set()
+        time.sleep(0.1)
+        self.assertEqual(self.utterances, ['second'])
+
+    def test_cancel(self):
+        stt = GatedSTT()
+        consumer = self.create_consumer(stt)
+        slow = stt.gate('first')
+        consumer.process(create_audio('first'))
+        consumer.process(create_audio('second'))
+        consumer.cancel_transcriptions()
+        slow.set()
+        time.sleep(0.1)
+        consumer.deliver_transcriptions()
+        self.assertEqual(self.utterances, [])
+        self.assertEqual(len(consumer.stt_requests), 0)
+
+    def test_single_worker_by_default(self):
+        state = RecognizerLoopState()
+        with mock.patch('mycroft.client.speech.listener.Configuration.get',
+                        return_value={'stt': {}}):
+            consumer = AudioConsumer(state, None, EventEmitter(), GatedSTT(),
+                                     None, None)
+        self.assertEqual(consumer.stt_executor._max_workers, 1)
+
+    def test_streaming_stt_inline(self):
+        stt = GatedSTT(can_stream=True)
+        consumer = self.create_consumer(stt)
+        self.assertIsNone(consumer.stt_executor)
+        consumer.process(create_audio('hello'))
+        self.assertEqual(self.utterances, ['hello'])
+
+    def test_metrics(self):
+        stt = GatedSTT()
+        consumer = self.create_consumer(stt)
+        consumer.metrics = mock.Mock()
+        consumer.process(create_audio('hello'))
+        self.assertTrue(self.wait_for(lambda: self.utterances == ['hello']))
+        timers = [c[0][0] for c in consumer.metrics.timer.call_args_list]
+        self.assertIn('mycroft.stt.queue_wait_s', timers)
+        self.assertIn('mycroft.stt.time_s', timers)
@@ -12,9 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import struct
 import unittest
+from array import array
+from unittest import mock
 
-from mycroft.client.speech.hotword_factory import HotWordFactory
+from mycroft.client.speech.hotword_factory import (HotWordEngine,
+                                                   HotWordFactory,
+                                                   MultiHotWord,
+                                                   PorcupineHotWord,
+                                                   unpack_samples)
 
 
 class PocketSphinxTest(unittest.TestCase):
@@ -55,3 +62,127 @@ class PocketSphinxTest(unittest.TestCase):
         config = config['hey victoria']
         self.assertEqual(config['phonemes'], p.phonemes)
         self.assertEqual(p.key_phrase, 'hey victoria')
+
+
+class FakeEngine(HotWordEngine):
+    def __init__(self, key_phrase, uses_samples=False):
+        super().__init__(key_phrase, {})
+        self.uses_samples = uses_samples
+        self.chunks = []
+        self.samples = []
+        self.found = False
+        self.stopped = False
+
+    def update_samples(self, chunk, samples):
+        self.chunks.append(chunk)
+        self.samples.append(samples)
+
+    def found_wake_word(self, frame_data):
+        found, self.found = self.found, False
+        return found
+
+    def stop(self):
+        self.stopped = True
+
+
+class MultiHotWordTest(unittest.TestCase):
+    def setUp(self):
+        self.first = FakeEngine('hey mycroft', uses_samples=True)
+        self.second = FakeEngine('hey jarvis')
+        self.multi = MultiHotWord([self.first, self.second])
+
+    def tearDown(self):
+        self.multi.stop()
+
+    def test_update_unpacks_once(self):
+        chunk = struct.pack('hhh', 1, -2, 3)
+        with mock.patch('mycroft.client.speech.hotword_factory.'
+                        'unpack_samples',
+                        return_value=(1, -2, 3)) as unpack:
+            self.multi.update(chunk)
+        unpack.assert_called_once_with(chunk)
+        self.assertEqual(self.first.chunks, [chunk])
+        self.assertEqual(self.second.chunks, [chunk])
+        self.assertEqual(self.first.samples, [(1, -2, 3)])
+        self.assertIs(self.first.samples[0], self.second.samples[0])
+
+    def test_no_unpack_without_sample_engines(self):
+        self.first.uses_samples = False
+        multi = MultiHotWord([self.first, self.second])
+        multi.update(b'\0\0')
+        self.assertEqual(self.second.samples, [None])
+        multi.stop()
+
+    def test_reports_detecting_engine(self):
+        self.assertEqual(self.multi.key_phrase, 'hey mycroft')
+        self.multi.update(b'\0\0')
+        self.assertFalse(self.multi.found_wake_word(b''))
+        self.assertIsNone(self.multi.detected)
+
+        self.second.found = True
+        self.assertTrue(self.multi.found_wake_word(b''))
+        self.assertEqual(self.multi.detected['key_phrase'], 'hey jarvis')
+        self.assertEqual(self.multi.detected['module'], 'FakeEngine')
+        self.assertGreaterEqual(self.multi.detected['latency'], 0)
+        self.assertEqual(self.multi.detections['hey jarvis'], 1)
+
+    def test_all_engines_checked(self):
+        self.first.found = True
+        self.second.found = True
+        self.assertTrue(self.multi.found_wake_word(b''))
+        self.assertEqual(self.multi.detected['key_phrase'], 'hey mycroft')
+        # Pending detection of the second engine is cleared as well
+        self.assertFalse(self.second.found)
+
+    def test_num_phonemes(self):
+        self.assertEqual(self.multi.num_phonemes,
+                         max(self.first.num_phonemes,
+                             self.second.num_phonemes))
+
+    def test_stop(self):
+        self.multi.stop()
+        self.assertTrue(self.first.stopped)
+        self.assertTrue(self.second.stopped)
+
+
+class FakePorcupine:
+    frame_length = 4
+
+    def __init__(self, keyword_frame=None):
+        self.frames = []
+        self.keyword_frame = keyword_frame
+
+    def process(self, pcm):
+        self.frames.append(list(pcm))
+        return len(self.frames) == self.keyword_frame
+
+
+def create_porcupine(porcupine):
+    hotword = PorcupineHotWord.__new__(PorcupineHotWord)
+    hotword.porcupine = porcupine
+    hotword.num_keywords = 1
+    hotword.audio_buffer = array('h')
+    hotword.has_found = False
+    return hotword
+
+
+class PorcupineUpdateTest(unittest.TestCase):
+    def test_unpack_samples(self):
+        chunk = struct.pack('hhh', 1, -2, 32767) + b'\x01'
+        self.assertEqual(list(unpack_samples(chunk)), [1, -2, 32767])
+
+    def test_frames_across_chunks(self):
+        porcupine = FakePorcupine()
+        hotword = create_porcupine(porcupine)
+        hotword.update(struct.pack('hhh', 1, 2, 3))
+        self.assertEqual(porcupine.frames, [])
+        hotword.update(struct.pack('hhhhhh', 4, 5, 6, 7, 8, 9))
+        self.assertEqual(porcupine.frames, [[1, 2, 3, 4], [5, 6, 7, 8]])
+        self.assertEqual(list(hotword.audio_buffer), [9])
+        self.assertFalse(hotword.found_wake_word(None))
+
+    def test_found_wake_word(self):
+        hotword = create_porcupine(FakePorcupine(keyword_frame=2))
+        hotword.update(struct.pack('h' * 12, *range(12)))
+        self.assertTrue(hotword.found_wake_word(None))
+        self.assertFalse(hotword.found_wake_word(None))
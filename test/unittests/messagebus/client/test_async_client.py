@@ -0,0 +1,137 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+from tornado.testing import bind_unused_port
+from tornado.web import Application
+
+from mycroft.messagebus.client.async_client import AsyncMessageBusClient
+from mycroft.messagebus.message import Message
+from mycroft.messagebus.service.event_handler import MessageBusEventHandler
+
+
+def ws_conf(port):
+    return {
+        'websocket': {
+            "host": "127.0.0.1",
+            "port": port,
+            "route": "/core",
+            "ssl": False
+        }
+    }
+
+
+class TestAsyncMessageBusClient(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        sock, self.port = bind_unused_port()
+        self.app = Application([('/core', MessageBusEventHandler)])
+        self.server = self.loop.run_until_complete(self._start_server(sock))
+
+    async def _start_server(self, sock):
+        from tornado.httpserver import HTTPServer
+        server = HTTPServer(self.app)
+        server.add_sockets([sock])
+        return server
+
+    def tearDown(self):
+        self.server.stop()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def create_client(self, **kwargs):
+        with patch('mycroft.configuration.Configuration.get',
+                   return_value=ws_conf(self.port)):
+            return AsyncMessageBusClient(**kwargs)
+
+    def run_test(self, coro):
+        self.loop.run_until_complete(asyncio.wait_for(coro, 5))
+
+    def test_emit_and_handlers(self):
+        async def test():
+            sender = self.create_client()
+            receiver = self.create_client()
+            received = []
+            done = asyncio.Event()
+
+            def sync_handler(message):
+                received.append(('sync', message.data['n']))
+
+            async def async_handler(message):
+                await asyncio.sleep(0)
+                received.append(('async', message.data['n']))
+                if message.data['n'] == 2:
+                    done.set()
+
+            receiver.on('test', sync_handler)
+            receiver.on('test', async_handler)
+            receiver.once('test', lambda m: received.append(('once', 0)))
+
+            # Messages are buffered until connected
+            sender.emit(Message('test', {'n': 1}))
+            sender.emit(Message('test', {'n': 2}))
+            receiver_task = asyncio.ensure_future(receiver.run_forever())
+            await receiver.connected_event.wait()
+            sender_task = asyncio.ensure_future(sender.run_forever())
+            await done.wait()
+            self.assertCountEqual(received, [('sync', 1), ('once', 0),
+                                             ('sync', 2), ('async', 1),
+                                             ('async', 2)])
+            await sender.close()
+            await receiver.close()
+            await asyncio.wait([sender_task, receiver_task])
+
+        self.run_test(test())
+
+    def test_wait_for_response(self):
+        async def test():
+            responder = self.create_client()
+            requester = self.create_client()
+
+            def respond(message):
+                responder.emit(message.response({'answer': 42}))
+
+            responder.on('question', respond)
+            tasks = [asyncio.ensure_future(responder.run_forever()),
+                     asyncio.ensure_future(requester.run_forever())]
+            await responder.connected_event.wait()
+            response = await requester.wait_for_response(Message('question'))
+            self.assertEqual(response.data, {'answer': 42})
+
+            response = await requester.wait_for_response(
+                Message('no_answer'), timeout=0.1)
+            self.assertIsNone(response)
+            self.assertEqual(requester.pending_requests.requests, {})
+
+            await responder.close()
+            await requester.close()
+            await asyncio.wait(tasks)
+
+        self.run_test(test())
+
+    def test_buffer_limit(self):
+        async def test():
+            client = self.create_client(max_buffered=2)
+            for n in range(3):
+                client.emit(Message('test', {'n': n}))
+            self.assertEqual([m.data['n'] for m in client.send_buffer],
+                             [1, 2])
+            self.assertEqual(client.dropped_messages, 1)
+
+        self.run_test(test())
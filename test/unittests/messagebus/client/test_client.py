@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from unittest.mock import patch
+import time
+from threading import Timer
+from unittest import TestCase
+from unittest.mock import Mock, patch
 
 from mycroft.messagebus.client import MessageBusClient
+from mycroft.messagebus.message import Message, supported_wire_formats
 
 WS_CONF = {
     'websocket': {
@@ -37,3 +41,98 @@ class TestMessageBusClient:
     def test_create_client(self, mock_conf):
         mc = MessageBusClient()
         assert mc.client.url == 'ws://testhost:1337/core'
+
+    @patch('mycroft.configuration.Configuration.get', return_value=WS_CONF)
+    def test_wire_format_negotiation(self, mock_conf):
+        mc = MessageBusClient(wire_format='msgpack')
+        mc.client = Mock()
+        mc.on_open()
+        if 'msgpack' in supported_wire_formats():
+            sent = Message.deserialize(mc.client.send.call_args[0][0])
+            assert sent.msg_type == 'mycroft.messagebus.format'
+            assert sent.data == {'format': 'msgpack'}
+        else:
+            mc.client.send.assert_not_called()
+        assert mc.wire_format == 'json'
+
+        response = Message('mycroft.messagebus.format.response',
+                           {'format': 'msgpack'})
+        mc.on_message(response.serialize())
+        assert mc.wire_format in supported_wire_formats()
+
+
+class TestWaitForResponse(TestCase):
+    @patch('mycroft.configuration.Configuration.get', return_value=WS_CONF)
+    def setUp(self, mock_conf):
+        self.bus = MessageBusClient()
+        self.bus.client = Mock()
+        self.bus.connected_event.set()
+        self.replies = {}
+
+        def reply(frame):
+            """Reply to requests, in reverse order for batched requests."""
+            message = Message.deserialize(frame)
+            response = self.replies.get(message.data.get('number'))
+            if response:
+                Timer(0.01 * (10 - message.data['number']),
+                      self.bus.on_message,
+                      [response(message).serialize()]).start()
+
+        self.bus.client.send.side_effect = reply
+
+    def test_response(self):
+        self.replies[1] = lambda msg: msg.response({'answer': 42})
+        start = time.monotonic()
+        response = self.bus.wait_for_response(
+            Message('question', {'number': 1}))
+        self.assertLess(time.monotonic() - start, 0.15)
+        self.assertEqual(response.data, {'answer': 42})
+        self.assertEqual(self.bus.pending_requests.requests, {})
+
+    def test_timeout(self):
+        response = self.bus.wait_for_response(
+            Message('question', {'number': 1}), timeout=0.1)
+        self.assertIsNone(response)
+        self.assertEqual(self.bus.pending_requests.requests, {})
+
+    def test_correlation(self):
+        """Replies for other requests of the same type are ignored."""
+        table = self.bus.pending_requests
+        first = table.add(Message('question'))
+        second = table.add(Message('question'))
+        reply = Message('question.response', {'answer': 'first'},
+                        {'request_id': first.request_id})
+        self.assertTrue(table.resolve(reply))
+        self.assertEqual(first.wait(0), reply)
+        self.assertFalse(second.done)
+
+    def test_reply_with_unknown_id(self):
+        """Replies carrying the id of an earlier request resolve all."""
+        def old_reply(msg):
+            reply = msg.response({'answer': 42})
+            reply.context['request_id'] = 'earlier request'
+            return reply
+
+        self.replies[1] = old_reply
+        response = self.bus.wait_for_response(
+            Message('question', {'number': 1}), timeout=0.2)
+        self.assertEqual(response.data, {'answer': 42})
+
+    def test_reply_without_context(self):
+        self.replies[1] = lambda msg: Message('answer', {'answer': 42})
+        response = self.bus.wait_for_response(
+            Message('question', {'number': 1}), 'answer')
+        self.assertEqual(response.data, {'answer': 42})
+
+    def test_wait_for_responses(self):
+        for number in (1, 2, 3):
+            self.replies[number] = (
+                lambda msg: msg.reply('answer',
+                                      {'number': msg.data['number']})
+            )
+        messages = [Message('question', {'number': n}) for n in (1, 2, 3, 4)]
+        responses = self.bus.wait_for_responses(messages, 'answer',
+                                                timeout=0.3)
+        self.assertEqual([r.data['number'] for r in responses[:3]],
+                         [1, 2, 3])
+        self.assertIsNone(responses[3])
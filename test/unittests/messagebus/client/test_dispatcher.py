@@ -0,0 +1,137 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from threading import Event, Lock
+from time import sleep
+from unittest import TestCase
+
+from mycroft.messagebus.client.dispatcher import Dispatcher
+
+
+def wait_for(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        sleep(0.01)
+    return False
+
+
+class TestDispatcher(TestCase):
+    def setUp(self):
+        self.release = Event()
+        self.lock = Lock()
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def blocking_handler(self, number):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.running, self.max_running)
+        self.release.wait()
+        with self.lock:
+            self.running -= 1
+            self.calls.append(number)
+
+    def test_run_handlers(self):
+        dispatcher = Dispatcher(threads=2)
+        self.release.set()
+        for n in range(5):
+            dispatcher.submit('test', self.blocking_handler, (n,))
+        self.assertTrue(wait_for(lambda: len(self.calls) == 5))
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['events']['test']['count'], 5)
+        self.assertEqual(stats['queue_length'], 0)
+
+    def test_event_limit(self):
+        dispatcher = Dispatcher(threads=4, limits={'slow': 1})
+        for n in range(3):
+            dispatcher.submit('slow', self.blocking_handler, (n,))
+        done = Event()
+        dispatcher.submit('fast', lambda: done.set())
+        # The fast handler isn't held back by the limited slow handlers
+        self.assertTrue(done.wait(1))
+        self.assertEqual(dispatcher.get_stats()['queue_length'], 2)
+        self.release.set()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 3))
+        self.assertEqual(self.max_running, 1)
+
+    def test_skill_limit(self):
+        dispatcher = Dispatcher(threads=4, max_per_skill=2)
+
+        def handler(number):
+            self.blocking_handler(number)
+        handler.skill_id = 'test.skill'
+
+        for n in range(4):
+            dispatcher.submit('event{}'.format(n), handler, (n,))
+        self.assertTrue(wait_for(lambda: self.running == 2))
+        sleep(0.05)
+        self.assertEqual(self.running, 2)
+        self.release.set()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 4))
+        self.assertEqual(self.max_running, 2)
+        stats = dispatcher.get_stats()
+        self.assertEqual(stats['skills']['test.skill']['count'], 4)
+        self.assertGreater(stats['skills']['test.skill']['wait_max'], 0)
+
+    def test_drop_newest(self):
+        dispatcher = Dispatcher(threads=1, max_queue=1,
+                                overflow='drop_newest')
+        dispatcher.submit('test', self.blocking_handler, (0,))
+        self.assertTrue(wait_for(lambda: self.running == 1))
+        self.assertTrue(dispatcher.submit('test', self.blocking_handler,
+                                          (1,)))
+        self.assertFalse(dispatcher.submit('test', self.blocking_handler,
+                                           (2,)))
+        self.release.set()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual(self.calls, [0, 1])
+        self.assertEqual(dispatcher.get_stats()['events']['test']['dropped'],
+                         1)
+
+    def test_drop_oldest(self):
+        dispatcher = Dispatcher(threads=1, max_queue=1,
+                                overflow='drop_oldest')
+        dispatcher.submit('test', self.blocking_handler, (0,))
+        self.assertTrue(wait_for(lambda: self.running == 1))
+        dispatcher.submit('test', self.blocking_handler, (1,))
+        dispatcher.submit('test', self.blocking_handler, (2,))
+        self.release.set()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual(self.calls, [0, 2])
+
+    def test_config_never_blocks(self):
+        dispatcher = Dispatcher.from_config({'threads': 1, 'max_queue': 1,
+                                             'overflow': 'block'})
+        self.assertEqual(dispatcher.overflow, 'drop_oldest')
+        dispatcher.submit('test', self.blocking_handler, (0,))
+        self.assertTrue(wait_for(lambda: self.running == 1))
+        dispatcher.submit('test', self.blocking_handler, (1,))
+        # Returns instead of waiting for the running handler
+        dispatcher.submit('test', self.blocking_handler, (2,))
+        self.release.set()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual(self.calls, [0, 2])
+
+        dispatcher = Dispatcher.from_config({'threads': 1,
+                                             'overflow': 'block'})
+        self.assertEqual(dispatcher.overflow, 'block')
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            Dispatcher(threads=1, overflow='explode')
@@ -0,0 +1,142 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from unittest import TestCase, mock, skipIf
+
+from mycroft.messagebus import Message
+from mycroft.messagebus.message import msgpack
+from mycroft.messagebus.service import event_handler
+from mycroft.messagebus.service.subscriptions import SubscriptionIndex
+
+
+class TestSubscriptionIndex(TestCase):
+    def setUp(self):
+        self.index = SubscriptionIndex()
+        self.index.add('cli')
+        self.index.add('gui')
+        self.index.add('audio')
+
+    def test_broadcast_by_default(self):
+        self.assertEqual(self.index.match('speak'), {'cli', 'gui', 'audio'})
+
+    def test_exact_subscription(self):
+        self.index.subscribe('audio', ['speak', 'mycroft.stop'])
+        self.assertEqual(self.index.match('speak'), {'cli', 'gui', 'audio'})
+        self.assertEqual(self.index.match('speak.response'), {'cli', 'gui'})
+        self.assertEqual(self.index.match('mycroft.stop'),
+                         {'cli', 'gui', 'audio'})
+
+    def test_prefix_subscription(self):
+        self.index.subscribe('gui', ['gui.*', 'mycroft.mic.*'])
+        self.index.subscribe('audio', ['mycroft.*'])
+        self.index.subscribe('cli', ['speak'])
+        self.assertEqual(self.index.match('gui.value.set'), {'gui'})
+        self.assertEqual(self.index.match('mycroft.mic.listen'),
+                         {'gui', 'audio'})
+        self.assertEqual(self.index.match('mycroft.stop'), {'audio'})
+        self.assertEqual(self.index.match('mycroft'), set())
+        self.assertEqual(self.index.match('speak'), {'cli'})
+
+    def test_wildcard_matches_everything(self):
+        self.index.subscribe('cli', ['*'])
+        self.index.subscribe('gui', ['gui.*'])
+        self.assertEqual(self.index.match('speak'), {'cli', 'audio'})
+
+    def test_unsubscribe(self):
+        self.index.subscribe('gui', ['gui.*', 'speak'])
+        self.index.unsubscribe('gui', ['gui.*'])
+        self.assertEqual(self.index.match('gui.value.set'), {'cli', 'audio'})
+        self.assertEqual(self.index.match('speak'), {'cli', 'gui', 'audio'})
+        self.assertEqual(self.index.prefixes, {})
+
+        # Removing the last subscription restores broadcast
+        self.index.unsubscribe('gui', ['speak'])
+        self.assertEqual(self.index.match('gui.value.set'),
+                         {'cli', 'gui', 'audio'})
+        self.assertEqual(self.index.exact, {})
+
+    def test_remove(self):
+        self.index.subscribe('gui', ['gui.*'])
+        self.index.remove('gui')
+        self.index.remove('cli')
+        self.assertEqual(self.index.match('gui.value.set'), {'audio'})
+        self.assertEqual(self.index.subscriptions, {})
+
+
+@mock.patch('mycroft.messagebus.service.event_handler.WebSocketHandler')
+class TestMessageBusEventHandlerRouting(TestCase):
+    def setUp(self):
+        self.subscriptions = SubscriptionIndex()
+        patcher = mock.patch.object(event_handler, 'subscriptions',
+                                    self.subscriptions)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_handler(self):
+        handler = mock.Mock()
+        handler.on_message = (
+            lambda msg: event_handler.MessageBusEventHandler.on_message(
+                handler, msg)
+        )
+        handler.emitter = mock.Mock()
+        handler.wire_format = 'json'
+        handler.forward = (
+            lambda *args: event_handler.MessageBusEventHandler.forward(
+                handler, *args)
+        )
+        self.subscriptions.add(handler)
+        return handler
+
+    def test_routing(self, _):
+        skills = self.create_handler()
+        gui = self.create_handler()
+        gui.on_message(Message('mycroft.messagebus.subscribe',
+                               {'msg_types': ['gui.*']}).serialize())
+
+        gui_msg = Message('gui.value.set').serialize()
+        skills.on_message(gui_msg)
+        skills.write_message.assert_called_once_with(gui_msg)
+        gui.write_message.assert_called_once_with(gui_msg)
+
+        skills.write_message.reset_mock()
+        gui.write_message.reset_mock()
+        speak_msg = Message('speak').serialize()
+        skills.on_message(speak_msg)
+        skills.write_message.assert_called_once_with(speak_msg)
+        gui.write_message.assert_not_called()
+
+        gui.on_message(Message('mycroft.messagebus.unsubscribe').serialize())
+        skills.on_message(speak_msg)
+        gui.write_message.assert_called_once_with(speak_msg)
+
+    @skipIf(msgpack is None, 'msgpack not installed')
+    def test_mixed_wire_formats(self, _):
+        json_client = self.create_handler()
+        binary_client = self.create_handler()
+        binary_client.wire_format = 'msgpack'
+
+        message = Message('speak', {'utterance': 'hello'})
+        binary_client.on_message(message.serialize('msgpack'))
+        json_client.write_message.assert_called_once_with(
+            message.serialize())
+        binary_client.write_message.assert_called_once_with(
+            message.serialize('msgpack'), binary=True)
+
+        json_client.write_message.reset_mock()
+        binary_client.write_message.reset_mock()
+        json_client.on_message(message.serialize())
+        json_client.write_message.assert_called_once_with(
+            message.serialize())
+        binary_client.write_message.assert_called_once_with(
+            message.serialize('msgpack'), binary=True)
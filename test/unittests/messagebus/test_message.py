@@ -0,0 +1,44 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+from unittest import TestCase, skipIf
+
+from mycroft.messagebus.message import Message, msgpack
+
+
+class TestMessageSerialization(TestCase):
+    def setUp(self):
+        self.message = Message('speak', {'utterance': 'hello world'},
+                               {'source': 'skills'})
+
+    def test_json(self):
+        serialized = self.message.serialize()
+        self.assertEqual(json.loads(serialized),
+                         {'type': 'speak',
+                          'data': {'utterance': 'hello world'},
+                          'context': {'source': 'skills'}})
+        deserialized = Message.deserialize(serialized)
+        self.assertEqual(deserialized.msg_type, 'speak')
+        self.assertEqual(deserialized.data, self.message.data)
+        self.assertEqual(deserialized.context, self.message.context)
+
+    @skipIf(msgpack is None, 'msgpack not installed')
+    def test_msgpack(self):
+        serialized = self.message.serialize('msgpack')
+        self.assertIsInstance(serialized, bytes)
+        deserialized = Message.deserialize(serialized)
+        self.assertEqual(deserialized.msg_type, 'speak')
+        self.assertEqual(deserialized.data, self.message.data)
+        self.assertEqual(deserialized.context, self.message.context)
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from adapt.engine import IntentDeterminationEngine
+from adapt.intent import IntentBuilder
+
+from mycroft.skills.adapt_registry import AdaptRegistry
+
+
+def intent(name, keyword):
+    return IntentBuilder(name).require(keyword).build()
+
+
+def best_intent(engine, utterance):
+    intents = list(engine.determine_intent(utterance, 100))
+    return intents[0]['intent_type'] if intents else None
+
+
+class TestAdaptRegistry(TestCase):
+    def setUp(self):
+        self.engine = IntentDeterminationEngine()
+        self.registry = AdaptRegistry(self.engine)
+
+    def register_skill(self, skill_id, word):
+        keyword = skill_id.upper() + word.title()
+        self.registry.register_vocab({'start': word, 'end': keyword},
+                                     skill_id)
+        name = skill_id + ':' + word
+        parser = intent(name, keyword)
+        self.registry.register_intent(parser.__dict__, parser, skill_id)
+
+    def test_register_and_match(self):
+        self.register_skill('a', 'hello')
+        self.assertEqual(best_intent(self.engine, 'hello'), 'a:hello')
+        self.assertEqual(self.registry.intent_manifest(), ['a:hello'])
+        self.assertEqual(self.registry.intent_manifest('a'), ['a:hello'])
+        self.assertEqual(self.registry.vocab_manifest('a'),
+                         [{'start': 'hello', 'end': 'AHello'}])
+
+    def test_duplicates_ignored(self):
+        self.register_skill('a', 'hello')
+        self.register_skill('a', 'hello')
+        self.assertFalse(
+            self.registry.register_vocab({'start': 'hello',
+                                          'end': 'AHello'}, 'a'))
+        self.assertEqual(len(self.engine.intent_parsers), 1)
+        self.assertEqual(len(self.registry.vocab_manifest()), 1)
+
+    def test_detach_skill(self):
+        self.register_skill('a', 'hello')
+        self.register_skill('b', 'goodbye')
+        self.registry.register_vocab({'regex': '(?P<AName>.*) rules'}, 'a')
+
+        self.registry.detach_skill('a:')
+        self.assertIsNone(best_intent(self.engine, 'hello'))
+        self.assertEqual(best_intent(self.engine, 'goodbye'), 'b:goodbye')
+        self.assertEqual(self.registry.intent_manifest(), ['b:goodbye'])
+        self.assertEqual(self.registry.vocab_manifest('a'), [])
+        self.assertEqual(self.engine.regular_expressions_entities, [])
+        self.assertEqual(list(self.engine.trie.lookup('hello')), [])
+
+    def test_reload_skill(self):
+        self.register_skill('a', 'hello')
+        self.registry.detach_skill('a:')
+        self.register_skill('a', 'hello')
+        self.assertEqual(best_intent(self.engine, 'hello'), 'a:hello')
+        self.assertEqual(len(self.engine.intent_parsers), 1)
+        self.assertEqual(len(list(self.engine.trie.lookup('hello'))), 1)
+
+    def test_shared_vocab_kept_until_last_skill_detached(self):
+        self.registry.register_vocab({'start': 'hello', 'end': 'Shared'},
+                                     'a')
+        self.registry.register_vocab({'start': 'hello', 'end': 'Shared'},
+                                     'b')
+        self.registry.detach_skill('a')
+        self.assertEqual(len(list(self.engine.trie.lookup('hello'))), 1)
+        self.registry.detach_skill('b')
+        self.assertEqual(list(self.engine.trie.lookup('hello')), [])
+
+    def test_detach_intent(self):
+        self.register_skill('a', 'hello')
+        self.register_skill('a', 'goodbye')
+        self.registry.detach_intent('a:hello')
+        self.assertIsNone(best_intent(self.engine, 'hello'))
+        self.assertEqual(self.registry.intent_manifest('a'), ['a:goodbye'])
+
+    def test_replace_intent(self):
+        self.register_skill('a', 'hello')
+        self.registry.register_vocab({'start': 'hi', 'end': 'Greeting'}, 'a')
+        parser = intent('a:hello', 'Greeting')
+        self.registry.register_intent(parser.__dict__, parser)
+        self.assertEqual(len(self.engine.intent_parsers), 1)
+        self.assertEqual(best_intent(self.engine, 'hi'), 'a:hello')
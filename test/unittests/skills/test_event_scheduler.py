@@ -4,6 +4,10 @@
 
 import unittest
 import time
+from os.path import join
+from queue import Queue
+from shutil import rmtree
+from tempfile import mkdtemp
 
 from unittest.mock import MagicMock, patch
 from mycroft.messagebus.client.threaded_event_emitter import (
@@ -122,3 +126,65 @@ class TestEventSchedulerInterface(unittest.TestCase):
         # bus emitter
         self.assertTrue(len(bus.wrappers) == 0)
         self.assertTrue(len(bus._events['id:f']) == 0)
+
+
+class TestEventSchedulerTiming(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.bus = MagicMock()
+        self.emitted = Queue()
+        self.bus.emit.side_effect = lambda m: self.emitted.put(
+            (m, time.time()))
+        self.scheduler = EventScheduler(self.bus,
+                                        join(self.tmp_dir, 'schedule.json'))
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+        rmtree(self.tmp_dir)
+
+    def test_fires_on_time(self):
+        due = time.time() + 0.2
+        self.scheduler.schedule_event('test', due)
+        message, fired = self.emitted.get(timeout=2)
+        self.assertEqual(message.msg_type, 'test')
+        self.assertLess(abs(fired - due), 0.1)
+        self.assertNotIn('test', self.scheduler.events)
+
+    def test_early_event_wakes_scheduler(self):
+        self.scheduler.schedule_event('late', time.time() + 30)
+        time.sleep(0.1)  # Let the scheduler go to sleep
+        self.scheduler.schedule_event('early', time.time() + 0.1)
+        message, _ = self.emitted.get(timeout=2)
+        self.assertEqual(message.msg_type, 'early')
+
+    def test_order(self):
+        now = time.time()
+        self.scheduler.schedule_event('second', now + 0.2)
+        self.scheduler.schedule_event('first', now + 0.1)
+        self.assertEqual(self.emitted.get(timeout=2)[0].msg_type, 'first')
+        self.assertEqual(self.emitted.get(timeout=2)[0].msg_type, 'second')
+
+    def test_removed_event_not_fired(self):
+        now = time.time()
+        self.scheduler.schedule_event('removed', now + 0.1)
+        self.scheduler.schedule_event('kept', now + 0.2)
+        self.scheduler.remove_event('removed')
+        self.assertEqual(self.emitted.get(timeout=2)[0].msg_type, 'kept')
+        self.assertTrue(self.emitted.empty())
+
+    def test_updated_event(self):
+        self.scheduler.schedule_event('test', time.time() + 0.1,
+                                      data={'value': 1})
+        self.scheduler.update_event('test', {'value': 2})
+        message, _ = self.emitted.get(timeout=2)
+        self.assertEqual(message.data, {'value': 2})
+        time.sleep(0.2)
+        self.assertTrue(self.emitted.empty())
+
+    def test_repeating_event(self):
+        self.scheduler.schedule_event('repeat', time.time() + 0.1, 0.1)
+        self.emitted.get(timeout=2)
+        self.emitted.get(timeout=2)
+        self.assertIn('repeat', self.scheduler.events)
+        self.assertEqual(len(self.scheduler.events['repeat']), 1)
+        self.scheduler.remove_event('repeat')
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+from mycroft.skills.intent_cache import IntentCache
+
+
+class TestIntentCache(TestCase):
+    def test_hit_and_miss(self):
+        cache = IntentCache(10)
+        self.assertIsNone(cache.get('stop'))
+        cache.put('stop', {'intent_type': 'stop'})
+        self.assertEqual(cache.get('stop'), {'intent_type': 'stop'})
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_returns_copies(self):
+        cache = IntentCache(10)
+        intent = {'intent_type': 'stop'}
+        cache.put('stop', intent)
+        intent['utterance'] = 'stop'
+        cached = cache.get('stop')
+        cached['confidence'] = 1.0
+        self.assertEqual(cache.get('stop'), {'intent_type': 'stop'})
+
+    def test_lru_eviction(self):
+        cache = IntentCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_generation_change_clears(self):
+        cache = IntentCache(10)
+        cache.check_generation(1)
+        cache.put('a', 1)
+        cache.check_generation(1)
+        self.assertEqual(cache.get('a'), 1)
+        cache.check_generation(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['invalidations'], 1)
+
+    def test_disabled(self):
+        cache = IntentCache(0)
+        self.assertFalse(cache.enabled)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
@@ -15,6 +15,7 @@
 from unittest import TestCase, mock
 
 from mycroft.messagebus import Message
+from mycroft.messagebus.client.pending_requests import PendingRequest
 from mycroft.skills.intent_service import ContextManager, IntentService
 
 
@@ -176,3 +177,137 @@ class ConversationTest(TestCase):
         self.assertTrue(check_converse_request(atari_message, 'atari_skill'))
         first_active_skill = self.intent_service.active_skills[0][0]
         self.assertEqual(first_active_skill, 'atari_skill')
+
+
+class ParallelConversationTest(TestCase):
+    def setUp(self):
+        bus = mock.Mock()
+        self.intent_service = IntentService(bus)
+        self.intent_service.parallel_converse = True
+        self.intent_service.converse_response_timeout = 0.1
+        self.intent_service.add_active_skill('atari_skill')
+        self.intent_service.add_active_skill('amiga_skill')
+        self.intent_service.add_active_skill('c64_skill')
+        self.utterance_msg = Message('recognizer_loop:utterance',
+                                     data={'lang': 'en-US',
+                                           'utterances': ['hello']})
+
+    def respond(self, results):
+        """Setup converse responses.
+
+        Arguments:
+            results (dict): skill_id: result, skills missing from the dict
+                            won't respond.
+        """
+        self.requests = []
+
+        def send_requests(messages, reply_type):
+            for message in messages:
+                request = PendingRequest(reply_type)
+                skill_id = message.data['skill_id']
+                if skill_id in results:
+                    request.resolve(message.reply(reply_type, {
+                        'skill_id': skill_id,
+                        'result': results[skill_id]}))
+                self.requests.append(request)
+            return self.requests
+
+        self.intent_service.bus.send_requests.side_effect = send_requests
+
+    def converse(self):
+        return self.intent_service._converse(['hello'], 'en-US',
+                                             self.utterance_msg)
+
+    def test_priority(self):
+        """The most recently active skill wins."""
+        self.respond({'c64_skill': False, 'amiga_skill': True,
+                      'atari_skill': True})
+        self.assertTrue(self.converse())
+        self.intent_service.bus.wait_for_response.assert_not_called()
+
+        # Check that all skills were asked at once
+        messages = self.intent_service.bus.send_requests.call_args[0][0]
+        self.assertEqual([m.data['skill_id'] for m in messages],
+                         ['c64_skill', 'amiga_skill', 'atari_skill'])
+        self.assertEqual(self.intent_service.active_skills[0][0],
+                         'amiga_skill')
+
+    def test_timeout(self):
+        """A skill not responding doesn't stop others from handling."""
+        self.respond({'amiga_skill': False, 'atari_skill': True})
+        self.assertTrue(self.converse())
+        self.assertEqual(self.intent_service.active_skills[0][0],
+                         'atari_skill')
+
+        timing = self.intent_service.bus.emit.call_args[0][0]
+        self.assertEqual(timing.msg_type, 'intent.service.converse.timing')
+        skills = timing.data['skills']
+        self.assertEqual([s['skill_id'] for s in skills],
+                         ['c64_skill', 'amiga_skill', 'atari_skill'])
+        self.assertIsNone(skills[0]['duration'])
+        self.assertIsNotNone(skills[1]['duration'])
+
+    def test_not_handled(self):
+        self.respond({'c64_skill': False, 'amiga_skill': False})
+        self.assertFalse(self.converse())
+        self.assertEqual(self.intent_service.active_skills[0][0],
+                         'c64_skill')
+
+
+class IntentCacheTest(TestCase):
+    def setUp(self):
+        self.intent_service = IntentService(mock.Mock())
+        self.intent_service.registry.register_vocab(
+            {'start': 'stop', 'end': 'StopKeyword'}, 'stop_skill')
+        adapt_patch = mock.patch.object(
+            self.intent_service, '_adapt_intent_match',
+            side_effect=lambda utts, *_: {'intent_type': 'stop_skill:stop',
+                                          'confidence': 1.0,
+                                          'utterance': utts[0]})
+        self.adapt_match = adapt_patch.start()
+        padatious_patch = mock.patch(
+            'mycroft.skills.intent_service.PadatiousService')
+        self.padatious = padatious_patch.start()
+        self.padatious.instance.calc_intent.return_value = None
+        self.padatious.instance.generation = 0
+        self.addCleanup(mock.patch.stopall)
+
+    def match(self, utterance):
+        return self.intent_service._match_intents(
+            [utterance], [utterance.lower()], [utterance], 'en-us')
+
+    def test_cached_match(self):
+        intent, _ = self.match('stop')
+        self.assertEqual(intent['intent_type'], 'stop_skill:stop')
+        intent['utterance'] = 'modified by handler'
+        # Second lookup is served from the cache
+        intent, _ = self.match('stop')
+        self.assertEqual(self.adapt_match.call_count, 1)
+        self.assertEqual(intent['utterance'], 'stop')
+        # Same normalized utterance, the raw utterance is kept
+        intent, _ = self.match('Stop')
+        self.assertEqual(self.adapt_match.call_count, 1)
+        self.assertEqual(intent['utterance'], 'Stop')
+        stats = self.intent_service.intent_cache.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_invalidated_on_detach(self):
+        self.match('stop')
+        self.intent_service.handle_detach_skill(
+            Message('detach_skill', {'skill_id': 'stop_skill:'}))
+        self.match('stop')
+        self.assertEqual(self.adapt_match.call_count, 2)
+
+    def test_invalidated_by_padatious(self):
+        self.match('stop')
+        self.padatious.instance.generation = 1
+        self.match('stop')
+        self.assertEqual(self.adapt_match.call_count, 2)
+
+    def test_invalidated_by_context(self):
+        self.match('stop')
+        self.intent_service.handle_add_context(
+            Message('add_context', {'context': 'Ctx', 'word': 'x'}))
+        self.match('stop')
+        self.assertEqual(self.adapt_match.call_count, 2)
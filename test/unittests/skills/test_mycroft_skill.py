@@ -25,7 +25,8 @@ import json
 
 from mycroft.configuration import Configuration
 from mycroft.messagebus.message import Message
-from mycroft.skills.skill_data import (load_regex_from_file, load_regex,
+from mycroft.skills.skill_data import (compile_vocabulary,
+                                       load_regex_from_file, load_regex,
                                        load_vocabulary, read_vocab_file)
 from mycroft.skills.core import MycroftSkill, resting_screen_handler
 from mycroft.skills.intent_service import open_intent_envelope
@@ -552,6 +553,37 @@ class TestMycroftSkill(unittest.TestCase):
         self.assertFalse(s.voc_match("My hovercraft is full of eels",
                                      "turn_off_test"))
 
+    def test_compile_vocabulary(self):
+        matcher = compile_vocabulary(['off', 'turn off', 'o.k'])
+        self.assertTrue(matcher.search('please turn off the lights'))
+        self.assertFalse(matcher.search('offset'))
+        # Terms are matched literally
+        self.assertTrue(matcher.search('is that o.k with you'))
+        self.assertFalse(matcher.search('is that oxk with you'))
+        self.assertIsNone(compile_vocabulary([]))
+
+    def test_find_resource_index(self):
+        s = SimpleSkill1()
+        s.root_dir = abspath(join(dirname(__file__), 'translate',
+                                  'in-dialog'))
+        self.assertEqual(s.find_resource('test.template', 'dialog'),
+                         join(s.root_dir, 'dialog', 'en-us', 'test.template'))
+
+        # The index is rebuilt for the new skill directory
+        s.root_dir = abspath(join(dirname(__file__), 'translate',
+                                  'in-locale'))
+        path = s.find_resource('good_things.list', 'dialog')
+        self.assertEqual(path, join(s.root_dir, 'locale', 'en-us',
+                                    'good_things.list'))
+        # Lookups don't touch the file system once the index is built
+        with patch('mycroft.skills.skill_data.scandir') as mock_scandir, \
+                patch('mycroft.skills.skill_data.walk') as mock_walk:
+            self.assertEqual(s.find_resource('good_things.list', 'dialog'),
+                             path)
+            self.assertIsNone(s.find_resource('missing.list', 'dialog'))
+            self.assertFalse(mock_scandir.called)
+            self.assertFalse(mock_walk.called)
+
     def test_translate_locations(self):
         """Assert that the a translatable list can be loaded from dialog and
         locale.
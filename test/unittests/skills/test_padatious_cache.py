@@ -0,0 +1,74 @@
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from mycroft.skills.padatious_cache import TrainingCache, content_hash
+
+
+class TestTrainingCache(TestCase):
+    def setUp(self):
+        self.cache_dir = mkdtemp()
+        self.intent_file = join(self.cache_dir, 'hello.intent')
+        with open(self.intent_file, 'w') as f:
+            f.write('hello\nhi')
+
+    def tearDown(self):
+        rmtree(self.cache_dir)
+
+    def test_content_hash(self):
+        key = content_hash(self.intent_file, '0.4.6')
+        self.assertEqual(key, content_hash(self.intent_file, '0.4.6'))
+        self.assertNotEqual(key, content_hash(self.intent_file, '0.4.7'))
+        with open(self.intent_file, 'a') as f:
+            f.write('\nhey')
+        self.assertNotEqual(key, content_hash(self.intent_file, '0.4.6'))
+
+    def test_train_records_hash(self):
+        cache = TrainingCache(self.cache_dir, '0.4.6')
+        # Unknown files are left to the Padatious hash check
+        self.assertTrue(cache.check('skill:hello.intent', self.intent_file))
+
+        container = MagicMock(name='container')
+        result = cache.train(container, single_thread=True)
+        container.train.assert_called_once_with(single_thread=True,
+                                                timeout=20)
+        self.assertEqual(result['retrained'], [])
+        self.assertGreaterEqual(result['duration'], 0)
+
+        # A new cache instance reads the saved index
+        cache = TrainingCache(self.cache_dir, '0.4.6')
+        self.assertEqual(cache.index['skill:hello.intent']['hash'],
+                         content_hash(self.intent_file, '0.4.6'))
+        self.assertTrue(cache.check('skill:hello.intent', self.intent_file))
+
+    def test_changed_file_needs_training(self):
+        cache = TrainingCache(self.cache_dir, '0.4.6')
+        cache.index['skill:hello.intent'] = {
+            'hash': content_hash(self.intent_file, '0.4.6')
+        }
+        with open(self.intent_file, 'a') as f:
+            f.write('\nhey')
+        self.assertFalse(cache.check('skill:hello.intent', self.intent_file))
+        result = cache.train(MagicMock(name='container'))
+        self.assertEqual(result['retrained'], ['skill:hello.intent'])
+        self.assertTrue(cache.check('skill:hello.intent', self.intent_file))
+
+    def test_new_version_needs_training(self):
+        cache = TrainingCache(self.cache_dir, '0.4.7')
+        cache.index['skill:hello.intent'] = {
+            'hash': content_hash(self.intent_file, '0.4.6')
+        }
+        self.assertFalse(cache.check('skill:hello.intent', self.intent_file))
+
+    def test_index_pruned(self):
+        cache = TrainingCache(self.cache_dir, '0.4.6')
+        cache.index['removed:old.intent'] = {'hash': 'abc'}
+        cache.check('skill:hello.intent', self.intent_file)
+        cache.check('skill:bye.intent', self.intent_file)
+        cache.forget('skill:bye.intent')
+        cache.train(MagicMock(name='container'))
+
+        cache = TrainingCache(self.cache_dir, '0.4.6')
+        self.assertEqual(list(cache.index), ['skill:hello.intent'])
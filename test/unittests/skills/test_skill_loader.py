@@ -13,9 +13,12 @@
 # limitations under the License.
 #
 """Unit tests for the SkillLoader class."""
+import json
+import os
 from time import time
 from unittest.mock import call, MagicMock, Mock, patch
 
+from mycroft.messagebus import Message
 from mycroft.skills.skill_loader import _get_last_modified_time, SkillLoader
 from ..base import MycroftUnitTestBase
 
@@ -115,8 +118,10 @@ class TestSkillLoader(MycroftUnitTestBase):
         self.assertListEqual(log_messages, self.log_mock.method_calls)
 
     def test_skill_load(self):
-        with patch(self.mock_package + 'time') as time_mock:
+        with patch(self.mock_package + 'time') as time_mock, \
+                patch(self.mock_package + 'monotonic') as monotonic_mock:
             time_mock.return_value = 100
+            monotonic_mock.side_effect = [10, 12.5]
             with patch(self.mock_package + 'SettingsMetaUploader'):
                 self.loader.load()
 
@@ -127,6 +132,9 @@ class TestSkillLoader(MycroftUnitTestBase):
             ['mycroft.skills.loaded'],
             self.message_bus_mock.message_types
         )
+        self.assertEqual(2.5, self.loader.load_time)
+        self.assertEqual(
+            2.5, self.message_bus_mock.message_data[0]['load_time'])
         log_messages = [
             call.info('ATTEMPTING TO LOAD SKILL: test_skill'),
             call.info('Skill test_skill loaded successfully')
@@ -153,3 +161,80 @@ class TestSkillLoader(MycroftUnitTestBase):
             call.error('Skill test_skill failed to load')
         ]
         self.assertListEqual(log_messages, self.log_mock.method_calls)
+
+
+class TestLazySkillLoader(MycroftUnitTestBase):
+    mock_package = 'mycroft.skills.skill_loader.'
+
+    def setUp(self):
+        super().setUp()
+        skill_directory = self.temp_dir.joinpath('test_skill')
+        skill_directory.mkdir()
+        skill_directory.joinpath('__init__.py').touch()
+        self.message_bus_mock.remove = Mock()
+        self.loader = SkillLoader(self.message_bus_mock, str(skill_directory),
+                                  lazy=True)
+        self.loader._load_skill_source = Mock()
+        self.loader._check_for_first_run = Mock()
+        self.skill_module = self.loader._load_skill_source.return_value
+        self.skill_module.create_skill.return_value.name = 'test_skill'
+
+    def _record_intents(self):
+        """Have the mock skill register an intent when it's bound."""
+        def bind(bus):
+            bus.emit(Message('register_intent', {'name': 'test_skill:Hello'}))
+            bus.on('test_skill:Hello', Mock())
+        self.skill_module.create_skill.return_value.bind.side_effect = bind
+
+    def test_manifest_saved(self):
+        self._record_intents()
+        self.assertTrue(self.loader.load())
+        self.assertTrue(self.loader.loaded)
+        self.assertFalse(self.loader.deferred)
+        with open(self.loader.manifest_file) as f:
+            manifest = json.load(f)
+        self.assertTrue(manifest['deferrable'])
+        self.assertEqual(['test_skill:Hello'], manifest['intents'])
+
+    def test_deferred_load(self):
+        self._record_intents()
+        self.loader.load()
+        self.skill_module.create_skill.reset_mock()
+        self.message_bus_mock.message_types = []
+
+        # Defer once idle, registering the intents without the skill
+        self.assertTrue(self.loader.defer_if_idle(0))
+        self.assertTrue(self.loader.deferred)
+        self.assertFalse(self.loader.loaded)
+        self.assertIsNone(self.loader.instance)
+        self.assertIn('register_intent', self.message_bus_mock.message_types)
+        self.assertFalse(self.skill_module.create_skill.called)
+
+        # The skill is loaded and handed the intent when it's triggered
+        self.message_bus_mock.message_types = []
+        with patch(self.mock_package + 'create_daemon') as daemon_mock:
+            daemon_mock.side_effect = lambda target, args: target(*args)
+            self.loader._handle_intent(Message('test_skill:Hello'))
+        self.assertTrue(self.loader.loaded)
+        self.assertFalse(self.loader.deferred)
+        self.assertEqual('detach_skill',
+                         self.message_bus_mock.message_types[0])
+        self.assertEqual('test_skill:Hello',
+                         self.message_bus_mock.message_types[-1])
+
+    def test_not_idle(self):
+        self._record_intents()
+        self.loader.load()
+        self.assertFalse(self.loader.defer_if_idle(ONE_MINUTE))
+        self.assertTrue(self.loader.loaded)
+
+    def test_missing_manifest_not_deferred(self):
+        self._record_intents()
+        self.loader.load()
+        instance = self.loader.instance
+        os.remove(self.loader.manifest_file)
+        self.assertFalse(self.loader.defer_if_idle(0))
+        self.assertTrue(self.loader.loaded)
+        self.assertFalse(self.loader.deferred)
+        self.assertIs(instance, self.loader.instance)
+        self.assertFalse(instance.default_shutdown.called)
@@ -13,11 +13,14 @@
 # limitations under the License.
 #
 from os import path
+from threading import Barrier, Event
+from time import sleep
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 from mycroft.skills.skill_loader import SkillLoader
 from mycroft.skills.skill_manager import SkillManager, UploadQueue
+from mycroft.skills.skill_watcher import SkillChanges
 from ..base import MycroftUnitTestBase
 from ..mocks import mock_msm
 
@@ -117,6 +120,7 @@ class TestSkillManager(MycroftUnitTestBase):
             'mycroft.paired',
             'mycroft.skills.is_alive',
             'mycroft.skills.all_loaded',
+            'skillmanager.watcher.stats.get',
             'mycroft.skills.settings.update'
         ]
         self.assertListEqual(
@@ -362,6 +366,75 @@ class TestSkillManager(MycroftUnitTestBase):
                 self.skill_manager.skill_loaders[str(self.skill_dir)]
             )
 
+    def create_loader_mocks(self, load):
+        """Patch SkillLoader with loaders calling load(skill_dir)."""
+        def create_loader(bus, skill_dir, lazy=False):
+            loader = Mock(spec=SkillLoader)
+            loader.skill_directory = skill_dir
+            loader.load.side_effect = lambda: load(skill_dir)
+            return loader
+
+        loader_patch = patch(self.mock_package + 'SkillLoader',
+                             side_effect=create_loader)
+        loader_patch.start()
+        self.addCleanup(loader_patch.stop)
+        self.skill_manager.skill_loaders = {}
+
+    def test_load_skills_parallel(self):
+        self.skill_manager.config['skills']['loading'] = dict(parallel=True,
+                                                              workers=2)
+        # Both skills must be loading at the same time to pass the barrier
+        barrier = Barrier(2, timeout=2)
+        registered = []
+
+        def load_skill(skill_dir):
+            registered.append(sorted(self.skill_manager.skill_loaders))
+            barrier.wait()
+            if skill_dir == 'broken':
+                raise ValueError
+            return True
+
+        self.create_loader_mocks(load_skill)
+        loaders = self.skill_manager._load_skills(['working', 'broken'])
+        self.assertEqual(['working'],
+                         [loader.skill_directory for loader in loaders])
+        # All loaders are registered before any skill is loaded
+        self.assertEqual([['broken', 'working']] * 2, registered)
+
+    def test_load_skills_timeout(self):
+        self.skill_manager.config['skills']['loading'] = dict(
+            parallel=True, workers=2, timeout=0.1)
+        release = Event()
+
+        def load_skill(skill_dir):
+            if skill_dir == 'slow':
+                release.wait(2)
+            return True
+
+        self.create_loader_mocks(load_skill)
+        self.skill_manager.upload_queue = Mock()
+        loaders = self.skill_manager._load_skills(['fast', 'slow'])
+        self.assertEqual(['fast'],
+                         [loader.skill_directory for loader in loaders])
+        self.assertIn('slow', self.skill_manager.skill_loaders)
+        self.assertFalse(self.skill_manager.upload_queue.put.called)
+
+        # The late skill queues its settings meta once loaded
+        release.set()
+        for _ in range(100):
+            if self.skill_manager.upload_queue.put.called:
+                break
+            sleep(0.02)
+        self.skill_manager.upload_queue.put.assert_called_once_with(
+            self.skill_manager.skill_loaders['slow'])
+
+    def test_load_skills_serial(self):
+        self.skill_manager._load_skill = Mock(side_effect=[None, 'loader'])
+        loaders = self.skill_manager._load_skills(['broken', 'working'])
+        self.assertEqual(['loader'], loaders)
+        self.assertEqual([call('broken'), call('working')],
+                         self.skill_manager._load_skill.call_args_list)
+
     def test_reload_modified(self):
         self.skill_dir.mkdir(parents=True)
         self.skill_dir.joinpath('__init__.py').touch()
@@ -373,6 +446,25 @@ class TestSkillManager(MycroftUnitTestBase):
             self.skill_manager.skill_loaders[str(self.skill_dir)]
         )
 
+    def test_handle_skill_changes(self):
+        self.skill_manager.skill_watcher = Mock()
+        self.skill_manager.skill_watcher.get_changes.return_value = (
+            SkillChanges({str(self.skill_dir): 100.0}, False))
+        self.skill_manager._load_new_skills = Mock()
+        self.skill_loader_mock.reload_needed.return_value = True
+        self.skill_manager._handle_skill_changes()
+        self.skill_loader_mock.reload_needed.assert_called_once_with(100.0)
+        self.skill_loader_mock.reload.assert_called_once_with()
+        # Only changed skills are checked
+        self.assertFalse(self.skill_manager._load_new_skills.called)
+
+        # Skills added or removed
+        self.skill_manager.skill_watcher.get_changes.return_value = (
+            SkillChanges({}, True))
+        self.skill_manager._handle_skill_changes()
+        self.assertTrue(self.skill_manager._load_new_skills.called)
+        self.skill_loader_mock.unload.assert_called_once_with()
+
     def test_update_skills(self):
         updater_mock = Mock()
         updater_mock.update_skills = Mock()
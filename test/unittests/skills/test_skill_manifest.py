@@ -0,0 +1,96 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import Mock
+
+from mycroft.messagebus import Message
+from mycroft.skills.skill_manifest import (RecordingBus, build_manifest,
+                                           load_manifest, save_manifest)
+
+
+def record_skill_load(*handled):
+    """Record the load of a skill with one adapt and one padatious intent."""
+    bus = RecordingBus(Mock())
+    bus.emit(Message('register_vocab', {'start': 'hello',
+                                        'end': 'TestSkillHello'}))
+    bus.emit(Message('register_intent', {'name': 'test_skill:Hello'}))
+    bus.emit(Message('padatious:register_intent',
+                     {'name': 'test_skill:bye.intent',
+                      'file_name': '/skills/test_skill/vocab/bye.intent'}))
+    for msg_type in ('mycroft.skill.enable_intent', 'test_skill.set',
+                     'test_skill:Hello', 'test_skill:bye.intent') + handled:
+        bus.on(msg_type, Mock())
+    return bus
+
+
+class TestRecordingBus(TestCase):
+    def test_forward(self):
+        bus = RecordingBus(Mock())
+        message = Message('speak')
+        bus.emit(message)
+        bus.recording = False
+        bus.emit(message)
+        bus.on('speak', print)
+        self.assertEqual(bus.emitted, [message])
+        self.assertEqual(bus.handled, [])
+        self.assertEqual(bus.bus.emit.call_count, 2)
+        bus.bus.on.assert_called_once_with('speak', print)
+        # Other attributes are taken from the bus
+        bus.remove('speak', print)
+        bus.bus.remove.assert_called_once_with('speak', print)
+
+
+class TestManifest(TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.path = join(self.directory, 'manifests', 'test_skill.json')
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_deferrable(self):
+        manifest = build_manifest(record_skill_load(), 'test_skill',
+                                  'Test Skill', 100.0, 'en-us')
+        self.assertTrue(manifest['deferrable'])
+        self.assertEqual(manifest['intents'],
+                         ['test_skill:Hello', 'test_skill:bye.intent'])
+        self.assertEqual(len(manifest['messages']), 3)
+
+    def test_not_deferrable(self):
+        # Listening for other messages
+        recording = record_skill_load('recognizer_loop:wakeword')
+        manifest = build_manifest(recording, 'test_skill', 'Test Skill',
+                                  100.0, 'en-us')
+        self.assertFalse(manifest['deferrable'])
+
+        # Doing more than registering intents
+        recording = record_skill_load()
+        recording.emit(Message('mycroft.scheduler.schedule_event'))
+        manifest = build_manifest(recording, 'test_skill', 'Test Skill',
+                                  100.0, 'en-us')
+        self.assertFalse(manifest['deferrable'])
+
+    def test_load_manifest(self):
+        self.assertIsNone(load_manifest(self.path, 100.0, 'en-us'))
+        manifest = build_manifest(record_skill_load(), 'test_skill',
+                                  'Test Skill', 100.0, 'en-us')
+        save_manifest(self.path, manifest)
+        self.assertEqual(load_manifest(self.path, 100.0, 'en-us'), manifest)
+        # Stale after the skill or the language changed
+        self.assertIsNone(load_manifest(self.path, 200.0, 'en-us'))
+        self.assertIsNone(load_manifest(self.path, 100.0, 'de-de'))
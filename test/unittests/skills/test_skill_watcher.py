@@ -0,0 +1,152 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import time
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase, mock
+
+from mycroft.skills.skill_watcher import (InotifySkillWatcher,
+                                          PollingSkillWatcher,
+                                          create_skill_watcher,
+                                          is_ignored_file)
+
+
+def touch(path, mtime=None):
+    with open(path, 'a'):
+        pass
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class SkillWatcherTestMixin:
+    def setUp(self):
+        self.skills_dir = mkdtemp()
+        self.skill_dir = join(self.skills_dir, 'skill-test')
+        os.makedirs(join(self.skill_dir, 'vocab'))
+        touch(join(self.skill_dir, '__init__.py'), 1000)
+        self.watcher = self.create_watcher()
+        self.watcher.start()
+
+    def tearDown(self):
+        self.watcher.stop()
+        rmtree(self.skills_dir)
+
+    def wait_for_changes(self, timeout=2.0):
+        end = time.monotonic() + timeout
+        changes = self.watcher.get_changes()
+        while (not changes.modified and not changes.tree_changed and
+               time.monotonic() < end):
+            time.sleep(0.05)
+            changes = self.watcher.get_changes()
+        return changes
+
+    def test_modified(self):
+        touch(join(self.skill_dir, 'vocab', 'Test.voc'))
+        changes = self.wait_for_changes()
+        self.assertEqual(list(changes.modified), [self.skill_dir])
+        self.assertFalse(changes.tree_changed)
+        # Reported once
+        self.assertEqual(self.watcher.get_changes().modified, {})
+
+    def test_ignored_files(self):
+        touch(join(self.skill_dir, 'settings.json'))
+        touch(join(self.skill_dir, '__init__.pyc'))
+        time.sleep(0.3)
+        self.assertEqual(self.wait_for_changes(0.3).modified, {})
+
+    def test_skill_added(self):
+        os.makedirs(join(self.skills_dir, 'skill-new'))
+        changes = self.wait_for_changes()
+        self.assertTrue(changes.tree_changed)
+
+    def test_debounce(self):
+        self.watcher.debounce = 0.5
+        touch(join(self.skill_dir, 'vocab', 'Test.voc'))
+        time.sleep(0.2)
+        self.assertEqual(self.watcher.get_changes().modified, {})
+        changes = self.wait_for_changes()
+        self.assertEqual(list(changes.modified), [self.skill_dir])
+
+
+class TestPollingSkillWatcher(SkillWatcherTestMixin, TestCase):
+    def create_watcher(self):
+        return PollingSkillWatcher(self.skills_dir, debounce=0.1,
+                                   interval=0)
+
+    def test_scan_counters(self):
+        self.watcher.get_changes()
+        stats = self.watcher.get_stats()
+        self.assertEqual(stats['backend'], 'poll')
+        self.assertEqual(stats['scans'], 2)
+        self.assertEqual(stats['dirs_scanned'], 4)
+        self.assertEqual(stats['files_checked'], 2)
+
+    def test_interval(self):
+        self.watcher.interval = 60
+        self.watcher.get_changes()
+        self.watcher.get_changes()
+        self.assertEqual(self.watcher.get_stats()['scans'], 1)
+
+
+class TestInotifySkillWatcher(SkillWatcherTestMixin, TestCase):
+    def create_watcher(self):
+        try:
+            return InotifySkillWatcher(self.skills_dir, debounce=0.1)
+        except (OSError, AttributeError):
+            self.skipTest('inotify not available')
+
+    def test_new_directory_watched(self):
+        new_dir = join(self.skill_dir, 'ui')
+        os.makedirs(new_dir)
+        self.wait_for_changes()
+        touch(join(new_dir, 'main.qml'))
+        changes = self.wait_for_changes()
+        self.assertEqual(list(changes.modified), [self.skill_dir])
+
+    def test_stats(self):
+        touch(join(self.skill_dir, 'vocab', 'Test.voc'))
+        self.wait_for_changes()
+        stats = self.watcher.get_stats()
+        self.assertEqual(stats['backend'], 'inotify')
+        self.assertEqual(stats['watches'], 3)
+        self.assertGreater(stats['events'], 0)
+        self.assertEqual(stats['scans'], 0)
+
+
+class TestCreateSkillWatcher(TestCase):
+    def setUp(self):
+        self.skills_dir = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.skills_dir)
+
+    def test_poll(self):
+        watcher = create_skill_watcher(self.skills_dir, {'backend': 'poll'})
+        self.assertIsInstance(watcher, PollingSkillWatcher)
+
+    @mock.patch('mycroft.skills.skill_watcher.InotifySkillWatcher')
+    def test_inotify_fallback(self, mock_inotify):
+        mock_inotify.side_effect = OSError
+        watcher = create_skill_watcher(self.skills_dir, {})
+        self.assertIsInstance(watcher, PollingSkillWatcher)
+
+
+class TestIgnoredFiles(TestCase):
+    def test_is_ignored_file(self):
+        for name in ('settings.json', 'x.pyc', '.hidden', 'main.qmlc'):
+            self.assertTrue(is_ignored_file(name))
+        self.assertFalse(is_ignored_file('__init__.py'))
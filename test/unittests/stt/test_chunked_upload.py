@@ -0,0 +1,198 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Chunked upload STT tested against a local stand-in server."""
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread
+from unittest.mock import patch
+
+from speech_recognition import AudioData
+
+import mycroft.stt
+from mycroft.configuration import Configuration
+
+from test.util import base_config
+
+CHUNK_SIZE = 2048
+NUM_CHUNKS = 20
+SEC_PER_CHUNK = 0.01  # Time to record a chunk in the test
+PROCESS_SEC = 0.01  # Server processing time per CHUNK_SIZE bytes
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInSTTHandler(BaseHTTPRequestHandler):
+    """Decodes audio like an STT server, as it arrives."""
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return
+                yield self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining > 0:
+                data = self.rfile.read(min(remaining, CHUNK_SIZE))
+                remaining -= len(data)
+                yield data
+
+    def do_POST(self):
+        server = self.server
+        server.chunked = self.headers.get('Transfer-Encoding') == 'chunked'
+        received = b''
+        processed = 0
+        for data in self._read_body():
+            if server.first_data_time is None:
+                server.first_data_time = time.monotonic()
+            received += data
+            while len(received) - processed >= CHUNK_SIZE:
+                processed += CHUNK_SIZE
+                time.sleep(PROCESS_SEC)
+        server.body = received
+        text = 'received {} bytes'.format(len(received)).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(text)))
+        self.end_headers()
+        self.wfile.write(text)
+
+
+class TestChunkedUploadSTT(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInSTTHandler)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.uri = 'http://127.0.0.1:{}/stt'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.first_data_time = None
+        self.server.body = None
+        self.server.chunked = None
+        self.chunks = [bytes([i]) * CHUNK_SIZE for i in range(NUM_CHUNKS)]
+
+    def create_stt(self, stream=True):
+        """Create a deepspeech server STT, streaming unless disabled."""
+        config = base_config()
+        config.merge({
+            'stt': {
+                'module': 'deepspeech_server',
+                'deepspeech_server': {'uri': self.uri, 'stream': stream}
+            },
+            'lang': 'en-US'
+        })
+        with patch.object(Configuration, 'get', return_value=config):
+            return mycroft.stt.DeepSpeechServerSTT()
+
+    def test_stream_upload(self):
+        stt = self.create_stt()
+        self.assertTrue(stt.can_stream)
+        stt.stream_start()
+        start = time.monotonic()
+        for chunk in self.chunks:
+            stt.stream_data(chunk)
+            time.sleep(SEC_PER_CHUNK)
+        end_of_speech = time.monotonic()
+        audio = AudioData(b''.join(self.chunks), 16000, 2)
+        text = stt.execute(audio)
+        latency = time.monotonic() - end_of_speech
+
+        self.assertTrue(self.server.chunked)
+        header = mycroft.stt.wav_stream_header(16000)
+        self.assertEqual(self.server.body,
+                         header + b''.join(self.chunks))
+        self.assertEqual(text, 'received {} bytes'.format(
+            len(header) + NUM_CHUNKS * CHUNK_SIZE))
+        # Upload started while still recording
+        self.assertLess(self.server.first_data_time - start,
+                        end_of_speech - start)
+        # Most of the processing is done before the end of speech
+        self.assertLess(latency, NUM_CHUNKS * PROCESS_SEC / 2)
+
+    def test_single_request_latency(self):
+        stt = self.create_stt(stream=False)
+        self.assertFalse(stt.can_stream)
+        audio = AudioData(b''.join(self.chunks), 16000, 2)
+        end_of_speech = time.monotonic()
+        text = stt.execute(audio)
+        latency = time.monotonic() - end_of_speech
+
+        self.assertFalse(self.server.chunked)
+        self.assertEqual(self.server.body, audio.get_wav_data())
+        self.assertEqual(text, 'received {} bytes'.format(
+            len(audio.get_wav_data())))
+        # All audio processed after the end of speech
+        self.assertGreaterEqual(latency, NUM_CHUNKS * PROCESS_SEC)
+
+    def test_stream_disabled_by_default(self):
+        config = base_config()
+        config.merge({
+            'stt': {
+                'module': 'deepspeech_server',
+                'deepspeech_server': {'uri': self.uri}
+            }
+        })
+        with patch.object(Configuration, 'get', return_value=config):
+            stt = mycroft.stt.DeepSpeechServerSTT()
+        self.assertFalse(stt.can_stream)
+
+    def test_stream_language_mismatch(self):
+        """Audio streamed for another language is sent again."""
+        stt = self.create_stt()
+        stt.stream_start('de-DE')
+        for chunk in self.chunks:
+            stt.stream_data(chunk)
+        audio = AudioData(b''.join(self.chunks), 16000, 2)
+        text = stt.execute(audio, 'en-US')
+
+        self.assertIsNone(stt.stream)
+        self.assertFalse(self.server.chunked)
+        self.assertEqual(self.server.body, audio.get_wav_data())
+        self.assertEqual(text, 'received {} bytes'.format(
+            len(audio.get_wav_data())))
+
+    def test_stream_error_raised_by_execute(self):
+        stt = self.create_stt()
+        stt.config['uri'] = 'http://127.0.0.1:1/stt'
+        stt.stream_start()
+        for chunk in self.chunks:
+            stt.stream_data(chunk)
+        with self.assertRaises(Exception):
+            stt.execute(AudioData(b''.join(self.chunks), 16000, 2))
+        self.assertIsNone(stt.stream)
+
+    def test_rate_conversion(self):
+        stt = self.create_stt()
+        stt.convert_rate = lambda sample_rate: 8000
+        encoded = list(stt.encode_stream(iter(self.chunks[:2])))
+        self.assertEqual(encoded[0], mycroft.stt.wav_stream_header(8000))
+        self.assertEqual(sum(len(c) for c in encoded[1:]), CHUNK_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
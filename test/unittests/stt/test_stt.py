@@ -226,7 +226,8 @@ class TestSTT(unittest.TestCase):
                                      params={
                                          'model': 'en-US_BroadbandModel',
                                          'profanity_filter': 'false'
-                                     })
+                                     },
+                                     timeout=(3.05, None))
 
     @patch.object(Configuration, 'get')
     def test_wit_stt(self, mock_get):
@@ -271,6 +272,26 @@ class TestSTT(unittest.TestCase):
         audio = MagicMock()
         stt = mycroft.stt.KaldiSTT()
         self.assertEqual(stt.execute(audio), 'text')
+        # No read timeout unless configured
+        self.assertEqual(mock_post.call_args[1]['timeout'], (3.05, None))
+
+    @patch('mycroft.stt.post')
+    @patch.object(Configuration, 'get')
+    def test_stt_timeout(self, mock_get, mock_post):
+        config = base_config()
+        config.merge(
+            {
+                'stt': {
+                    'module': 'kaldi',
+                    'kaldi': {'uri': 'https://test.com', 'timeout': [2, 30]},
+                },
+                'lang': 'en-US'
+            })
+        mock_get.return_value = config
+
+        stt = mycroft.stt.KaldiSTT()
+        stt.execute(MagicMock())
+        self.assertEqual(mock_post.call_args[1]['timeout'], (2, 30))
 
     @patch.object(Configuration, 'get')
     def test_bing_stt(self, mock_get):
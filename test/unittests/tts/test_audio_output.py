@@ -0,0 +1,182 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+import unittest
+import wave
+from os.path import join
+from queue import Queue
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import mock
+
+import mycroft.tts
+from mycroft.tts.audio_output import (AudioSink, PyAudioSink, StreamPlayer,
+                                      create_player)
+
+
+class RecordingSink(AudioSink):
+    def __init__(self):
+        self.format = None
+        self.opened = 0
+        self.written = []
+        self.drained = 0
+        self.aborted = 0
+
+    def open(self, sample_rate, channels):
+        if self.format != (sample_rate, channels):
+            self.format = (sample_rate, channels)
+            self.opened += 1
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def drain(self):
+        self.drained += 1
+
+    def abort(self):
+        self.aborted += 1
+
+
+def write_wav(path, frames, sample_rate=22050):
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b'\x00\x10' * frames)
+
+
+class TestStreamPlayer(unittest.TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.sink = RecordingSink()
+        self.player = StreamPlayer(self.sink, chunk_frames=100)
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_play_gapless(self):
+        """Consecutive files are written to the same open stream."""
+        first = join(self.directory, 'first.wav')
+        second = join(self.directory, 'second.wav')
+        write_wav(first, 250)
+        write_wav(second, 100)
+        self.assertTrue(self.player.play(first))
+        self.assertTrue(self.player.play(second))
+        self.assertEqual(self.sink.opened, 1)
+        self.assertEqual([len(c) for c in self.sink.written],
+                         [200, 200, 100, 200])
+        self.assertEqual(self.sink.drained, 0)
+
+    def test_stop(self):
+        path = join(self.directory, 'long.wav')
+        write_wav(path, 1000)
+        self.sink.write = lambda data: self.player.stop()
+        self.assertFalse(self.player.play(path))
+        # Buffered audio is discarded, not played out
+        self.assertEqual(self.sink.aborted, 1)
+        self.assertEqual(self.sink.drained, 0)
+
+    def test_stop_before_play(self):
+        path = join(self.directory, 'short.wav')
+        write_wav(path, 100)
+        self.player.stop()
+        self.assertFalse(self.player.play(path))
+        self.assertEqual(self.sink.written, [])
+        self.player.reset()
+        self.assertTrue(self.player.play(path))
+
+    def test_duck(self):
+        path = join(self.directory, 'duck.wav')
+        write_wav(path, 100)
+        self.player.duck()
+        self.player.play(path)
+        self.assertEqual(self.sink.written[-1][:2], b'\xcc\x04')
+        self.player.unduck()
+        self.player.play(path)
+        self.assertEqual(self.sink.written[-1][:2], b'\x00\x10')
+
+    def test_pyaudio_sink(self):
+        with mock.patch.dict('sys.modules', {'pyaudio': mock.Mock()}):
+            sink = PyAudioSink()
+        sink.open(22050, 1)
+        stream = sink.stream
+        stream.is_stopped.return_value = False
+        sink.abort()
+        stream.abort_stream.assert_called_once_with()
+        self.assertFalse(stream.stop_stream.called)
+        sink.drain()
+        stream.stop_stream.assert_called_once_with()
+        StreamPlayer(sink).close()
+        self.assertTrue(stream.close.called)
+        sink.audio.terminate.assert_called_once_with()
+
+    def test_create_player(self):
+        self.assertIsNone(create_player({}))
+        with mock.patch('mycroft.tts.audio_output.PyAudioSink') as sink:
+            self.assertIsInstance(create_player({'backend': 'stream'}),
+                                  StreamPlayer)
+            # Fall back to external players without audio output
+            sink.side_effect = OSError
+            self.assertIsNone(create_player({'backend': 'stream'}))
+
+
+class TestInProcessPlayback(unittest.TestCase):
+    @mock.patch('mycroft.tts.tts.play_wav')
+    def test_playback_thread(self, mock_play_wav):
+        queue = Queue()
+        playback = mycroft.tts.PlaybackThread(queue)
+        playback.player = mock.Mock()
+        playback.init(mock.Mock())
+        playback.start()
+        try:
+            queue.put(('wav', 'first.wav', None, 0, False))
+            queue.put(('wav', 'second.wav', None, 0, True))
+            time.sleep(0.2)
+            self.assertEqual(playback.player.play.call_args_list,
+                             [mock.call('first.wav', 'wav'),
+                              mock.call('second.wav', 'wav')])
+            self.assertTrue(playback.player.drain.called)
+            self.assertFalse(mock_play_wav.called)
+
+            # Falls back to the player process if playback fails
+            playback.player.play.side_effect = ValueError
+            queue.put(('wav', 'third.wav', None, 0, False))
+            time.sleep(0.2)
+            mock_play_wav.assert_called_with('third.wav', environment=None)
+
+            playback.clear()
+            self.assertTrue(playback.player.stop.called)
+        finally:
+            playback.stop()
+            playback.join()
+        self.assertTrue(playback.player.close.called)
+        # The cache index is saved for the TTS replacing this one
+        self.assertTrue(playback.tts.cache.save.called)
+
+    def test_stop_after_dequeue(self):
+        queue = Queue()
+        playback = mycroft.tts.PlaybackThread(queue)
+        playback.player = StreamPlayer(RecordingSink())
+        # A stop before the entry is taken doesn't apply to it
+        playback.player.stop()
+        queue.put(('wav', 'first.wav', None, 0, False))
+        playback._next_entry()
+        self.assertFalse(playback.player._stopped)
+        # A stop after the entry was taken stops its playback
+        queue.put(('wav', 'second.wav', None, 0, False))
+        playback._next_entry()
+        playback.clear_queue()
+        self.assertTrue(playback.player._stopped)
+        playback.stop()
@@ -0,0 +1,187 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import os
+import unittest
+from os.path import exists, join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+from unittest import mock
+
+from mycroft.tts import cache_handler
+from mycroft.tts.cache import TTSCache
+
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.cache = TTSCache(self.directory, 'wav', max_size=300)
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def add(self, key, size=100, phonemes=None, pinned=False):
+        with open(self.cache.path(key), 'wb') as f:
+            f.write(b'\0' * size)
+        self.cache.put(key, self.cache.path(key), phonemes, pinned=pinned)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.add('a', phonemes='HH:0.1 AH:0.2')
+        self.assertEqual(self.cache.get('a'),
+                         (self.cache.path('a'), 'HH:0.1 AH:0.2'))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['bytes'], 100)
+
+    def test_lru_eviction(self):
+        self.add('a')
+        self.add('b')
+        self.add('c')
+        self.cache.get('a')  # b is now least recently used
+        self.add('d')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertFalse(exists(self.cache.path('b')))
+        for key in 'acd':
+            self.assertIsNotNone(self.cache.get(key))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+    def test_age_eviction(self):
+        self.cache.max_age = 60
+        self.add('a')
+        self.add('b')
+        self.cache.entries['a'].last_used -= 120
+        self.cache.evict()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertIsNotNone(self.cache.get('b'))
+
+    def test_pinned(self):
+        self.add('pinned', size=250, pinned=True)
+        for key in 'abc':
+            self.add(key)
+        self.cache.clear()
+        # Pinned entries don't count towards the limit and are kept
+        self.assertIsNotNone(self.cache.get('pinned'))
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get_stats()['pinned_bytes'], 250)
+
+    def test_index_persisted(self):
+        self.add('a', phonemes=[['HH', 0.1]])
+        self.add('b')
+        self.cache.get('a')
+        self.cache.save()
+        cache = TTSCache(self.directory, 'wav', max_size=300)
+        self.assertEqual(list(cache.entries), ['b', 'a'])
+        self.assertEqual(cache.get('a')[1], [['HH', 0.1]])
+
+    def test_saved_by_curate(self):
+        self.add('a')
+        self.cache.get('a')
+        self.assertFalse(exists(self.cache.index_file))
+        self.cache.curate()
+        self.assertEqual(list(TTSCache(self.directory, 'wav').entries),
+                         ['a'])
+
+    def test_failed_save_retried(self):
+        self.add('a')
+        with mock.patch('mycroft.tts.cache.json.dump',
+                        side_effect=OSError('disk full')):
+            self.cache.save()
+        self.assertFalse(exists(self.cache.index_file))
+        self.assertEqual(os.listdir(self.directory), ['a.wav'])
+        self.cache.save()
+        self.assertEqual(list(TTSCache(self.directory, 'wav').entries),
+                         ['a'])
+
+    def test_concurrent_save(self):
+        def put_and_save(prefix):
+            for i in range(20):
+                self.add('{}{}'.format(prefix, i), size=1)
+                self.cache.save()
+
+        self.cache.max_size = 0
+        threads = [Thread(target=put_and_save, args=(prefix,))
+                   for prefix in 'abcd']
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.cache.save()
+        cache = TTSCache(self.directory, 'wav')
+        self.assertEqual(len(cache.entries), 80)
+
+    def test_unindexed_files_removed(self):
+        self.add('a')
+        self.cache.save()
+        saved = os.stat(self.cache.index_file).st_mtime
+        # Files of the old cache format
+        for name in ('0123.wav', '0123.pho'):
+            path = join(self.directory, name)
+            with open(path, 'w') as f:
+                f.write('old')
+            os.utime(path, (saved - 10, saved - 10))
+        # Audio added by another instance since the index was saved
+        with open(join(self.directory, 'new.wav'), 'w') as f:
+            f.write('new')
+        os.utime(join(self.directory, 'new.wav'), (saved + 10, saved + 10))
+        cache = TTSCache(self.directory, 'wav')
+        self.assertEqual(list(cache.entries), ['a'])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['a.wav', 'index.json', 'new.wav'])
+
+    def test_missing_file(self):
+        self.add('a')
+        self.cache.save()
+        # Files removed behind the cache's back are dropped from the index
+        with mock.patch('mycroft.tts.cache.exists', return_value=False):
+            self.assertIsNone(self.cache.get('a'))
+            cache = TTSCache(self.directory, 'wav')
+        self.assertEqual(len(cache.entries), 0)
+        self.assertEqual(self.cache.get_stats()['bytes'], 0)
+
+
+class TestPreloadedCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = mkdtemp()
+
+    def tearDown(self):
+        rmtree(self.directory)
+
+    def test_copy_cache_pinned(self):
+        preloaded = join(self.directory, 'preloaded')
+        cache_dir = join(self.directory, 'cache')
+        for path in (preloaded, cache_dir):
+            os.makedirs(path)
+        text_file = join(self.directory, 'cache_text.txt')
+        with open(text_file, 'w') as f:
+            f.write('Hello.\nMissing.\n')
+        key = hashlib.md5(b'Hello.').hexdigest()
+        with open(join(preloaded, key + '.wav'), 'wb') as f:
+            f.write(b'\0' * 10)
+        with open(join(preloaded, key + '.pho'), 'w') as f:
+            json.dump([['HH', 0.1]], f)
+
+        tts = mock.Mock()
+        tts.cache = TTSCache(cache_dir, 'wav', max_size=1)
+        tts.cache_key.side_effect = lambda sentence: 'key-' + sentence
+        cache_handler.copy_cache(preloaded, text_file, tts)
+
+        self.assertEqual(tts.cache.get('key-Hello.'),
+                         (tts.cache.path('key-Hello.'), [['HH', 0.1]]))
+        self.assertIsNone(tts.cache.get('key-Missing.'))
+        self.assertEqual(tts.cache.get_stats()['pinned'], 1)
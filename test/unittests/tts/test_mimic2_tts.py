@@ -78,25 +78,3 @@ class TestMimic2(unittest.TestCase):
                           'knew what he was doing.',
                           'and then George said that he had fits of giddiness '
                           'too, and hardly knew what he was doing.'])
-
-    @mock.patch('mycroft.tts.mimic2_tts.open')
-    def test_phoneme_cache(self, mock_open, _, __):
-        m2 = Mimic2('en-US', {'url': 'https://just.testing.nu'})
-        phonemes = [['pau', 0.137], ['hh', 0.236], ['ax', 0.286], ['l', 0.387],
-                    ['ow', 0.542], ['f', 0.642], ['r', 0.728], ['eh', 0.807],
-                    ['n', 0.899], ['d', 1.033], ['pau', 1.187]]
-
-        mock_context = mock.Mock(name='context')
-        mock_file = mock.MagicMock(name='file')
-        mock_open.return_value = mock_file
-        mock_file.__enter__.return_value = mock_context
-        m2.save_phonemes('abc', phonemes)
-        self.assertTrue(mock_context.write.called_with)
-        with mock.patch('mycroft.tts.mimic2_tts.json.load') as mock_load:
-            read_phonemes = m2.load_phonemes('abc')
-            self.assertEqual(read_phonemes, None)
-            mock_load.reset_mock()
-            with mock.patch('mycroft.tts.mimic2_tts.os.path.exists') as _:
-                mock_load.return_value = phonemes
-                read_phonemes = m2.load_phonemes('abc')
-                self.assertEqual(read_phonemes, phonemes)
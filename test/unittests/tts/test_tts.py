@@ -1,4 +1,5 @@
 from queue import Queue
+from threading import Event, Thread
 import time
 
 import unittest
@@ -82,6 +83,99 @@ class TestPlaybackThread(unittest.TestCase):
             playback.stop()
             playback.join()
 
+    @mock.patch('mycroft.tts.tts.play_wav')
+    def test_play_synthesized(self, mock_play_wav):
+        queue = Queue()
+        pipeline = mycroft.tts.tts.SynthesisPipeline(queue, lookahead=1)
+        playback = mycroft.tts.PlaybackThread(queue, pipeline)
+        mock_tts = mock.Mock()
+        playback.init(mock_tts)
+        playback.start()
+        try:
+            pipeline.submit(lambda: ('wav', 'first.wav', None, 0, False))
+            # Only returns when playback took the first sentence
+            pipeline.submit(lambda: ('wav', 'second.wav', None, 0, True))
+            time.sleep(0.2)
+            self.assertEqual(mock_play_wav.call_args_list, [
+                mock.call('first.wav', environment=None),
+                mock.call('second.wav', environment=None)])
+            mock_tts.end_audio.assert_called_with(True)
+
+            # Clearing cancels sentences waiting for playback
+            mock_play_wav.reset_mock()
+            playback.clear()
+            release = Event()
+            pipeline.submit(lambda: release.wait(1) and
+                            ('wav', 'third.wav', None, 0, False))
+            time.sleep(0.1)
+            playback.clear()
+            release.set()
+            time.sleep(0.2)
+            self.assertFalse(mock_play_wav.called)
+        finally:
+            playback.stop()
+            playback.join()
+
+
+class TestSynthesisPipeline(unittest.TestCase):
+    def setUp(self):
+        self.queue = Queue()
+        self.pipeline = mycroft.tts.tts.SynthesisPipeline(self.queue,
+                                                          workers=2,
+                                                          lookahead=2)
+
+    def tearDown(self):
+        self.pipeline.shutdown()
+
+    def test_order(self):
+        """Results are queued in submission order, synthesized in parallel.
+        """
+        release_first = Event()
+
+        def synthesize(sentence):
+            if sentence == 'first':
+                release_first.wait(1)
+            return sentence
+
+        first = self.pipeline.submit(synthesize, 'first')
+        second = self.pipeline.submit(synthesize, 'second')
+        # The second sentence doesn't wait for the first one
+        self.assertEqual(second.result(timeout=1), 'second')
+        self.assertFalse(first.done())
+        release_first.set()
+        self.assertEqual([self.queue.get().result(timeout=1),
+                          self.queue.get().result(timeout=1)],
+                         ['first', 'second'])
+
+    def test_lookahead(self):
+        self.pipeline.submit(str, 'one')
+        self.pipeline.submit(str, 'two')
+        submitted = Event()
+
+        def submit_third():
+            self.pipeline.submit(str, 'three')
+            submitted.set()
+
+        Thread(target=submit_third, daemon=True).start()
+        # Blocked until playback takes a sentence
+        self.assertFalse(submitted.wait(0.2))
+        self.queue.get()
+        self.pipeline.release()
+        self.assertTrue(submitted.wait(1))
+
+    def test_cancel(self):
+        self.pipeline.submit(str, 'one')
+        self.pipeline.submit(str, 'two')
+        results = []
+        waiting = Thread(target=lambda: results.append(
+            self.pipeline.submit(str, 'three')), daemon=True)
+        waiting.start()
+        time.sleep(0.1)
+        self.pipeline.cancel()
+        waiting.join(1)
+        self.assertEqual(results, [None])
+        self.assertEqual(self.queue.qsize(), 2)
+
 
 @mock.patch('mycroft.tts.tts.PlaybackThread')
 class TestTTS(unittest.TestCase):
@@ -91,33 +185,39 @@ class TestTTS(unittest.TestCase):
         tts.init(bus_mock)
         self.assertTrue(tts.bus is bus_mock)
 
-        tts.queue = mock.Mock()
+        tts.cache = mock.Mock()
+        tts.cache.get.return_value = None
         with mock.patch('mycroft.tts.tts.open') as mock_open:
             tts.execute('Oh no, not again', 42)
+            synthesis = tts.queue.get(timeout=1)
+            self.assertEqual(synthesis.result(timeout=1),
+                             ('wav', mock_audio, mock_viseme, 42, False))
         self.assertTrue(tts.get_tts.called)
-        tts.queue.put.assert_called_with(('wav', mock_audio, mock_viseme,
-                                         42, False))
-
-    @mock.patch('mycroft.tts.tts.open')
-    def test_phoneme_cache(self, mock_open, _):
+        key = tts.cache_key('Oh no, not again')
+        tts.cache.put.assert_called_with(key, mock_audio, mock_phoneme)
+
+    def test_cache_key(self, _):
+        tts = MockTTS("en-US", {'voice': 'a'}, MockTTSValidator(None))
+        key = tts.cache_key('hello')
+        self.assertEqual(key, tts.cache_key('hello'))
+        self.assertNotEqual(key, tts.cache_key('hello there'))
+        tts.config = {'voice': 'b'}
+        self.assertNotEqual(key, tts.cache_key('hello'))
+
+    def test_synthesis_fallback(self, _):
         tts = MockTTS("en-US", {}, MockTTSValidator(None))
-        mock_context = mock.Mock(name='context')
-        mock_file = mock.MagicMock(name='file')
-        mock_open.return_value = mock_file
-        mock_file.__enter__.return_value = mock_context
-
-        phonemes = mock.Mock()
-        # Test save phonemes
-        tts.save_phonemes('abc', phonemes)
-        mock_context.write.assert_called_with(phonemes)
-
-        # Test load phonemes
-        mock_context.read.return_value = 'phonemes '
-        read_phonemes = tts.load_phonemes('abc')
-        self.assertEqual(read_phonemes, None)
-        with mock.patch('mycroft.tts.tts.os.path.exists') as _:
-            read_phonemes = tts.load_phonemes('abc')
-            self.assertEqual(read_phonemes, 'phonemes')  # assert stripped
+        tts.get_tts.side_effect = Exception('Remote failed')
+        fallback = mock.Mock(name='fallback')
+        fallback.get_audio.return_value = ('wav', 'fallback.wav', None)
+
+        tts.fallback = mock.Mock(return_value=fallback)
+        self.assertEqual(tts._synthesize('hello', 42, True),
+                         ('wav', 'fallback.wav', None, 42, True))
+
+        # Without fallback the entry only ends the audio sequence
+        tts.fallback = None
+        self.assertEqual(tts._synthesize('hello', 42, True),
+                         (None, None, None, 42, True))
 
     def test_ssml_support(self, _):
         sentence = "<speak>Prosody can be used to change the way words " \
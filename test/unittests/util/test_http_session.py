@@ -0,0 +1,127 @@
+# Copyright 2020 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import Thread
+from unittest import mock
+
+import mycroft.util.http_session
+from mycroft.util.http_session import PooledSession, get_session
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if self.path == '/unavailable' and server.requests == 1:
+            self.send_response(503)
+            body = b''
+        else:
+            self.send_response(200)
+            body = b'ok'
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.do_GET()
+
+
+class TestPooledSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+        cls.host = '127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = 0
+        self.session = PooledSession(backoff_factor=0)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_connection_reused(self):
+        for _ in range(3):
+            self.assertEqual(self.session.get(self.url + '/').text, 'ok')
+        self.session.post(self.url + '/', data=b'audio')
+        stats = self.session.get_stats()[self.host]
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['connections'], 1)
+        self.assertEqual(stats['reused'], 3)
+        self.assertEqual(stats['errors'], 0)
+        self.assertGreater(stats['avg_latency'], 0)
+        self.assertGreaterEqual(stats['max_latency'], stats['avg_latency'])
+
+    def test_retry_unavailable(self):
+        response = self.session.get(self.url + '/unavailable')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, 2)
+
+    def test_errors_counted(self):
+        with self.assertRaises(Exception):
+            self.session.get('http://127.0.0.1:1/', timeout=0.5)
+        self.assertEqual(self.session.get_stats()['127.0.0.1:1']['errors'],
+                         1)
+
+    def test_default_timeout(self):
+        with mock.patch('requests.Session.request') as request:
+            self.session.get(self.url + '/')
+            self.assertEqual(request.call_args[1]['timeout'], (3.05, 15))
+            self.session.get(self.url + '/', timeout=5)
+            self.assertEqual(request.call_args[1]['timeout'], 5)
+
+
+class TestSharedSession(unittest.TestCase):
+    def tearDown(self):
+        mycroft.util.http_session._session = None
+
+    def test_config(self):
+        mycroft.util.http_session._session = None
+        config = {'http': {'pool_size': 3, 'retries': 1,
+                           'backoff_factor': 0.1, 'timeout': [1, 2]}}
+        with mock.patch('mycroft.configuration.Configuration.get',
+                        return_value=config):
+            session = get_session()
+        self.assertIs(get_session(), session)
+        self.assertEqual(session.timeout, (1, 2))
+        adapter = session.get_adapter('https://example.com')
+        self.assertEqual(adapter.max_retries.total, 1)
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    def test_scalar_timeout(self):
+        mycroft.util.http_session._session = None
+        with mock.patch('mycroft.configuration.Configuration.get',
+                        return_value={'http': {'timeout': 10}}):
+            session = get_session()
+        self.assertEqual(session.timeout, 10)
@@ -12,13 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import time
 import unittest
 from shutil import rmtree
+from unittest import mock
 
 from os.path import exists, isfile, join
-from tempfile import gettempdir
+from tempfile import gettempdir, mkdtemp
 
+import mycroft.util.signal
 from mycroft.util import create_signal, check_for_signal
+from mycroft.util.signal import (SharedSignals, read_mic_level,
+                                 write_mic_level)
 
 
 class TestSignals(unittest.TestCase):
@@ -45,5 +50,92 @@ class TestSignals(unittest.TestCase):
                                      'mycroft/ipc/signal/test_signal')))
 
 
+class TestSharedSignals(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.path = join(self.tmp_dir, 'signals.mmap')
+        self.signals = SharedSignals(self.path)
+
+    def tearDown(self):
+        rmtree(self.tmp_dir)
+
+    def test_single_use(self):
+        self.assertFalse(self.signals.check('buttonPress'))
+        self.signals.create('buttonPress')
+        self.assertTrue(self.signals.check('buttonPress'))
+        self.assertFalse(self.signals.check('buttonPress'))
+
+    def test_never_expires(self):
+        self.signals.create('isSpeaking')
+        self.assertTrue(self.signals.check('isSpeaking', -1))
+        self.assertTrue(self.signals.check('isSpeaking', -1))
+        # Consumed by a single use check
+        self.assertTrue(self.signals.check('isSpeaking'))
+        self.assertFalse(self.signals.check('isSpeaking', -1))
+
+    def test_lifetime(self):
+        self.signals.create('buttonPress')
+        self.assertTrue(self.signals.check('buttonPress', 10))
+        with mock.patch('mycroft.util.signal.time.time',
+                        return_value=time.time() + 20):
+            self.assertFalse(self.signals.check('buttonPress', 10))
+        self.assertFalse(self.signals.check('buttonPress', -1))
+
+    def test_shared_between_maps(self):
+        other = SharedSignals(self.path)
+        self.signals.create('startListening')
+        self.assertTrue(other.check('startListening'))
+        self.assertFalse(self.signals.check('startListening'))
+
+    def test_mic_level(self):
+        other = SharedSignals(self.path)
+        self.assertEqual(other.read_mic_level()[0], 0)
+        self.signals.write_mic_level(4.0, 1.5, 0)
+        self.signals.write_mic_level(5.0, 1.5, 1)
+        self.assertEqual(other.read_mic_level(), (2, 5.0, 1.5, 1))
+
+
+class TestSignalModes(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        mycroft.util.signal._shared_signals = None
+
+    def tearDown(self):
+        mycroft.util.signal._shared_signals = None
+        rmtree(self.tmp_dir)
+
+    def config(self, mode):
+        return mock.patch('mycroft.configuration.Configuration.get',
+                          return_value={'ipc_path': self.tmp_dir,
+                                        'signal': {'mode': mode}})
+
+    def test_memory_mode(self):
+        with self.config('memory'):
+            self.assertIsNone(read_mic_level())
+            create_signal('buttonPress')
+            write_mic_level(4, 1.5, False)
+            self.assertFalse(isfile(join(self.tmp_dir, 'signal',
+                                         'buttonPress')))
+            self.assertFalse(isfile(join(self.tmp_dir, 'mic_level')))
+            self.assertTrue(isfile(join(self.tmp_dir, 'signals.mmap')))
+            self.assertTrue(check_for_signal('buttonPress'))
+            self.assertEqual(read_mic_level(), (4.0, 1.5, False))
+
+    def test_file_mode(self):
+        with self.config('file'):
+            self.assertIsNone(read_mic_level())
+            create_signal('buttonPress')
+            write_mic_level(4, 1.5, True)
+            self.assertTrue(isfile(join(self.tmp_dir, 'signal',
+                                        'buttonPress')))
+            self.assertTrue(check_for_signal('buttonPress'))
+            self.assertFalse(isfile(join(self.tmp_dir, 'signal',
+                                         'buttonPress')))
+            with open(join(self.tmp_dir, 'mic_level')) as f:
+                self.assertEqual(f.read(),
+                                 'Energy:  cur=4 thresh=1.500 muted=1')
+            self.assertEqual(read_mic_level(), (4.0, 1.5, True))
+
+
 if __name__ == "__main__":
     unittest.main()